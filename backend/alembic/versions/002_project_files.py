@@ -0,0 +1,38 @@
+"""Project file manifest
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'project_files',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True),
+        sa.Column('path', sa.String(1024), nullable=False),
+        sa.Column('size', sa.BigInteger(), server_default='0'),
+        sa.Column('mtime', sa.Float()),
+        sa.Column('content_hash', sa.String(40)),
+        sa.Column('language', sa.String(50)),
+        sa.Column('line_count', sa.Integer(), server_default='0'),
+        sa.Column('details', postgresql.JSONB()),
+        sa.UniqueConstraint('project_id', 'path', name='uq_project_file_path'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('project_files')
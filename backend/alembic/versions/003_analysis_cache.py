@@ -0,0 +1,39 @@
+"""Commit-keyed analysis cache
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('commit_sha', sa.String(40)))
+
+    op.create_table(
+        'analysis_cache',
+        sa.Column('cache_key', sa.String(64), primary_key=True),
+        sa.Column('repo_url', sa.String(500), nullable=False),
+        sa.Column('commit_sha', sa.String(40), nullable=False),
+        sa.Column('data', postgresql.JSONB(), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('hit_count', sa.Integer(), server_default='0'),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('last_accessed_at', sa.DateTime(), server_default=sa.func.now(), index=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('analysis_cache')
+    op.drop_column('projects', 'commit_sha')
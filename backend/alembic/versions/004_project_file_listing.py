@@ -0,0 +1,29 @@
+"""Path-prefix index for project file listings
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_project_files_path_prefix',
+        'project_files',
+        ['project_id', 'path'],
+        postgresql_ops={'path': 'text_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_files_path_prefix', table_name='project_files')
@@ -0,0 +1,26 @@
+"""Per-section retrieval rules
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sections', sa.Column('retrieval_rules', postgresql.JSONB()))
+
+
+def downgrade() -> None:
+    op.drop_column('sections', 'retrieval_rules')
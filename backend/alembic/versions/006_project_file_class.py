@@ -0,0 +1,25 @@
+"""File classification in the project file manifest
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('project_files', sa.Column('file_class', sa.String(20)))
+
+
+def downgrade() -> None:
+    op.drop_column('project_files', 'file_class')
@@ -0,0 +1,36 @@
+"""Content-hash keyed per-file analysis cache
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'blob_cache',
+        sa.Column('cache_key', sa.String(128), primary_key=True),
+        sa.Column('kind', sa.String(20), nullable=False),
+        sa.Column('content_hash', sa.String(40), nullable=False, index=True),
+        sa.Column('data', postgresql.JSONB(), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('hit_count', sa.Integer(), server_default='0'),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('last_accessed_at', sa.DateTime(), server_default=sa.func.now(), index=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('blob_cache')
@@ -0,0 +1,25 @@
+"""Previous commit of refreshed GitHub projects
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('previous_commit_sha', sa.String(40)))
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'previous_commit_sha')
@@ -0,0 +1,29 @@
+"""Archive hash of uploaded projects
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('archive_sha256', sa.String(64)))
+    # Upload entries are keyed by the archive's SHA-256 instead of a commit SHA
+    op.alter_column('analysis_cache', 'commit_sha', type_=sa.String(64), existing_nullable=False)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM analysis_cache WHERE length(commit_sha) > 40")
+    op.alter_column('analysis_cache', 'commit_sha', type_=sa.String(40), existing_nullable=False)
+    op.drop_column('projects', 'archive_sha256')
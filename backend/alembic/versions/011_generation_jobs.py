@@ -0,0 +1,55 @@
+"""Background generation jobs
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'generation_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('document_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('documents.id', ondelete='CASCADE'), nullable=False, index=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('error', sa.Text()),
+        sa.Column('worker_id', sa.String(64)),
+        sa.Column('heartbeat_at', sa.DateTime()),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime()),
+        sa.Column('finished_at', sa.DateTime()),
+    )
+    op.create_index('ix_generation_jobs_status', 'generation_jobs', ['status'])
+
+    op.create_table(
+        'generation_job_sections',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('generation_jobs.id', ondelete='CASCADE'), nullable=False, index=True),
+        sa.Column('document_section_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('document_sections.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('title', sa.String(255), nullable=False),
+        sa.Column('display_order', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('content_id', postgresql.UUID(as_uuid=True)),
+        sa.Column('error', sa.Text()),
+        sa.Column('started_at', sa.DateTime()),
+        sa.Column('finished_at', sa.DateTime()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('generation_job_sections')
+    op.drop_index('ix_generation_jobs_status', table_name='generation_jobs')
+    op.drop_table('generation_jobs')
@@ -0,0 +1,37 @@
+"""LLM response cache
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'llm_response_cache',
+        sa.Column('cache_key', sa.String(64), primary_key=True),
+        sa.Column('provider', sa.String(50), nullable=False),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('response', sa.Text(), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('hit_count', sa.Integer(), server_default='0'),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), index=True),
+        sa.Column('last_accessed_at', sa.DateTime(), server_default=sa.func.now(), index=True),
+    )
+    op.add_column('generation_jobs', sa.Column('fresh', sa.Boolean(), server_default=sa.false()))
+
+
+def downgrade() -> None:
+    op.drop_column('generation_jobs', 'fresh')
+    op.drop_table('llm_response_cache')
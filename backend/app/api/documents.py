@@ -176,7 +176,7 @@ def delete_document(
 
 
 @router.get("/{document_id}/suggestions")
-def get_section_suggestions(
+async def get_section_suggestions(
     document_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -210,7 +210,7 @@ def get_section_suggestions(
     suggester = SectionSuggester(db)
 
     try:
-        suggestions = suggester.suggest_sections(
+        suggestions = await suggester.suggest_sections(
             document_type_id=str(document.document_type_id),
             code_analysis=project.analysis_data,
         )
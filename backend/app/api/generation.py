@@ -1,22 +1,59 @@
 import uuid
 import io
+import json
+from typing import Any, AsyncIterator
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, get_current_user
-from app.models import User, Document
+from app.models import User, Document, GenerationJob
+from app.schemas import GenerationJobResponse
+from app.services.ai_service import get_ai_service
 from app.services.document_generator import DocumentGenerator
+from app.services.generation_jobs import get_generation_jobs
 
 router = APIRouter()
 
 
-@router.post("/documents/{document_id}/generate")
-def generate_document(
+@router.get("/cache/stats")
+def get_response_cache_stats(
+    current_user: User = Depends(get_current_user),
+):
+    """Get hit/miss counters and size of the shared AI response cache."""
+    return get_ai_service().cache.stats()
+
+
+def _get_job(db: Session, job_id: uuid.UUID, user: User) -> GenerationJob:
+    job = db.query(GenerationJob).filter(
+        GenerationJob.id == job_id,
+        GenerationJob.user_id == user.id,
+    ).first()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Generation job not found",
+        )
+    return job
+
+
+@router.post(
+    "/documents/{document_id}/generate",
+    response_model=GenerationJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def generate_document(
     document_id: uuid.UUID,
+    fresh: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Generate content for all sections in a document."""
+    """Start generating content for all sections in a document.
+
+    Returns the queued job at once (or the document's job already in progress);
+    poll GET /jobs/{job_id} for per-section progress. Sections whose prompt is
+    unchanged reuse cached AI responses unless fresh is set.
+    """
     document = db.query(Document).filter(
         Document.id == document_id,
         Document.user_id == current_user.id,
@@ -28,30 +65,120 @@ def generate_document(
             detail="Document not found",
         )
 
-    if not document.sections:
+    if not any(section.is_included for section in document.sections):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Document has no sections to generate",
         )
 
-    generator = DocumentGenerator(db)
-    results = generator.generate_document(str(document_id))
+    jobs = get_generation_jobs()
+    job = jobs.create_job(db, document, current_user.id, fresh=fresh)
+    jobs.submit(job.id)
+    return job
+
+
+@router.get("/documents/{document_id}/jobs/latest", response_model=GenerationJobResponse)
+def get_latest_job(
+    document_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get a document's most recent generation job."""
+    job = (
+        db.query(GenerationJob)
+        .filter(
+            GenerationJob.document_id == document_id,
+            GenerationJob.user_id == current_user.id,
+        )
+        .order_by(GenerationJob.created_at.desc())
+        .first()
+    )
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Generation job not found",
+        )
+
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=GenerationJobResponse)
+def get_job(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get a generation job's progress."""
+    return _get_job(db, job_id, current_user)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream a generation job's progress as server-sent events.
+
+    Events: "snapshot" (the job, plus "partial" text of running sections) on
+    connect, then "section_started", "delta" (a piece of a section's text as the
+    AI writes it), "section_completed" (final saved content) and "job" when the
+    job ends, after which the stream closes.
+    """
+    job = _get_job(db, job_id, current_user)
+    jobs = get_generation_jobs()
+    queue = jobs.events.subscribe(job.id)
+
+    snapshot = GenerationJobResponse.model_validate(job).model_dump(mode="json")
+    snapshot["partial"] = jobs.events.partial(job.id)
+
+    async def events() -> AsyncIterator[str]:
+        yield _sse("snapshot", snapshot)
+        if job.status not in GenerationJob.ACTIVE_STATUSES:
+            jobs.events.unsubscribe(job.id, queue)
+            return
+        async for item in jobs.stream_events(job.id, queue):
+            yield ": keep-alive\n\n" if item is None else _sse(*item)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=GenerationJobResponse)
+async def cancel_job(
+    job_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Cancel a queued or running generation job; finished sections keep their content."""
+    job = _get_job(db, job_id, current_user)
+
+    if job.status not in GenerationJob.ACTIVE_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Generation job is already {job.status}",
+        )
 
-    return {
-        "document_id": str(document_id),
-        "status": "completed",
-        "results": results,
-    }
+    return get_generation_jobs().cancel(db, job)
 
 
 @router.post("/documents/{document_id}/sections/{section_id}/generate")
-def regenerate_section(
+async def regenerate_section(
     document_id: uuid.UUID,
     section_id: uuid.UUID,
+    fresh: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Regenerate content for a specific section."""
+    """Regenerate content for a specific section (fresh skips the cached AI response)."""
     document = db.query(Document).filter(
         Document.id == document_id,
         Document.user_id == current_user.id,
@@ -64,7 +191,7 @@ def regenerate_section(
         )
 
     generator = DocumentGenerator(db)
-    result = generator.regenerate_section(str(document_id), str(section_id))
+    result = await generator.regenerate_section(str(document_id), str(section_id), fresh=fresh)
 
     return result
 
@@ -1,34 +1,184 @@
 import os
 import uuid
 import shutil
-import zipfile
-import tarfile
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from datetime import datetime, timedelta
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, UploadFile, File, Form, Query, Header, Request
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.api.deps import get_db, get_current_user
 from app.config import settings
-from app.models import User, Project
-from app.schemas import ProjectResponse, ProjectWithAnalysis, GitHubProjectCreate
+from app.core.exceptions import BadRequestException, ConflictException, PayloadTooLargeException
+from app.models import User, Project, ProjectFile, UploadSession
+from app.schemas import (
+    ProjectResponse,
+    ProjectWithAnalysis,
+    GitHubProjectCreate,
+    ProjectFileList,
+    UploadSessionCreate,
+    UploadSessionResponse,
+)
+from app.services.analysis_cache import AnalysisCache
+from app.services.archive_extractor import ArchiveExtractor
+from app.services.archive_fs import ArchiveFS, upload_code_path
+from app.services.blob_cache import BlobCache
+from app.services.blob_store import BlobStore
 from app.services.code_analyzer import CodeAnalyzer
+from app.services.file_walker import resolve_worker_count
+from app.services.git_tree import GitTree
 from app.services.github_service import GitHubService
+from app.services.incremental_analyzer import IncrementalAnalyzer
+from app.services.project_indexer import ProjectIndexer, build_content_index_task
+from app.services.upload_writer import UploadWriter, file_sha256
 
 router = APIRouter()
 
 
-def extract_archive(file_path: str, extract_path: str) -> None:
-    """Extract zip or tar.gz archive."""
-    if file_path.endswith('.zip'):
-        with zipfile.ZipFile(file_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_path)
-    elif file_path.endswith('.tar.gz') or file_path.endswith('.tgz'):
-        with tarfile.open(file_path, 'r:gz') as tar_ref:
-            tar_ref.extractall(extract_path)
-    elif file_path.endswith('.tar'):
-        with tarfile.open(file_path, 'r:') as tar_ref:
-            tar_ref.extractall(extract_path)
+def extract_archive(file_path: str, extract_path: str) -> dict[str, int]:
+    """Extract a zip or tar archive, leaving out what the analyzer would skip.
+
+    With upload deduplication on, members are stored in the shared BlobStore and
+    a manifest of their hashes is written next to extract_path.
+    """
+    store = BlobStore() if settings.upload_dedup else None
+    extractor = ArchiveExtractor(
+        CodeAnalyzer.SKIP_DIRS,
+        CodeAnalyzer.IGNORE_FILES if settings.analyzer_ignore_files else (),
+        max_bytes=settings.extract_max_bytes,
+        max_entries=settings.extract_max_entries,
+        max_ratio=settings.extract_max_ratio,
+        max_workers=resolve_worker_count(settings.analyzer_workers),
+        store=store,
+    )
+    stats = extractor.extract(file_path, extract_path)
+    if store is not None:
+        store.write_manifest(os.path.dirname(extract_path), stats.pop("blobs"))
+    return stats
+
+
+def prepare_archive(file_path: str, storage_path: str, archive_sha256: str) -> None:
+    """Keep an uploaded archive for in-place reading when possible, else extract it.
+
+    Zips and uncompressed tars are indexed and kept as the project's code;
+    compressed tars (no random access) are extracted to storage_path/code.
+    """
+    if settings.analyze_archives_in_place and ArchiveFS.supports(file_path):
+        archive = ArchiveFS.load(file_path)
+        if archive is not None:
+            if archive.entry_count > settings.extract_max_entries:
+                raise PayloadTooLargeException(
+                    f"Archive has too many entries (limit {settings.extract_max_entries})"
+                )
+            if settings.upload_dedup:
+                # Identical re-uploads share one stored archive
+                store = BlobStore()
+                store.adopt(file_path, archive_sha256)
+                store.write_manifest(storage_path, {os.path.basename(file_path): {"sha256": archive_sha256}})
+            return
+
+    extract_path = os.path.join(storage_path, "code")
+    os.makedirs(extract_path, exist_ok=True)
+    extract_archive(file_path, extract_path)
+    os.remove(file_path)
+
+
+def _glob_to_like(pattern: str) -> str:
+    """Translate a glob (* and ?) into a SQL LIKE pattern escaped with backslash."""
+    escaped = pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return escaped.replace('**', '*').replace('*', '%').replace('?', '_')
+
+
+def _get_code_path(project: Project) -> str:
+    """Directory holding a project's source files."""
+    if project.source_type == "upload":
+        return upload_code_path(project.storage_path)
+    return project.storage_path
+
+
+def _index_project(db: Session, project: Project, background_tasks: BackgroundTasks) -> None:
+    """Rebuild the path, symbol and import indexes now and queue the content index.
+
+    The symbol summary (counts and route table), the import graph size and the
+    most central modules (as "central" key files) are stored in analysis_data.
+    Indexing failures are logged and leave the analysis without those entries;
+    section context then falls back to the project's file listing.
+    """
+    indexer = ProjectIndexer(db)
+    code_path = _get_code_path(project)
+    analysis_data = dict(project.analysis_data)
+    key_files = [k for k in analysis_data.get("key_files", []) if k["type"] != "central"]
+
+    try:
+        indexer.index_project(project)
+        symbols = indexer.build_symbol_index(project, code_path)
+        graph = indexer.build_import_graph(project, symbols)
+    except Exception as e:
+        db.rollback()
+        print(f"Indexing failed for project {project.id}: {e}")
+        analysis_data.pop("symbols", None)
+        analysis_data.pop("import_graph", None)
+        project.analysis_data = {**analysis_data, "key_files": key_files}
     else:
-        raise ValueError("Unsupported archive format")
+        project.analysis_data = {
+            **analysis_data,
+            "key_files": key_files + indexer.central_key_files(graph),
+            "symbols": symbols.summary(),
+            "import_graph": graph.summary(),
+        }
+    db.commit()
+    db.refresh(project)
+
+    background_tasks.add_task(build_content_index_task, project.id, code_path)
+
+
+def _run_analysis(
+    db: Session,
+    project: Project,
+    background_tasks: BackgroundTasks,
+    changed_paths: Optional[set[str]] = None,
+) -> None:
+    """Analyze a project (incrementally against its manifest), index it and share the result."""
+    analyzer = IncrementalAnalyzer(db)
+    code_path = _get_code_path(project)
+
+    try:
+        analysis_data = analyzer.analyze_project(project, code_path, changed_paths=changed_paths)
+        project.analysis_data = analysis_data
+        db.commit()
+        db.refresh(project)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Analysis failed: {str(e)}",
+        )
+
+    # Rebuild the indexes used for section context selection and the symbol summary
+    _index_project(db, project, background_tasks)
+
+    source = AnalysisCache.source_of(project)
+    if source:
+        AnalysisCache(db).put(*source, project.analysis_data, analyzer.export_manifest(project))
+
+
+def _apply_cached_analysis(db: Session, project: Project) -> bool:
+    """Fill a project's analysis and manifest from the shared cache (without committing).
+
+    Returns:
+        bool: True on a cache hit
+    """
+    source = AnalysisCache.source_of(project)
+    cached = AnalysisCache(db).get(*source) if source else None
+    if cached is None:
+        return False
+
+    IncrementalAnalyzer(db).seed_manifest(project, cached["files"])
+    project.analysis_data = {
+        **cached["analysis_data"],
+        "analyzed_at": datetime.utcnow().isoformat(),
+        "from_cache": True,
+    }
+    return True
 
 
 @router.get("", response_model=List[ProjectResponse])
@@ -41,8 +191,64 @@ def list_projects(
     return projects
 
 
+ARCHIVE_EXTENSIONS = ['.zip', '.tar.gz', '.tgz', '.tar']
+
+
+def _archive_extension(filename: str) -> str:
+    """Supported archive extension of an upload's filename."""
+    for ext in ARCHIVE_EXTENSIONS:
+        if filename.lower().endswith(ext):
+            return ext
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid file type. Supported: .zip, .tar.gz, .tgz, .tar",
+    )
+
+
+async def _ingest_archive(
+    db: Session,
+    background_tasks: BackgroundTasks,
+    project: Project,
+    archive_path: str,
+) -> Project:
+    """Index (or extract) a stored archive and save the project that owns it.
+
+    The storage directory is removed if the archive can't be processed.
+    """
+    try:
+        # Index (or extract) on the threadpool so other requests aren't blocked
+        await run_in_threadpool(prepare_archive, archive_path, project.storage_path, project.archive_sha256)
+    except HTTPException:
+        shutil.rmtree(project.storage_path, ignore_errors=True)
+        raise
+    except Exception as e:
+        # Cleanup on error
+        if os.path.exists(project.storage_path):
+            shutil.rmtree(project.storage_path)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process upload: {str(e)}",
+        )
+
+    db.add(project)
+    db.flush()
+
+    # Reuse the analysis of an identical earlier upload, if any
+    cache_hit = _apply_cached_analysis(db, project)
+
+    db.commit()
+    db.refresh(project)
+
+    if cache_hit:
+        # Index builds read and parse the whole tree; keep them off the event loop
+        await run_in_threadpool(_index_project, db, project, background_tasks)
+
+    return project
+
+
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project(
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     description: str = Form(None),
     file: UploadFile = File(...),
@@ -50,55 +256,27 @@ async def create_project(
     current_user: User = Depends(get_current_user),
 ):
     """Create a new project from uploaded archive."""
-    # Validate file type
-    allowed_extensions = ['.zip', '.tar.gz', '.tgz', '.tar']
-    file_ext = None
-    for ext in allowed_extensions:
-        if file.filename.lower().endswith(ext):
-            file_ext = ext
-            break
-
-    if not file_ext:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file type. Supported: .zip, .tar.gz, .tgz, .tar",
-        )
+    file_ext = _archive_extension(file.filename)
 
     # Create unique storage path
     project_id = uuid.uuid4()
     storage_path = os.path.join(settings.upload_dir, str(current_user.id), str(project_id))
     os.makedirs(storage_path, exist_ok=True)
 
-    # Save uploaded file
-    temp_file_path = os.path.join(storage_path, f"archive{file_ext}")
+    # Stream the upload to disk, enforcing the size limit as it arrives
+    archive_path = os.path.join(storage_path, f"archive{file_ext}")
     try:
-        with open(temp_file_path, "wb") as buffer:
-            content = await file.read()
-            if len(content) > settings.max_upload_size:
-                raise HTTPException(
-                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    detail=f"File too large. Maximum size: {settings.max_upload_size // (1024*1024)}MB",
-                )
-            buffer.write(content)
-
-        # Extract archive
-        extract_path = os.path.join(storage_path, "code")
-        os.makedirs(extract_path, exist_ok=True)
-        extract_archive(temp_file_path, extract_path)
-
-        # Remove temp archive file
-        os.remove(temp_file_path)
-
+        _, archive_sha256 = await UploadWriter(settings.max_upload_size).save(file, archive_path)
+    except HTTPException:
+        shutil.rmtree(storage_path, ignore_errors=True)
+        raise
     except Exception as e:
-        # Cleanup on error
-        if os.path.exists(storage_path):
-            shutil.rmtree(storage_path)
+        shutil.rmtree(storage_path, ignore_errors=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process upload: {str(e)}",
         )
 
-    # Create project record
     project = Project(
         id=project_id,
         user_id=current_user.id,
@@ -106,17 +284,244 @@ async def create_project(
         description=description,
         source_type="upload",
         storage_path=storage_path,
+        archive_sha256=archive_sha256,
     )
-    db.add(project)
+    return await _ingest_archive(db, background_tasks, project, archive_path)
+
+
+def _upload_session_paths(session: UploadSession) -> tuple[str, str]:
+    """(storage path of the future project, path its archive is assembled at)."""
+    storage_path = os.path.join(settings.upload_dir, str(session.user_id), str(session.project_id))
+    return storage_path, os.path.join(storage_path, f"archive{_archive_extension(session.filename)}.part")
+
+
+def _upload_session_response(session: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        id=session.id,
+        filename=session.filename,
+        total_size=session.total_size,
+        received_bytes=session.received_bytes,
+        max_chunk_size=settings.upload_chunk_max_bytes,
+        status=session.status,
+        project_id=session.project_id if session.status == "completed" else None,
+        created_at=session.created_at,
+        updated_at=session.updated_at,
+    )
+
+
+def _get_upload_session(db: Session, upload_id: uuid.UUID, user: User) -> UploadSession:
+    session = db.query(UploadSession).filter(
+        UploadSession.id == upload_id,
+        UploadSession.user_id == user.id,
+    ).first()
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload not found",
+        )
+    return session
+
+
+def _expire_upload_sessions(db: Session) -> None:
+    """Discard every user's upload sessions that have been idle past the TTL.
+
+    Unfinished uploads take their received bytes with them; a completed
+    session's files belong to its project, so only the row goes.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=settings.upload_session_ttl_hours)
+    expired = db.query(UploadSession).filter(UploadSession.updated_at < cutoff).all()
+    for session in expired:
+        if session.status != "completed":
+            BlobStore().release(_upload_session_paths(session)[0])
+        db.delete(session)
+
+
+@router.post("/uploads", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+def create_upload_session(
+    upload: UploadSessionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Start a resumable upload; chunks are then PUT in order and the upload completed."""
+    _archive_extension(upload.filename)
+    if upload.size <= 0:
+        raise BadRequestException("Upload size must be positive")
+    if upload.size > settings.max_chunked_upload_size:
+        raise PayloadTooLargeException(
+            f"File too large. Maximum size: {settings.max_chunked_upload_size // (1024 * 1024)}MB"
+        )
+
+    _expire_upload_sessions(db)
+
+    session = UploadSession(
+        user_id=current_user.id,
+        project_id=uuid.uuid4(),
+        name=upload.name,
+        description=upload.description,
+        filename=upload.filename,
+        total_size=upload.size,
+        received_bytes=0,
+        status="uploading",
+    )
+    db.add(session)
     db.commit()
-    db.refresh(project)
+    db.refresh(session)
 
-    return project
+    os.makedirs(_upload_session_paths(session)[0], exist_ok=True)
+    return _upload_session_response(session)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionResponse)
+def get_upload_session(
+    upload_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Current offset of a resumable upload, for resuming after a failure."""
+    return _upload_session_response(_get_upload_session(db, upload_id, current_user))
+
+
+@router.put("/uploads/{upload_id}/chunks", response_model=UploadSessionResponse)
+async def upload_chunk(
+    upload_id: uuid.UUID,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    chunk_sha256: str = Header(..., alias="X-Chunk-SHA256"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Write the request body at offset; the offset only advances if the checksum matches.
+
+    Chunks must arrive in order: offset has to equal the session's received_bytes
+    (a 409 reports the expected offset otherwise).
+    """
+    session = _get_upload_session(db, upload_id, current_user)
+    if session.status != "uploading":
+        raise ConflictException("Upload already completed")
+    if offset != session.received_bytes:
+        raise ConflictException(f"Expected offset {session.received_bytes}")
+
+    max_bytes = min(settings.upload_chunk_max_bytes, session.total_size - offset)
+    _, part_path = _upload_session_paths(session)
+    size, digest = await UploadWriter(max_bytes).write_chunk(request.stream(), part_path, offset)
+    if digest != chunk_sha256.lower():
+        raise BadRequestException("Chunk checksum mismatch")
+
+    # Advance only from the offset this chunk was written at, so a concurrent retry can't double-count
+    updated = db.query(UploadSession).filter(
+        UploadSession.id == session.id,
+        UploadSession.received_bytes == offset,
+    ).update(
+        {UploadSession.received_bytes: offset + size, UploadSession.updated_at: datetime.utcnow()},
+        synchronize_session=False,
+    )
+    db.commit()
+    if not updated:
+        db.refresh(session)
+        raise ConflictException(f"Expected offset {session.received_bytes}")
+
+    db.refresh(session)
+    return _upload_session_response(session)
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
+async def complete_upload_session(
+    upload_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Assemble a fully received upload and hand it to the same ingestion as create_project.
+
+    The session is claimed first, so concurrent or retried completions can't
+    race on its file. If ingestion fails for a reason other than a rejected
+    archive, the assembled upload is kept and completing can be retried.
+    """
+    session = _get_upload_session(db, upload_id, current_user)
+    claimed = db.query(UploadSession).filter(
+        UploadSession.id == session.id,
+        UploadSession.status == "uploading",
+        UploadSession.received_bytes == UploadSession.total_size,
+    ).update(
+        {UploadSession.status: "completing", UploadSession.updated_at: datetime.utcnow()},
+        synchronize_session=False,
+    )
+    db.commit()
+    db.refresh(session)
+    if not claimed:
+        if session.status == "completed":
+            # Retried completion (e.g. the first response was lost)
+            project = db.get(Project, session.project_id)
+            if project is None:
+                raise ConflictException("Upload already completed")
+            return project
+        if session.status == "completing":
+            raise ConflictException("Upload is already being completed")
+        raise ConflictException(f"Upload incomplete: {session.received_bytes} of {session.total_size} bytes")
+
+    storage_path, part_path = _upload_session_paths(session)
+    archive_path = part_path[:-len(".part")]
+    try:
+        os.replace(part_path, archive_path)
+        archive_sha256 = await run_in_threadpool(file_sha256, archive_path)
+
+        project = Project(
+            id=session.project_id,
+            user_id=current_user.id,
+            name=session.name,
+            description=session.description,
+            source_type="upload",
+            storage_path=storage_path,
+            archive_sha256=archive_sha256,
+        )
+        # Committed together with the project
+        session.status = "completed"
+        return await _ingest_archive(db, background_tasks, project, archive_path)
+    except HTTPException:
+        # The archive was rejected (and its storage removed); a retry can't succeed
+        db.rollback()
+        db.delete(session)
+        db.commit()
+        raise
+    except Exception as e:
+        db.rollback()
+        db.refresh(session)
+        if session.status != "completed":
+            if os.path.exists(archive_path):
+                # Still assembled: hand the upload back so completing can be retried
+                os.replace(archive_path, part_path)
+                session.status = "uploading"
+            else:
+                # Already extracted and the archive removed; start over
+                await run_in_threadpool(BlobStore().release, storage_path)
+                db.delete(session)
+            db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to complete upload: {str(e)}",
+        )
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_upload_session(
+    upload_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Abandon an unfinished upload and delete what was received."""
+    session = _get_upload_session(db, upload_id, current_user)
+    if session.status == "completing":
+        raise ConflictException("Upload is being completed")
+    if session.status == "uploading":
+        shutil.rmtree(_upload_session_paths(session)[0], ignore_errors=True)
+    db.delete(session)
+    db.commit()
 
 
 @router.post("/github", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
 async def create_project_from_github(
     project_data: GitHubProjectCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -129,7 +534,8 @@ async def create_project_from_github(
 
     try:
         # Clone repository
-        repo_info = github_service.clone_repository(
+        repo_info = await run_in_threadpool(
+            github_service.clone_repository,
             str(project_data.github_url),
             storage_path,
         )
@@ -155,15 +561,42 @@ async def create_project_from_github(
         description=description,
         source_type="github",
         github_url=str(project_data.github_url),
+        commit_sha=repo_info.get("commit_sha"),
         storage_path=storage_path,
     )
+
     db.add(project)
+    db.flush()
+
+    # Reuse an existing analysis of the same commit, if any
+    cache_hit = _apply_cached_analysis(db, project)
+
     db.commit()
     db.refresh(project)
 
+    if cache_hit:
+        await run_in_threadpool(_index_project, db, project, background_tasks)
+
     return project
 
 
+@router.get("/cache/stats")
+def get_analysis_cache_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get hit/miss counters and size of the shared analysis cache."""
+    return AnalysisCache(db).stats()
+
+
+@router.get("/cache/blobs/stats")
+def get_blob_cache_stats(
+    current_user: User = Depends(get_current_user),
+):
+    """Get hit/miss counters and size of the shared per-file (blob) cache."""
+    return BlobCache().stats()
+
+
 @router.get("/{project_id}", response_model=ProjectWithAnalysis)
 def get_project(
     project_id: uuid.UUID,
@@ -203,9 +636,14 @@ def delete_project(
             detail="Project not found",
         )
 
-    # Delete storage files
+    # Delete storage files (freeing blobs no other upload links) and derived indexes
     if project.storage_path and os.path.exists(project.storage_path):
-        shutil.rmtree(project.storage_path)
+        if project.source_type == "upload":
+            ArchiveFS.forget(upload_code_path(project.storage_path))
+            BlobStore().release(project.storage_path)
+        else:
+            shutil.rmtree(project.storage_path)
+    ProjectIndexer(db).delete_indexes(project.id)
 
     db.delete(project)
     db.commit()
@@ -214,6 +652,7 @@ def delete_project(
 @router.get("/{project_id}/analysis", response_model=ProjectWithAnalysis)
 def get_project_analysis(
     project_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
     refresh: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -234,19 +673,129 @@ def get_project_analysis(
     if project.analysis_data and not refresh:
         return project
 
-    # Run analysis
-    analyzer = CodeAnalyzer()
-    code_path = os.path.join(project.storage_path, "code") if project.source_type == "upload" else project.storage_path
-
-    try:
-        analysis_data = analyzer.analyze(code_path)
-        project.analysis_data = analysis_data
+    # Projects at an already-analyzed commit (or archive) can reuse the shared result
+    if not refresh and _apply_cached_analysis(db, project):
         db.commit()
         db.refresh(project)
+        _index_project(db, project, background_tasks)
+        return project
+
+    _run_analysis(db, project, background_tasks)
+    return project
+
+
+@router.post("/{project_id}/refresh", response_model=ProjectWithAnalysis)
+def refresh_project(
+    project_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Update a GitHub project to its repository's latest commit.
+
+    Only the files changed between the old and new commit are re-analyzed, and
+    the project's documents are kept.
+    """
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id,
+    ).first()
+
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+
+    if project.source_type != "github":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only GitHub projects can be refreshed",
+        )
+
+    code_path = _get_code_path(project)
+    try:
+        repo_info = GitHubService().update_checkout(project.github_url, code_path)
     except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Analysis failed: {str(e)}",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
         )
 
+    old_sha, new_sha = project.commit_sha, repo_info["commit_sha"]
+    if new_sha == old_sha and project.analysis_data:
+        return project
+
+    changed_paths = None
+    if old_sha and project.analysis_data:
+        try:
+            changed_paths = GitTree(code_path).changed_paths(old_sha, new_sha)
+        except RuntimeError:
+            # Old commit no longer available - compare the whole tree instead
+            changed_paths = None
+
+    project.previous_commit_sha = old_sha
+    project.commit_sha = new_sha
+
+    # Another project may already have analyzed the new commit
+    if _apply_cached_analysis(db, project):
+        db.commit()
+        db.refresh(project)
+        _index_project(db, project, background_tasks)
+        return project
+
+    _run_analysis(db, project, background_tasks, changed_paths=changed_paths)
     return project
+
+
+@router.get("/{project_id}/files", response_model=ProjectFileList)
+def list_project_files(
+    project_id: uuid.UUID,
+    prefix: str = None,
+    glob: str = None,
+    language: str = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List a project's analyzed files, paginated.
+
+    prefix restricts to a directory or path prefix (e.g. "src/api/"). glob matches the
+    whole relative path, where * and ** match any run of characters including "/"
+    (e.g. "*.py", "src/**/test_*.py").
+    """
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.user_id == current_user.id,
+    ).first()
+
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+
+    query = db.query(ProjectFile).filter(ProjectFile.project_id == project.id)
+
+    if prefix:
+        query = query.filter(ProjectFile.path.startswith(prefix, autoescape=True))
+    if glob:
+        query = query.filter(ProjectFile.path.like(_glob_to_like(glob), escape='\\'))
+    if language:
+        query = query.filter(ProjectFile.language == language)
+
+    total = query.count()
+    items = (
+        query.order_by(ProjectFile.path)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
+
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+    }
@@ -40,6 +40,10 @@ def create_section(
         description=section_data.description,
         default_order=section_data.default_order,
         applicable_doc_types=section_data.applicable_doc_types,
+        retrieval_rules=(
+            section_data.retrieval_rules.model_dump()
+            if section_data.retrieval_rules else None
+        ),
         is_system=False,
         user_id=current_user.id,
     )
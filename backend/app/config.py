@@ -28,9 +28,43 @@ class Settings(BaseSettings):
     anthropic_api_key: str = ""
     github_token: str = ""
 
+    # Local bare mirrors shared by every import of a repository ("" clones directly)
+    git_mirror_dir: str = "./mirrors"
+    git_mirror_ttl_seconds: int = 60  # Reuse a mirror without fetching if fetched this recently
+    git_clone_depth: int = 1  # History fetched into mirrors (0 = full)
+
     # File uploads
     upload_dir: str = "./uploads"
     max_upload_size: int = 50 * 1024 * 1024  # 50MB
+    max_chunked_upload_size: int = 2 * 1024 * 1024 * 1024  # 2GB, via resumable upload sessions
+    upload_chunk_max_bytes: int = 8 * 1024 * 1024  # Largest single chunk of a resumable upload
+    upload_session_ttl_hours: int = 24  # Unfinished sessions idle this long are discarded
+    extract_max_bytes: int = 1024 * 1024 * 1024  # Total uncompressed size of extracted members
+    extract_max_entries: int = 200_000  # Members per archive, extracted or not
+    extract_max_ratio: int = 100  # Uncompressed / archive size
+    analyze_archives_in_place: bool = True  # Read zip/plain tar uploads without extracting them
+    upload_dedup: bool = True  # Store uploaded files once in upload_dir/blobs, hardlinked into projects
+
+    # Code analysis
+    analyzer_workers: int = 0  # Thread pool size for the analysis walk (0 = auto)
+    analyzer_sloc: bool = False  # Report blank/comment/code line breakdown per language
+    analyzer_max_file_bytes: int = 5 * 1024 * 1024  # Larger files are classed oversized and not read
+    analyzer_ignore_files: bool = True  # Honour .gitignore/.docugenignore in the walk
+    analyzer_git_native: bool = True  # Analyze GitHub projects from the git object database
+    analysis_cache_max_bytes: int = 256 * 1024 * 1024  # 256MB of cached analysis results
+    blob_cache_max_bytes: int = 128 * 1024 * 1024  # 128MB of cached per-file results (0 disables)
+    index_dir: str = "./indexes"  # Per-project search indexes used for context selection
+
+    # Document generation
+    generation_concurrency: int = 4  # Sections of one document generated at once
+    generation_max_concurrency: int = 8  # LLM calls in flight across all documents
+    generation_job_lease_seconds: int = 120  # A running job whose heartbeat is older is resumed elsewhere
+    llm_cache_max_bytes: int = 64 * 1024 * 1024  # 64MB of cached LLM responses in the database (0 disables)
+    llm_cache_ttl_seconds: int = 7 * 24 * 60 * 60  # Cached responses older than this are not reused
+    llm_cache_memory_entries: int = 256  # Per-process LRU in front of the database tier
+    ai_max_connections: int = 20  # Pooled keep-alive connections per LLM provider
+    ai_keepalive_seconds: float = 60  # Idle pooled connections are closed after this long
+    ai_request_timeout_seconds: float = 120  # Per LLM request (connect timeout is 10s)
 
     # App settings
     app_name: str = "DocuGen"
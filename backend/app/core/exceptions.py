@@ -28,3 +28,8 @@ class BadRequestException(HTTPException):
 class ConflictException(HTTPException):
     def __init__(self, detail: str = "Resource already exists"):
         super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+class PayloadTooLargeException(HTTPException):
+    def __init__(self, detail: str = "Payload too large"):
+        super().__init__(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
@@ -24,6 +24,9 @@ def seed_sections(db: Session) -> dict:
         # Check if section already exists
         existing = db.query(Section).filter(Section.id == section_data['id']).first()
         if existing:
+            # Backfill retrieval rules added to the library after the first seed
+            if existing.retrieval_rules is None and section_data.get('retrieval_rules'):
+                existing.retrieval_rules = section_data['retrieval_rules']
             id_map[section_data['id']] = existing.id
             continue
 
@@ -32,6 +35,7 @@ def seed_sections(db: Session) -> dict:
             name=section_data['name'],
             description=section_data['description'],
             default_order=section_data.get('default_order'),
+            retrieval_rules=section_data.get('retrieval_rules'),
             is_system=True,
         )
         db.add(section)
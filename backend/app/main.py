@@ -1,18 +1,32 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api import auth, projects, documents, sections, templates, generation
 from app.database import engine, Base
+from app.services.ai_service import get_ai_service
+from app.services.generation_jobs import get_generation_jobs
+from app.services.symbol_index import shutdown_parse_pool
 # Import all models to ensure they're registered with Base
-from app.models import user, project, document, section, document_type, generated_content
+from app.models import user, project, project_file, document, section, document_type, generated_content, analysis_cache, generation_job, llm_response_cache
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Create all database tables on startup (for SQLite development)
     Base.metadata.create_all(bind=engine)
+    # Pre-connect to the LLM providers without holding up startup
+    ai_service = get_ai_service()
+    warm_up = asyncio.create_task(ai_service.start())
+    # Pick up generation jobs left queued or interrupted by the last shutdown
+    generation_jobs = get_generation_jobs()
+    await generation_jobs.start()
     yield
+    await generation_jobs.shutdown()
+    warm_up.cancel()
+    await ai_service.close()
+    shutdown_parse_pool()
 
 
 app = FastAPI(
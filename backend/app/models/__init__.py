@@ -1,17 +1,30 @@
 from app.models.user import User
 from app.models.project import Project
+from app.models.project_file import ProjectFile
 from app.models.document_type import DocumentType, DocumentTypeSection
 from app.models.section import Section
 from app.models.document import Document, DocumentSection
 from app.models.generated_content import GeneratedContent
+from app.models.analysis_cache import AnalysisCacheEntry
+from app.models.blob_cache import BlobCacheEntry
+from app.models.upload_session import UploadSession
+from app.models.generation_job import GenerationJob, GenerationJobSection
+from app.models.llm_response_cache import LLMResponseCacheEntry
 
 __all__ = [
     "User",
     "Project",
+    "ProjectFile",
     "DocumentType",
     "DocumentTypeSection",
     "Section",
     "Document",
     "DocumentSection",
     "GeneratedContent",
+    "AnalysisCacheEntry",
+    "BlobCacheEntry",
+    "UploadSession",
+    "GenerationJob",
+    "GenerationJobSection",
+    "LLMResponseCacheEntry",
 ]
@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime
+from app.database import Base
+from app.models.types import JSONType
+
+
+class AnalysisCacheEntry(Base):
+    """Analysis result shared by every project on the same repository commit."""
+    __tablename__ = "analysis_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # sha256 of normalized URL + commit SHA
+    repo_url = Column(String(500), nullable=False)  # "upload" for uploaded archives
+    commit_sha = Column(String(64), nullable=False)  # Or the archive's SHA-256 for uploads
+    data = Column(JSONType(), nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,18 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Integer, DateTime
+from app.database import Base
+from app.models.types import JSONType
+
+
+class BlobCacheEntry(Base):
+    """Per-file analysis result shared by every project containing the same blob."""
+    __tablename__ = "blob_cache"
+
+    cache_key = Column(String(128), primary_key=True)  # kind:content hash:variant
+    kind = Column(String(20), nullable=False)  # "analysis" or "symbols"
+    content_hash = Column(String(40), nullable=False, index=True)  # git blob SHA-1
+    data = Column(JSONType(), nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
@@ -0,0 +1,77 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Boolean
+from sqlalchemy.orm import relationship
+from app.database import Base
+from app.models.types import GUID
+
+
+class GenerationJob(Base):
+    """A document generation run, processed in the background and resumable after a restart."""
+    __tablename__ = "generation_jobs"
+
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    document_id = Column(
+        GUID(),
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    user_id = Column(GUID(), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, completed, failed, cancelled
+    error = Column(Text)
+    fresh = Column(Boolean, default=False)  # Bypass the LLM response cache
+    worker_id = Column(String(64))  # Process currently running the job
+    heartbeat_at = Column(DateTime)  # Refreshed while running; a stale heartbeat frees the job
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    # Relationships
+    document = relationship("Document")
+    sections = relationship(
+        "GenerationJobSection",
+        back_populates="job",
+        cascade="all, delete-orphan",
+        order_by="GenerationJobSection.display_order",
+    )
+
+    ACTIVE_STATUSES = ("queued", "running")
+
+    @property
+    def total_sections(self) -> int:
+        return len(self.sections)
+
+    @property
+    def finished_sections(self) -> int:
+        return sum(1 for s in self.sections if s.status in GenerationJobSection.FINISHED_STATUSES)
+
+
+class GenerationJobSection(Base):
+    """One section's progress within a generation job."""
+    __tablename__ = "generation_job_sections"
+
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    job_id = Column(
+        GUID(),
+        ForeignKey("generation_jobs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    document_section_id = Column(
+        GUID(),
+        ForeignKey("document_sections.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    title = Column(String(255), nullable=False)
+    display_order = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done, failed, placeholder, cancelled
+    content_id = Column(GUID())  # GeneratedContent saved for this section
+    error = Column(Text)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    # Relationships
+    job = relationship("GenerationJob", back_populates="sections")
+
+    FINISHED_STATUSES = ("done", "failed", "placeholder", "cancelled")
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Column, String, Text, Integer, DateTime
+from app.database import Base
+
+
+class LLMResponseCacheEntry(Base):
+    """An LLM response, shared by every API node sending the same prompt to the same model."""
+    __tablename__ = "llm_response_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # SHA-256 of provider, model, system prompt and prompt
+    provider = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    response = Column(Text, nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
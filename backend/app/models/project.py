@@ -15,7 +15,10 @@ class Project(Base):
     description = Column(Text)
     source_type = Column(String(50), nullable=False)  # 'upload' or 'github'
     github_url = Column(String(500))
+    commit_sha = Column(String(40))  # HEAD commit of the cloned repository
+    previous_commit_sha = Column(String(40))  # Commit before the last refresh
     storage_path = Column(String(500))  # Local path to extracted files
+    archive_sha256 = Column(String(64))  # SHA-256 of the uploaded archive
     analysis_data = Column(JSONType())  # Cached analysis results
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -23,3 +26,10 @@ class Project(Base):
     # Relationships
     user = relationship("User", back_populates="projects")
     documents = relationship("Document", back_populates="project", cascade="all, delete-orphan")
+    files = relationship(
+        "ProjectFile",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="dynamic",
+    )
@@ -0,0 +1,40 @@
+import uuid
+from sqlalchemy import Column, String, Integer, BigInteger, Float, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+from app.models.types import GUID, JSONType
+
+
+class ProjectFile(Base):
+    """One file in a project's analysis manifest and file listing."""
+    __tablename__ = "project_files"
+
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    project_id = Column(
+        GUID(),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    path = Column(String(1024), nullable=False)  # Relative to the project's code root
+    size = Column(BigInteger, default=0)
+    mtime = Column(Float)
+    content_hash = Column(String(40))  # Git blob SHA-1, only for files the analyzer reads
+    language = Column(String(50))
+    file_class = Column(String(20))  # FileClassifier class (normal, binary, minified, generated, ...)
+    line_count = Column(Integer, default=0)
+    details = Column(JSONType())  # Per-file extras (e.g. SLOC breakdown)
+
+    # Relationships
+    project = relationship("Project", back_populates="files")
+
+    __table_args__ = (
+        UniqueConstraint("project_id", "path", name="uq_project_file_path"),
+        # Serves path-prefix (LIKE 'dir/%') listings; PostgreSQL needs pattern ops for that
+        Index(
+            "ix_project_files_path_prefix",
+            "project_id",
+            "path",
+            postgresql_ops={"path": "text_pattern_ops"},
+        ),
+    )
@@ -3,7 +3,7 @@ from datetime import datetime
 from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Boolean, Integer
 from sqlalchemy.orm import relationship
 from app.database import Base
-from app.models.types import GUID, GUIDArray
+from app.models.types import GUID, GUIDArray, JSONType
 
 
 class Section(Base):
@@ -14,6 +14,7 @@ class Section(Base):
     description = Column(Text, nullable=False)  # Used as prompt context
     default_order = Column(Integer)
     applicable_doc_types = Column(GUIDArray())  # Array of document_type IDs
+    retrieval_rules = Column(JSONType())  # {"patterns": [...], "extensions": [...], "exclude": [...]}
     is_system = Column(Boolean, default=True)
     user_id = Column(GUID(), ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,22 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, Text, BigInteger, DateTime, ForeignKey
+from app.database import Base
+from app.models.types import GUID
+
+
+class UploadSession(Base):
+    """A resumable, chunked archive upload that becomes a project on completion."""
+    __tablename__ = "upload_sessions"
+
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    user_id = Column(GUID(), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(GUID(), nullable=False)  # Reserved for the project created on completion
+    name = Column(String(255), nullable=False)
+    description = Column(Text)
+    filename = Column(String(255), nullable=False)
+    total_size = Column(BigInteger, nullable=False)
+    received_bytes = Column(BigInteger, nullable=False, default=0)  # Contiguous bytes written so far
+    status = Column(String(20), nullable=False, default="uploading")  # 'uploading', 'completing' or 'completed'
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -11,6 +11,10 @@ from app.schemas.project import (
     ProjectResponse,
     ProjectWithAnalysis,
     GitHubProjectCreate,
+    ProjectFileResponse,
+    ProjectFileList,
+    UploadSessionCreate,
+    UploadSessionResponse,
 )
 from app.schemas.document import (
     DocumentCreate,
@@ -22,9 +26,14 @@ from app.schemas.document import (
     DocumentSectionResponse,
     SectionReorderRequest,
 )
+from app.schemas.generation import (
+    GenerationJobResponse,
+    GenerationJobSectionResponse,
+)
 from app.schemas.section import (
     SectionCreate,
     SectionResponse,
+    SectionRetrievalRules,
     DocumentTypeCreate,
     DocumentTypeResponse,
     DocumentTypeWithSections,
@@ -42,6 +51,10 @@ __all__ = [
     "ProjectResponse",
     "ProjectWithAnalysis",
     "GitHubProjectCreate",
+    "ProjectFileResponse",
+    "ProjectFileList",
+    "UploadSessionCreate",
+    "UploadSessionResponse",
     "DocumentCreate",
     "DocumentUpdate",
     "DocumentResponse",
@@ -50,8 +63,11 @@ __all__ = [
     "DocumentSectionUpdate",
     "DocumentSectionResponse",
     "SectionReorderRequest",
+    "GenerationJobResponse",
+    "GenerationJobSectionResponse",
     "SectionCreate",
     "SectionResponse",
+    "SectionRetrievalRules",
     "DocumentTypeCreate",
     "DocumentTypeResponse",
     "DocumentTypeWithSections",
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class GenerationJobSectionResponse(BaseModel):
+    id: UUID
+    document_section_id: UUID
+    title: str
+    display_order: int
+    status: str  # queued, running, done, failed, placeholder, cancelled
+    content_id: Optional[UUID] = None
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class GenerationJobResponse(BaseModel):
+    id: UUID
+    document_id: UUID
+    status: str  # queued, running, completed, failed, cancelled
+    error: Optional[str] = None
+    fresh: bool = False  # AI response cache bypassed
+    total_sections: int  # Computed property
+    finished_sections: int  # Computed property
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    sections: list[GenerationJobSectionResponse]
+
+    class Config:
+        from_attributes = True
@@ -26,6 +26,8 @@ class ProjectResponse(BaseModel):
     description: Optional[str]
     source_type: str
     github_url: Optional[str]
+    commit_sha: Optional[str] = None
+    previous_commit_sha: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -35,3 +37,40 @@ class ProjectResponse(BaseModel):
 
 class ProjectWithAnalysis(ProjectResponse):
     analysis_data: Optional[dict[str, Any]]
+
+
+class ProjectFileResponse(BaseModel):
+    path: str
+    language: Optional[str]
+    file_class: Optional[str] = None
+    size: Optional[int]
+    line_count: Optional[int]
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectFileList(BaseModel):
+    items: list[ProjectFileResponse]
+    total: int
+    page: int
+    page_size: int
+
+
+class UploadSessionCreate(BaseModel):
+    name: str
+    description: Optional[str] = None
+    filename: str
+    size: int
+
+
+class UploadSessionResponse(BaseModel):
+    id: UUID
+    filename: str
+    total_size: int
+    received_bytes: int  # Offset the next chunk must start at
+    max_chunk_size: int
+    status: str
+    project_id: Optional[UUID] = None  # Set once completed
+    created_at: datetime
+    updated_at: datetime
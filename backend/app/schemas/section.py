@@ -4,11 +4,19 @@ from uuid import UUID
 from pydantic import BaseModel
 
 
+class SectionRetrievalRules(BaseModel):
+    """Path rules used to pick code files as context for a section."""
+    patterns: list[str] = []  # Substrings matched against path components
+    extensions: list[str] = []  # Restrict matches to these extensions (without dot)
+    exclude: list[str] = []  # Drop files whose path components contain any of these
+
+
 class SectionCreate(BaseModel):
     name: str
     description: str
     default_order: Optional[int] = None
     applicable_doc_types: Optional[list[UUID]] = None
+    retrieval_rules: Optional[SectionRetrievalRules] = None
 
 
 class SectionResponse(BaseModel):
@@ -17,6 +25,7 @@ class SectionResponse(BaseModel):
     description: str
     default_order: Optional[int]
     is_system: bool
+    retrieval_rules: Optional[SectionRetrievalRules] = None
     created_at: datetime
 
     class Config:
@@ -0,0 +1,175 @@
+"""Asyncio-native LLM provider clients over pooled, keep-alive HTTP connections."""
+import json
+from typing import Any, AsyncIterator, Optional
+import httpx
+from app.config import settings
+
+
+class AIProvider:
+    """One LLM provider's REST API behind a shared httpx.AsyncClient.
+
+    The client keeps up to settings.ai_max_connections connections alive between
+    calls, so concurrent and back-to-back generations reuse warm TLS sessions
+    instead of reconnecting. Awaiting a call holds no thread.
+    """
+
+    name = "provider"
+    base_url = ""
+    model = ""
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on first use so it binds to the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers(),
+                timeout=httpx.Timeout(settings.ai_request_timeout_seconds, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=settings.ai_max_connections,
+                    max_keepalive_connections=settings.ai_max_connections,
+                    keepalive_expiry=settings.ai_keepalive_seconds,
+                ),
+            )
+        return self._client
+
+    def headers(self) -> dict[str, str]:
+        return {}
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection (TCP + TLS) ahead of the first generation."""
+        try:
+            await self.client.get("/")
+        except httpx.HTTPError as e:
+            print(f"AI Service: Could not pre-connect to {self.name}: {e}")
+
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        raise NotImplementedError
+
+    async def stream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        """Yield the response text in pieces as the provider produces it."""
+        yield await self.generate(prompt, system_prompt)
+
+    async def _sse_events(self, path: str, body: dict[str, Any]) -> AsyncIterator[dict[str, Any]]:
+        """POST a streaming request and yield the JSON payload of each server-sent event."""
+        async with self.client.stream("POST", path, json=body) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    data = line[5:].strip()
+                    if data and data != "[DONE]":
+                        yield json.loads(data)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class GeminiProvider(AIProvider):
+    """Google Gemini via the Generative Language REST API."""
+
+    name = "Gemini"
+    base_url = "https://generativelanguage.googleapis.com"
+    # gemini-2.0-flash - fast and capable
+    model = "gemini-2.0-flash"
+
+    def headers(self) -> dict[str, str]:
+        return {"x-goog-api-key": self.api_key}
+
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        response = await self.client.post(
+            f"/v1beta/models/{self.model}:generateContent",
+            json=self._body(prompt, system_prompt),
+        )
+        response.raise_for_status()
+        payload = response.json()
+        self._check_finished(payload)
+        text = self._text(payload)
+        if not text:
+            raise RuntimeError("Gemini returned an empty response")
+        return text
+
+    async def stream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        events = self._sse_events(
+            f"/v1beta/models/{self.model}:streamGenerateContent?alt=sse",
+            self._body(prompt, system_prompt),
+        )
+        produced = False
+        async for event in events:
+            text = self._text(event)
+            if text:
+                produced = True
+                yield text
+            self._check_finished(event)
+        if not produced:
+            raise RuntimeError("Gemini returned an empty response")
+
+    def _body(self, prompt: str, system_prompt: str) -> dict[str, Any]:
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        return {"contents": [{"role": "user", "parts": [{"text": full_prompt}]}]}
+
+    @staticmethod
+    def _check_finished(payload: dict[str, Any]) -> None:
+        """Raise if the prompt was blocked or generation stopped for any reason but STOP.
+
+        Gemini reports safety blocks, recitation and token limits as a successful
+        response with missing or truncated text; raising lets the caller fall back.
+        """
+        block_reason = (payload.get("promptFeedback") or {}).get("blockReason")
+        if block_reason:
+            raise RuntimeError(f"Gemini blocked the prompt: {block_reason}")
+        candidates = payload.get("candidates") or [{}]
+        finish_reason = candidates[0].get("finishReason")
+        if finish_reason and finish_reason != "STOP":
+            raise RuntimeError(f"Gemini stopped generating: {finish_reason}")
+
+    @staticmethod
+    def _text(payload: dict[str, Any]) -> str:
+        candidates = payload.get("candidates") or [{}]
+        parts = candidates[0].get("content", {}).get("parts", [])
+        return "".join(part.get("text", "") for part in parts)
+
+
+class AnthropicProvider(AIProvider):
+    """Anthropic Claude via the Messages REST API."""
+
+    name = "Anthropic"
+    base_url = "https://api.anthropic.com"
+    model = "claude-3-haiku-20240307"
+    api_version = "2023-06-01"
+    max_tokens = 4096
+
+    def headers(self) -> dict[str, str]:
+        return {"x-api-key": self.api_key, "anthropic-version": self.api_version}
+
+    async def generate(self, prompt: str, system_prompt: str = "") -> str:
+        response = await self.client.post("/v1/messages", json=self._body(prompt, system_prompt))
+        response.raise_for_status()
+        return response.json()["content"][0]["text"]
+
+    async def stream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        events = self._sse_events("/v1/messages", {**self._body(prompt, system_prompt), "stream": True})
+        async for event in events:
+            if event.get("type") == "content_block_delta":
+                text = event.get("delta", {}).get("text")
+                if text:
+                    yield text
+            elif event.get("type") == "error":
+                raise RuntimeError(event.get("error", {}).get("message", "Anthropic stream error"))
+
+    def _body(self, prompt: str, system_prompt: str) -> dict[str, Any]:
+        body = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system_prompt:
+            body["system"] = system_prompt
+        return body
@@ -1,81 +1,120 @@
 """Unified AI service with Gemini (priority) and Anthropic (fallback) support."""
 import json
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, Optional
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.services.ai_providers import AIProvider, AnthropicProvider, GeminiProvider
+from app.services.response_cache import ResponseCache
 
 
 class AIService:
-    """Unified AI service that prioritizes Gemini, falls back to Anthropic."""
+    """Unified AI service that prioritizes Gemini, falls back to Anthropic.
+
+    Calls are async: providers talk to their REST APIs over pooled keep-alive
+    connections (see ai_providers), so an outstanding generation holds no thread.
+    Responses are cached by prompt fingerprint (see response_cache); pass
+    fresh=True to skip the lookup and store a newly generated response.
+    """
 
     def __init__(self):
-        self.gemini_client = None
-        self.anthropic_client = None
+        self.providers: list[AIProvider] = []
+        self.cache = ResponseCache()
         self._init_clients()
 
     def _init_clients(self):
         """Initialize available AI clients."""
         # Try Gemini first (priority)
         if settings.gemini_api_key:
-            try:
-                import google.generativeai as genai
-                genai.configure(api_key=settings.gemini_api_key)
-                # Use gemini-2.0-flash - fast and capable
-                self.gemini_client = genai.GenerativeModel('gemini-2.0-flash')
-                print("AI Service: Gemini initialized (primary)")
-            except Exception as e:
-                print(f"AI Service: Failed to initialize Gemini: {e}")
+            self.providers.append(GeminiProvider(settings.gemini_api_key))
+            print("AI Service: Gemini initialized (primary)")
 
         # Try Anthropic as fallback
         if settings.anthropic_api_key:
-            try:
-                from anthropic import Anthropic
-                self.anthropic_client = Anthropic(api_key=settings.anthropic_api_key)
-                print("AI Service: Anthropic initialized (fallback)")
-            except Exception as e:
-                print(f"AI Service: Failed to initialize Anthropic: {e}")
+            self.providers.append(AnthropicProvider(settings.anthropic_api_key))
+            print("AI Service: Anthropic initialized (fallback)")
 
-        if not self.gemini_client and not self.anthropic_client:
+        if not self.providers:
             print("AI Service: No AI provider available - will use placeholder content")
 
-    def generate_content(self, prompt: str, system_prompt: str = "") -> str:
+    async def start(self) -> None:
+        """Warm every provider's connection pool (called at application startup)."""
+        await asyncio.gather(*(provider.warm_up() for provider in self.providers))
+
+    async def close(self) -> None:
+        await asyncio.gather(*(provider.aclose() for provider in self.providers))
+
+    async def generate_content(self, prompt: str, system_prompt: str = "", fresh: bool = False) -> str:
         """Generate content using available AI provider."""
-        # Try Gemini first
-        if self.gemini_client:
+        keys = self._cache_keys(prompt, system_prompt)
+        cached = await self._cached(keys, fresh)
+        if cached is not None:
+            return cached
+
+        for provider, key in keys:
             try:
-                return self._generate_with_gemini(prompt, system_prompt)
+                content = await provider.generate(prompt, system_prompt)
             except Exception as e:
-                print(f"Gemini generation failed: {e}")
+                print(f"{provider.name} generation failed: {e}")
+                continue
+            if not content:
+                print(f"{provider.name} generation failed: empty response")
+                continue
+            await run_in_threadpool(self.cache.put, key, provider.name, provider.model, content)
+            return content
+
+        # All failed - raise to trigger placeholder
+        raise Exception("No AI provider available or all providers failed")
 
-        # Try Anthropic as fallback
-        if self.anthropic_client:
+    async def stream_content(self, prompt: str, system_prompt: str = "", fresh: bool = False) -> AsyncIterator[str]:
+        """Stream content from the first provider that responds.
+
+        Falls back to the next provider only until the first piece of text has
+        been yielded; a stream that breaks after that raises. A cached response
+        is yielded whole.
+        """
+        keys = self._cache_keys(prompt, system_prompt)
+        cached = await self._cached(keys, fresh)
+        if cached is not None:
+            yield cached
+            return
+
+        for provider, key in keys:
+            parts = []
             try:
-                return self._generate_with_anthropic(prompt, system_prompt)
+                async for text in provider.stream(prompt, system_prompt):
+                    parts.append(text)
+                    yield text
             except Exception as e:
-                print(f"Anthropic generation failed: {e}")
+                if parts:
+                    raise
+                print(f"{provider.name} streaming failed: {e}")
+                continue
+            if not parts:
+                print(f"{provider.name} streaming failed: empty response")
+                continue
+            await run_in_threadpool(self.cache.put, key, provider.name, provider.model, "".join(parts))
+            return
 
-        # Both failed - raise to trigger placeholder
         raise Exception("No AI provider available or all providers failed")
 
-    def _generate_with_gemini(self, prompt: str, system_prompt: str = "") -> str:
-        """Generate content using Gemini."""
-        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-        response = self.gemini_client.generate_content(full_prompt)
-        return response.text
-
-    def _generate_with_anthropic(self, prompt: str, system_prompt: str = "") -> str:
-        """Generate content using Anthropic Claude."""
-        kwargs = {
-            "model": "claude-3-haiku-20240307",
-            "max_tokens": 4096,
-            "messages": [{"role": "user", "content": prompt}],
-        }
-        if system_prompt:
-            kwargs["system"] = system_prompt
-
-        response = self.anthropic_client.messages.create(**kwargs)
-        return response.content[0].text
-
-    def suggest_sections(
+    def _cache_keys(self, prompt: str, system_prompt: str) -> list[tuple[AIProvider, str]]:
+        """Each provider with its cache key for this prompt, in priority order."""
+        return [
+            (provider, self.cache.make_key(provider.name, provider.model, system_prompt, prompt))
+            for provider in self.providers
+        ]
+
+    async def _cached(self, keys: list[tuple[AIProvider, str]], fresh: bool) -> Optional[str]:
+        """A cached response from any configured provider, unless fresh is requested."""
+        if not keys:
+            return None
+        if fresh:
+            self.cache.record_bypass()
+            return None
+        return await run_in_threadpool(self.cache.get, [key for _, key in keys])
+
+    async def suggest_sections(
         self,
         document_type: str,
         code_analysis: dict,
@@ -109,7 +148,7 @@ Return a JSON array with objects containing:
 Only include sections with relevance_score >= 0.5. Return ONLY valid JSON array, no other text."""
 
         try:
-            response = self.generate_content(prompt, system_prompt)
+            response = await self.generate_content(prompt, system_prompt)
             # Parse JSON from response
             json_str = response.strip()
             if json_str.startswith("```"):
@@ -121,14 +160,39 @@ Only include sections with relevance_score >= 0.5. Return ONLY valid JSON array,
             print(f"AI section suggestion failed: {e}")
             return []
 
-    def generate_section_content(
+    async def generate_section_content(
         self,
         section_title: str,
         section_description: str,
         code_context: str,
         document_type: str,
+        fresh: bool = False,
     ) -> str:
         """Generate content for a documentation section."""
+        prompt, system_prompt = self._section_prompts(section_title, section_description, code_context, document_type)
+        return await self.generate_content(prompt, system_prompt, fresh=fresh)
+
+    async def stream_section_content(
+        self,
+        section_title: str,
+        section_description: str,
+        code_context: str,
+        document_type: str,
+        fresh: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream content for a documentation section as it is generated."""
+        prompt, system_prompt = self._section_prompts(section_title, section_description, code_context, document_type)
+        async for text in self.stream_content(prompt, system_prompt, fresh=fresh):
+            yield text
+
+    def _section_prompts(
+        self,
+        section_title: str,
+        section_description: str,
+        code_context: str,
+        document_type: str,
+    ) -> tuple[str, str]:
+        """Build the (prompt, system prompt) pair for a section."""
         system_prompt = f"""You are a technical writer creating {document_type} documentation.
 Write clear, professional documentation that is:
 - Well-structured with proper markdown formatting
@@ -150,7 +214,7 @@ Write professional documentation content in markdown format. Include:
 
 Do not include the section title as a header (it will be added separately)."""
 
-        return self.generate_content(prompt, system_prompt)
+        return prompt, system_prompt
 
 
 # Singleton instance
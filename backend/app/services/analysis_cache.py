@@ -0,0 +1,181 @@
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import AnalysisCacheEntry, Project
+from app.services.code_analyzer import CodeAnalyzer
+
+# Process-wide hit/miss counters (per-entry hit counts are persisted on the rows)
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+# Per-run keys that don't belong to the shared result
+_VOLATILE_KEYS = ("changes", "analyzed_at")
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+class AnalysisCache:
+    """Content-addressed cache of analysis results keyed by repository URL and commit SHA.
+
+    A commit fully determines a repository's tree, so any project cloned at the same
+    commit (another user, or a re-import) can reuse the stored analysis_data and
+    file manifest without walking the tree. Entries are evicted least-recently-used
+    once the total stored size exceeds settings.analysis_cache_max_bytes.
+
+    Uploaded archives are cached the same way under UPLOAD_SOURCE and the
+    archive's SHA-256, so re-uploading identical bytes skips analysis too.
+
+    Keys also carry a variant of the analyzer's versions and the settings that
+    shape a result, so an analysis is only reused under the rules it was made with.
+    """
+
+    UPLOAD_SOURCE = "upload"
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.max_bytes = settings.analysis_cache_max_bytes
+
+    @classmethod
+    def source_of(cls, project: Project) -> Optional[tuple[str, str]]:
+        """(repository URL, commit) identifying a project's contents, or None if unknown."""
+        if project.source_type == "github" and project.commit_sha:
+            return project.github_url, project.commit_sha
+        if project.source_type == "upload" and project.archive_sha256:
+            return cls.UPLOAD_SOURCE, project.archive_sha256
+        return None
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """Normalize a repository URL so equivalent spellings share a key."""
+        url = url.strip().lower()
+        for prefix in ("https://", "http://", "git@", "ssh://"):
+            if url.startswith(prefix):
+                url = url[len(prefix):]
+        url = url.split("@")[-1].replace(":", "/")
+        url = url.rstrip("/")
+        if url.endswith(".git"):
+            url = url[:-4]
+        return url
+
+    @staticmethod
+    def variant() -> str:
+        """Analyzer versions and settings an analysis result depends on."""
+        return ":".join((
+            f"v{CodeAnalyzer.ANALYSIS_VERSION}.{CodeAnalyzer.BLOB_CACHE_VERSION}",
+            "sloc" if settings.analyzer_sloc else "lines",
+            "ignore" if settings.analyzer_ignore_files else "all",
+            str(settings.analyzer_max_file_bytes),
+        ))
+
+    @classmethod
+    def make_key(cls, repo_url: str, commit_sha: str) -> str:
+        """Content address for a repository commit under the current analyzer variant."""
+        raw = f"{cls.normalize_url(repo_url)}@{commit_sha.lower()}#{cls.variant()}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, repo_url: str, commit_sha: str) -> Optional[dict[str, Any]]:
+        """Return the cached entry for a commit, or None.
+
+        The entry's access time and hit count are updated in the caller's transaction.
+
+        Returns:
+            dict: {"analysis_data": {...}, "files": [manifest entries]}
+        """
+        entry = self.db.get(AnalysisCacheEntry, self.make_key(repo_url, commit_sha))
+        if entry is None:
+            _count("misses")
+            return None
+
+        _count("hits")
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_accessed_at = datetime.utcnow()
+        return {
+            "analysis_data": dict(entry.data["analysis_data"]),
+            "files": entry.data.get("files", []),
+        }
+
+    def put(
+        self,
+        repo_url: str,
+        commit_sha: str,
+        analysis_data: dict[str, Any],
+        files: list[dict[str, Any]],
+    ) -> None:
+        """Store analysis data and manifest for a commit, then evict down to the size budget."""
+        data = {
+            "analysis_data": {k: v for k, v in analysis_data.items() if k not in _VOLATILE_KEYS},
+            "files": files,
+        }
+        size = len(json.dumps(data, separators=(",", ":")))
+        if size > self.max_bytes:
+            return
+
+        key = self.make_key(repo_url, commit_sha)
+        entry = self.db.get(AnalysisCacheEntry, key)
+        if entry is None:
+            entry = AnalysisCacheEntry(
+                cache_key=key,
+                repo_url=self.normalize_url(repo_url),
+                commit_sha=commit_sha,
+            )
+            self.db.add(entry)
+
+        entry.data = data
+        entry.size_bytes = size
+        entry.last_accessed_at = datetime.utcnow()
+        self.db.commit()
+        _count("stores")
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the cache fits its budget."""
+        total = self.db.query(func.coalesce(func.sum(AnalysisCacheEntry.size_bytes), 0)).scalar()
+        if total <= self.max_bytes:
+            return
+
+        oldest = (
+            self.db.query(AnalysisCacheEntry.cache_key, AnalysisCacheEntry.size_bytes)
+            .order_by(AnalysisCacheEntry.last_accessed_at)
+            .all()
+        )
+        evicted = []
+        for key, size in oldest:
+            if total <= self.max_bytes:
+                break
+            evicted.append(key)
+            total -= size
+
+        if evicted:
+            self.db.query(AnalysisCacheEntry).filter(
+                AnalysisCacheEntry.cache_key.in_(evicted)
+            ).delete(synchronize_session=False)
+            self.db.commit()
+            _count("evictions", len(evicted))
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for this process plus the cache's current footprint."""
+        entries, size = self.db.query(
+            func.count(AnalysisCacheEntry.cache_key),
+            func.coalesce(func.sum(AnalysisCacheEntry.size_bytes), 0),
+        ).one()
+
+        with _stats_lock:
+            counters = dict(_stats)
+        lookups = counters["hits"] + counters["misses"]
+
+        return {
+            **counters,
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,212 @@
+import os
+import hashlib
+import tarfile
+import zipfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Optional
+from app.core.exceptions import BadRequestException, PayloadTooLargeException
+from app.services.archive_fs import safe_member_path
+from app.services.blob_store import BlobStore
+from app.services.content_hash import blob_hasher
+from app.services.file_walker import FileWalker
+
+
+class ArchiveExtractor:
+    """Extracts zip and tar uploads, writing only the members analysis will use.
+
+    Members are listed first and filtered like a directory walk (skip_dirs and
+    per-directory ignore files, read straight from the archive), so
+    node_modules, .git and ignored build output never touch the disk. Declared
+    sizes and entry counts are checked against the limits before anything is
+    written. Unsafe members (absolute or escaping paths, links, devices) are
+    dropped. Zip members are extracted in parallel.
+
+    With a BlobStore, each member is hashed (SHA-256, plus its git blob SHA-1)
+    as it is written and swapped for a hardlink when the store already holds
+    its contents.
+    """
+
+    COPY_CHUNK = 1024 * 1024
+    # Small archives are exempt from the ratio check (short text compresses well)
+    RATIO_MIN_BYTES = 1024 * 1024
+    # Larger ignore files are disregarded rather than read into memory
+    MAX_IGNORE_FILE_BYTES = 1024 * 1024
+
+    def __init__(
+        self,
+        skip_dirs: set[str],
+        ignore_files: tuple[str, ...],
+        max_bytes: int,
+        max_entries: int,
+        max_ratio: int,
+        max_workers: int = 1,
+        store: Optional[BlobStore] = None,
+    ):
+        self.walker = FileWalker(skip_dirs, ignore_files=ignore_files)
+        self.store = store
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_ratio = max_ratio
+        self.max_workers = max(1, max_workers)
+
+    def extract(self, archive_path: str, destination: str) -> dict[str, Any]:
+        """Extract an archive (format detected from its contents) into destination.
+
+        Returns:
+            dict: {"files", "bytes", "skipped"} - members written, their total size,
+                and members left out (filtered, unsafe or not regular files). With a
+                store, also "deduplicated" (members linked to stored blobs) and
+                "blobs" (path -> {"sha256", "git_sha1"})
+
+        Raises:
+            BadRequestException: Not a zip or tar archive
+            PayloadTooLargeException: An entry, size or compression-ratio limit is exceeded
+        """
+        if zipfile.is_zipfile(archive_path):
+            return self._extract_zip(archive_path, destination)
+        if tarfile.is_tarfile(archive_path):
+            return self._extract_tar(archive_path, destination)
+        raise BadRequestException("Unsupported or corrupt archive")
+
+    def _select(
+        self,
+        archive_path: str,
+        members: dict[str, Any],
+        sizes: dict[str, int],
+        total_entries: int,
+        read_text: Callable[[str], Optional[str]],
+    ) -> list[str]:
+        """Apply limits and walk filtering to the listed members; returns the paths to write."""
+        if total_entries > self.max_entries:
+            raise PayloadTooLargeException(f"Archive has too many entries (limit {self.max_entries})")
+
+        kept, _, _ = self.walker.walk_paths(list(members), read_text)
+
+        total = sum(sizes[path] for path in kept)
+        if total > self.max_bytes:
+            raise PayloadTooLargeException(
+                f"Archive expands beyond the {self.max_bytes // (1024 * 1024)}MB limit"
+            )
+        archive_size = os.path.getsize(archive_path)
+        if total > self.RATIO_MIN_BYTES and total > self.max_ratio * max(archive_size, 1):
+            raise PayloadTooLargeException("Archive compression ratio is too high")
+        return kept
+
+    def _extract_zip(self, archive_path: str, destination: str) -> dict[str, int]:
+        with zipfile.ZipFile(archive_path) as zf:
+            infos = zf.infolist()
+            members = {}
+            for info in infos:
+                is_link = (info.external_attr >> 16) & 0o170000 == 0o120000
+                path = safe_member_path(info.filename)
+                if path and not info.is_dir() and not is_link:
+                    members[path] = info
+
+            def read_text(path: str) -> Optional[str]:
+                if path not in members or members[path].file_size > self.MAX_IGNORE_FILE_BYTES:
+                    return None
+                return zf.read(members[path]).decode('utf-8', errors='ignore')
+
+            kept = self._select(
+                archive_path, members, {p: i.file_size for p, i in members.items()}, len(infos), read_text
+            )
+
+        # Each thread opens its own ZipFile so decompression doesn't serialize on one file handle
+        local = threading.local()
+        handles = []
+        handles_lock = threading.Lock()
+
+        def write(path: str) -> tuple[Optional[str], bool]:
+            if not hasattr(local, 'zf'):
+                local.zf = zipfile.ZipFile(archive_path)
+                with handles_lock:
+                    handles.append(local.zf)
+            with local.zf.open(members[path]) as src:
+                return self._write_member(src, destination, path, members[path].file_size)
+
+        try:
+            if self.max_workers == 1 or len(kept) < 2:
+                written = [write(path) for path in kept]
+            else:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    written = list(pool.map(write, kept))
+        finally:
+            for handle in handles:
+                handle.close()
+
+        files = sum(1 for info in infos if not info.is_dir())
+        stats = {
+            "files": len(kept),
+            "bytes": sum(members[path].file_size for path in kept),
+            "skipped": files - len(kept),
+        }
+        return self._with_blobs(stats, kept, written)
+
+    def _extract_tar(self, archive_path: str, destination: str) -> dict[str, int]:
+        with tarfile.open(archive_path, 'r:*') as tf:
+            infos = tf.getmembers()
+            members = {}
+            for info in infos:
+                path = safe_member_path(info.name)
+                # Regular files only: links and devices are never extracted
+                if path and info.isreg():
+                    members[path] = info
+
+            def read_text(path: str) -> Optional[str]:
+                if path not in members or members[path].size > self.MAX_IGNORE_FILE_BYTES:
+                    return None
+                return tf.extractfile(members[path]).read().decode('utf-8', errors='ignore')
+
+            kept = self._select(
+                archive_path, members, {p: i.size for p, i in members.items()}, len(infos), read_text
+            )
+
+            # Compressed tars are a single stream: write in archive order to avoid rewinds
+            kept.sort(key=lambda p: members[p].offset_data)
+            written = []
+            for path in kept:
+                with tf.extractfile(members[path]) as src:
+                    written.append(self._write_member(src, destination, path, members[path].size))
+
+        files = sum(1 for info in infos if not info.isdir())
+        stats = {
+            "files": len(kept),
+            "bytes": sum(members[path].size for path in kept),
+            "skipped": files - len(kept),
+        }
+        return self._with_blobs(stats, kept, written)
+
+    def _write_member(
+        self, src: BinaryIO, destination: str, path: str, size: int
+    ) -> tuple[Optional[dict[str, str]], bool]:
+        """Copy one member to destination/path; with a store, hash it and hand it over.
+
+        The store is keyed by SHA-256; the git blob SHA-1 is only recorded.
+
+        Returns:
+            tuple: (hashes or None without a store, whether it was deduplicated)
+        """
+        target = os.path.join(destination, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        hashers = (hashlib.sha256(), blob_hasher(size)) if self.store is not None else ()
+        with open(target, 'wb') as dst:
+            while True:
+                chunk = src.read(self.COPY_CHUNK)
+                if not chunk:
+                    break
+                for hasher in hashers:
+                    hasher.update(chunk)
+                dst.write(chunk)
+        if not hashers:
+            return None, False
+        hashes = {"sha256": hashers[0].hexdigest(), "git_sha1": hashers[1].hexdigest()}
+        return hashes, self.store.adopt(target, hashes["sha256"])
+
+    def _with_blobs(
+        self, stats: dict[str, Any], kept: list[str], written: list[tuple[Optional[dict[str, str]], bool]]
+    ) -> dict[str, Any]:
+        if self.store is not None:
+            stats["deduplicated"] = sum(1 for _, deduplicated in written if deduplicated)
+            stats["blobs"] = {path: hashes for path, (hashes, _) in zip(kept, written)}
+        return stats
@@ -0,0 +1,218 @@
+import io
+import os
+import posixpath
+import tarfile
+import zipfile
+from datetime import datetime
+from typing import BinaryIO, Optional
+from app.services.path_index import IndexFileCache, read_index_file, write_index_file
+
+
+def safe_member_path(name: str) -> Optional[str]:
+    """Normalized relative member path, or None if it would escape the archive root."""
+    path = posixpath.normpath(name.replace('\\', '/'))
+    if path.startswith(('/', '../')) or path in ('.', '..') or ':' in path.split('/', 1)[0]:
+        return None
+    return path
+
+
+class _MemberReader(io.RawIOBase):
+    """A seekable window onto one tar member's bytes, read with its own file handle."""
+
+    def __init__(self, archive_path: str, offset: int, size: int):
+        self._file = open(archive_path, 'rb')
+        self._offset = offset
+        self._size = size
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        remaining = self._size - self._pos
+        if remaining <= 0:
+            return 0
+        view = memoryview(buffer)[:remaining]
+        self._file.seek(self._offset + self._pos)
+        read = self._file.readinto(view)
+        self._pos += read
+        return read
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._size}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+class ArchiveFS:
+    """Read-only file access inside a zip or uncompressed tar, without extracting it.
+
+    Zips are indexed from their central directory. Tars are indexed in one pass
+    over the member headers, recording each file's data offset; the index is
+    saved next to the archive so later opens (and other processes) skip the
+    pass. Compressed tars have no random access and are not supported.
+    Only regular files with safe relative paths are visible.
+    """
+
+    INDEX_SUFFIX = ".index.json"
+    INDEX_VERSION = 1
+
+    def __init__(self, archive_path: str):
+        self.archive_path = archive_path
+        self.files: dict[str, tuple[int, Optional[float]]] = {}  # path -> (size, mtime)
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._zip_pid = os.getpid()
+        self._zip_infos: dict[str, zipfile.ZipInfo] = {}
+        self._offsets: dict[str, int] = {}  # tar: path -> data offset
+
+        if zipfile.is_zipfile(archive_path):
+            self._index_zip()
+        elif self.is_plain_tar(archive_path):
+            self._index_tar()
+        else:
+            raise ValueError(f"Not a zip or uncompressed tar archive: {archive_path}")
+
+    @classmethod
+    def load(cls, archive_path: str) -> Optional["ArchiveFS"]:
+        """Shared instance for an archive, or None if it can't be read in place."""
+        return _archive_cache.get(archive_path, cls)
+
+    @staticmethod
+    def forget(archive_path: str) -> None:
+        """Drop an archive's shared instance and close its handle, e.g. before deleting it."""
+        _archive_cache.discard(archive_path)
+
+    @classmethod
+    def supports(cls, archive_path: str) -> bool:
+        """Whether an archive can be read in place (zip or uncompressed tar)."""
+        return zipfile.is_zipfile(archive_path) or cls.is_plain_tar(archive_path)
+
+    @staticmethod
+    def is_plain_tar(archive_path: str) -> bool:
+        try:
+            with tarfile.open(archive_path, 'r:'):
+                return True
+        except (tarfile.TarError, OSError):
+            return False
+
+    @property
+    def entry_count(self) -> int:
+        return len(self.files)
+
+    def open(self, file_path: str) -> BinaryIO:
+        """Open a member for binary reading.
+
+        Raises:
+            FileNotFoundError: No regular file at file_path
+        """
+        if file_path not in self.files:
+            raise FileNotFoundError(f"{file_path} not in {self.archive_path}")
+        if self._zip is not None:
+            if self._zip_pid != os.getpid() or self._zip.fp is None:
+                # Forked (e.g. into a process pool): the inherited descriptor shares
+                # its file offset with the parent, so reopen before reading. Also
+                # reopen if the cache closed this instance while it was still in use.
+                self._zip = zipfile.ZipFile(self.archive_path)
+                self._zip_pid = os.getpid()
+            # ZipFile reads go through its shared, locked file handle, so members
+            # can be opened from several threads at once
+            return self._zip.open(self._zip_infos[file_path])
+        return io.BufferedReader(_MemberReader(self.archive_path, self._offsets[file_path], self.files[file_path][0]))
+
+    def read(self, file_path: str, max_bytes: Optional[int] = None) -> bytes:
+        with self.open(file_path) as f:
+            return f.read() if max_bytes is None else f.read(max_bytes)
+
+    def close(self) -> None:
+        """Close the zip handle; members already opened stay readable."""
+        if self._zip is not None and self._zip_pid == os.getpid():
+            self._zip.close()
+
+    def _index_zip(self) -> None:
+        try:
+            self._zip = zipfile.ZipFile(self.archive_path)
+        except zipfile.BadZipFile as e:
+            raise ValueError(str(e))
+        for info in self._zip.infolist():
+            is_link = (info.external_attr >> 16) & 0o170000 == 0o120000
+            path = safe_member_path(info.filename)
+            if path is None or info.is_dir() or is_link:
+                continue
+            self._zip_infos[path] = info
+            try:
+                mtime = datetime(*info.date_time).timestamp()
+            except ValueError:
+                mtime = None
+            self.files[path] = (info.file_size, mtime)
+
+    def _index_tar(self) -> None:
+        index_path = self.archive_path + self.INDEX_SUFFIX
+        try:
+            if os.path.getmtime(index_path) >= os.path.getmtime(self.archive_path):
+                data = read_index_file(index_path, self.INDEX_VERSION)
+                if data is not None:
+                    for path, offset, size, mtime in data["members"]:
+                        self._offsets[path] = offset
+                        self.files[path] = (size, mtime)
+                    return
+        except (OSError, ValueError, KeyError):
+            pass
+
+        members = []
+        try:
+            with tarfile.open(self.archive_path, 'r:') as tf:
+                for info in tf:
+                    path = safe_member_path(info.name)
+                    # Regular files only: links and devices are never readable
+                    if path is None or not info.isreg():
+                        continue
+                    self._offsets[path] = info.offset_data
+                    self.files[path] = (info.size, info.mtime)
+                    members.append((path, info.offset_data, info.size, info.mtime))
+        except tarfile.TarError as e:
+            raise ValueError(str(e))
+
+        try:
+            write_index_file(index_path, {"version": self.INDEX_VERSION, "members": members})
+        except OSError:
+            pass
+
+
+def open_code_file(code_path: str, file_path: str) -> BinaryIO:
+    """Open a project file for binary reading; code_path is a directory or an archive.
+
+    Raises:
+        OSError: The file doesn't exist or the archive can't be read
+    """
+    if os.path.isdir(code_path):
+        return open(os.path.join(code_path, file_path), 'rb')
+    archive = ArchiveFS.load(code_path)
+    if archive is None:
+        raise FileNotFoundError(f"Cannot read {code_path}")
+    return archive.open(file_path)
+
+
+def upload_code_path(storage_path: str) -> str:
+    """Code location of an uploaded project: its extracted tree, else its kept archive."""
+    extracted = os.path.join(storage_path, "code")
+    if os.path.isdir(extracted):
+        return extracted
+    for name in sorted(os.listdir(storage_path)) if os.path.isdir(storage_path) else []:
+        if name.startswith("archive.") and not name.endswith(ArchiveFS.INDEX_SUFFIX):
+            return os.path.join(storage_path, name)
+    return extracted
+
+
+# Open archives keep their member index (and zip handle) loaded between requests;
+# handles are closed as archives leave the cache
+_archive_cache = IndexFileCache(max_entries=8, on_evict=ArchiveFS.close)
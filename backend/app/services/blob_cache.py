@@ -0,0 +1,183 @@
+import json
+import threading
+from datetime import datetime
+from typing import Any, Iterable
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import BlobCacheEntry
+
+# Process-wide hit/miss counters (per-entry hit counts are persisted on the rows)
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+class BlobCache:
+    """Per-file analysis results keyed by content hash, shared by all projects and users.
+
+    Forks, branches and re-imports of a codebase mostly contain byte-identical
+    files, so results computed for one blob (its class and line counts, its
+    symbols) are reused wherever that blob appears again. Each result is stored
+    under kind:content hash:variant, where the variant captures any input beyond
+    the bytes themselves (language, SLOC mode, extractor version). Entries are
+    evicted least-recently-used once the total stored size exceeds
+    settings.blob_cache_max_bytes.
+
+    The cache reads and writes in its own sessions, so it never commits or
+    rolls back the transaction of the analysis that uses it.
+    """
+
+    ANALYSIS = "analysis"
+    SYMBOLS = "symbols"
+
+    # Keys per IN (...) lookup, below SQLite's bound-parameter limit
+    BATCH_SIZE = 500
+
+    def __init__(self):
+        self.max_bytes = settings.blob_cache_max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(kind: str, content_hash: str, variant: str) -> str:
+        return f"{kind}:{content_hash}:{variant}"
+
+    def get_many(self, kind: str, items: Iterable[tuple[str, str]]) -> dict[tuple[str, str], Any]:
+        """Cached results for (content hash, variant) pairs; misses are left out."""
+        if not self.enabled:
+            return {}
+        keys = {self.make_key(kind, content_hash, variant): (content_hash, variant) for content_hash, variant in items}
+        pending = list(keys)
+        found = {}
+        now = datetime.utcnow()
+
+        db = SessionLocal()
+        try:
+            for i in range(0, len(pending), self.BATCH_SIZE):
+                batch = pending[i:i + self.BATCH_SIZE]
+                hits = []
+                for key, data in db.query(BlobCacheEntry.cache_key, BlobCacheEntry.data).filter(
+                    BlobCacheEntry.cache_key.in_(batch)
+                ):
+                    found[keys[key]] = data
+                    hits.append(key)
+                if hits:
+                    db.query(BlobCacheEntry).filter(BlobCacheEntry.cache_key.in_(hits)).update(
+                        {
+                            BlobCacheEntry.hit_count: func.coalesce(BlobCacheEntry.hit_count, 0) + 1,
+                            BlobCacheEntry.last_accessed_at: now,
+                        },
+                        synchronize_session=False,
+                    )
+            db.commit()
+        finally:
+            db.close()
+
+        _count("hits", len(found))
+        _count("misses", len(keys) - len(found))
+        return found
+
+    def put_many(self, kind: str, results: dict[tuple[str, str], Any]) -> None:
+        """Store results for (content hash, variant) pairs, then evict down to the size budget."""
+        if not self.enabled or not results:
+            return
+
+        rows = {}
+        for (content_hash, variant), data in results.items():
+            rows[self.make_key(kind, content_hash, variant)] = {
+                "kind": kind,
+                "content_hash": content_hash,
+                "data": data,
+                "size_bytes": len(json.dumps(data, separators=(",", ":"))),
+            }
+
+        db = SessionLocal()
+        try:
+            # Another project may have stored some of these since they were looked up
+            keys = list(rows)
+            for i in range(0, len(keys), self.BATCH_SIZE):
+                for (key,) in db.query(BlobCacheEntry.cache_key).filter(
+                    BlobCacheEntry.cache_key.in_(keys[i:i + self.BATCH_SIZE])
+                ):
+                    rows.pop(key)
+            if not rows:
+                return
+
+            now = datetime.utcnow()
+            mappings = [
+                dict(row, cache_key=key, hit_count=0, created_at=now, last_accessed_at=now)
+                for key, row in rows.items()
+            ]
+            try:
+                for i in range(0, len(mappings), self.BATCH_SIZE):
+                    db.bulk_insert_mappings(BlobCacheEntry, mappings[i:i + self.BATCH_SIZE])
+                db.commit()
+            except IntegrityError:
+                # Lost a race with a concurrent analysis storing the same blobs
+                db.rollback()
+                return
+            _count("stores", len(mappings))
+
+            self._evict(db)
+        finally:
+            db.close()
+
+    def _evict(self, db: Session) -> None:
+        """Drop least-recently-used entries until the cache fits its budget."""
+        total = db.query(func.coalesce(func.sum(BlobCacheEntry.size_bytes), 0)).scalar()
+        if total <= self.max_bytes:
+            return
+
+        oldest = (
+            db.query(BlobCacheEntry.cache_key, BlobCacheEntry.size_bytes)
+            .order_by(BlobCacheEntry.last_accessed_at)
+            .all()
+        )
+        evicted = []
+        for key, size in oldest:
+            if total <= self.max_bytes:
+                break
+            evicted.append(key)
+            total -= size
+
+        for i in range(0, len(evicted), self.BATCH_SIZE):
+            db.query(BlobCacheEntry).filter(
+                BlobCacheEntry.cache_key.in_(evicted[i:i + self.BATCH_SIZE])
+            ).delete(synchronize_session=False)
+        if evicted:
+            db.commit()
+            _count("evictions", len(evicted))
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for this process plus the cache's current footprint."""
+        db = SessionLocal()
+        try:
+            by_kind = {
+                kind: count for kind, count in
+                db.query(BlobCacheEntry.kind, func.count(BlobCacheEntry.cache_key)).group_by(BlobCacheEntry.kind)
+            }
+            size = db.query(func.coalesce(func.sum(BlobCacheEntry.size_bytes), 0)).scalar()
+        finally:
+            db.close()
+
+        with _stats_lock:
+            counters = dict(_stats)
+        lookups = counters["hits"] + counters["misses"]
+
+        return {
+            **counters,
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "entries": sum(by_kind.values()),
+            "entries_by_kind": by_kind,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
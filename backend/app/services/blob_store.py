@@ -0,0 +1,117 @@
+import os
+import json
+import shutil
+from typing import Iterable, Optional
+from app.config import settings
+
+
+class BlobStore:
+    """Content-addressed storage for uploaded code, shared by every project.
+
+    Each distinct file is stored once under blobs/<sha256[:2]>/<sha256[2:]> in
+    upload_dir, and project trees hold hardlinks to it, so successive uploads of
+    the same product only add the files that changed. A project's
+    storage_path keeps a manifest (path -> {"sha256", and "git_sha1" where
+    known}) of the blobs it links; the git SHA-1 is metadata, never a key.
+
+    Hardlink counts are the reference counts: a blob whose only remaining link is
+    the store's own is garbage. Blobs are made read-only, since every project
+    linking them sees the same inode.
+    """
+
+    MANIFEST_FILE = "blobs.json"
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(settings.upload_dir, "blobs")
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:])
+
+    def adopt(self, file_path: str, sha256: str) -> bool:
+        """Put a freshly written file under the store (by its SHA-256), or swap it for the stored copy.
+
+        Returns:
+            bool: True if the contents were already stored (file_path now links to them)
+        """
+        blob_path = self.blob_path(sha256)
+        if os.path.exists(blob_path):
+            tmp_path = f"{file_path}.link"
+            try:
+                os.link(blob_path, tmp_path)
+                os.replace(tmp_path, file_path)
+                return True
+            except FileNotFoundError:
+                pass  # Collected since the existence check - store this copy instead
+            except OSError:
+                return False  # No hardlinks here; keep the private copy
+
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.chmod(file_path, 0o444)
+        try:
+            os.link(file_path, blob_path)
+        except FileExistsError:
+            # Stored concurrently by another upload; keeping a private copy is harmless
+            pass
+        except OSError:
+            pass
+        return False
+
+    def write_manifest(self, storage_path: str, blobs: dict[str, dict[str, str]]) -> None:
+        with open(os.path.join(storage_path, self.MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(blobs, f, separators=(",", ":"))
+
+    def read_manifest(self, storage_path: str) -> dict[str, dict[str, str]]:
+        try:
+            with open(os.path.join(storage_path, self.MANIFEST_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def release(self, storage_path: str) -> int:
+        """Delete a project's storage, then collect the blobs only it referenced.
+
+        Returns:
+            int: Number of blobs freed
+        """
+        hashes = {entry["sha256"] for entry in self.read_manifest(storage_path).values()}
+        shutil.rmtree(storage_path, ignore_errors=True)
+        return self.collect(hashes)
+
+    def collect(self, hashes: Optional[Iterable[str]] = None) -> int:
+        """Remove blobs no project links to any more (all blobs when hashes is None).
+
+        Returns:
+            int: Number of blobs freed
+        """
+        if hashes is None:
+            paths = [
+                os.path.join(root, name)
+                for root, _, names in os.walk(self.root)
+                for name in names
+            ]
+        else:
+            paths = [self.blob_path(blob_hash) for blob_hash in hashes]
+
+        freed = 0
+        for path in paths:
+            try:
+                if os.stat(path).st_nlink == 1:
+                    os.remove(path)
+                    freed += 1
+            except OSError:
+                continue
+        return freed
+
+    def stats(self) -> dict[str, int]:
+        """Stored blob count and size, and how many project links share them."""
+        blobs = size = links = 0
+        for root, _, names in os.walk(self.root):
+            for name in names:
+                try:
+                    stat = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                blobs += 1
+                size += stat.st_size
+                links += stat.st_nlink - 1
+        return {"blobs": blobs, "size_bytes": size, "links": links}
@@ -1,5 +1,5 @@
 """Claude service - now using unified AI service with Gemini priority."""
-from typing import Any
+from typing import Any, AsyncIterator
 from app.services.ai_service import get_ai_service
 
 
@@ -15,39 +15,59 @@ class ClaudeService:
     def __init__(self):
         self.ai_service = get_ai_service()
 
-    def generate_content(
+    async def generate_content(
         self,
         prompt: str,
         system_prompt: str = None,
         max_tokens: int = None,
     ) -> str:
         """Generate content using available AI provider."""
-        return self.ai_service.generate_content(prompt, system_prompt or "")
+        return await self.ai_service.generate_content(prompt, system_prompt or "")
 
-    def suggest_sections(
+    async def suggest_sections(
         self,
         document_type: str,
         code_analysis: dict[str, Any],
         available_sections: list[dict],
     ) -> list[dict]:
         """Use AI to suggest relevant sections for a document."""
-        return self.ai_service.suggest_sections(
+        return await self.ai_service.suggest_sections(
             document_type=document_type,
             code_analysis=code_analysis,
             available_sections=available_sections,
         )
 
-    def generate_section_content(
+    async def generate_section_content(
         self,
         section_title: str,
         section_description: str,
         code_context: str,
         document_type: str,
+        fresh: bool = False,
     ) -> str:
         """Generate content for a specific documentation section."""
-        return self.ai_service.generate_section_content(
+        return await self.ai_service.generate_section_content(
             section_title=section_title,
             section_description=section_description,
             code_context=code_context,
             document_type=document_type,
+            fresh=fresh,
         )
+
+    async def stream_section_content(
+        self,
+        section_title: str,
+        section_description: str,
+        code_context: str,
+        document_type: str,
+        fresh: bool = False,
+    ) -> AsyncIterator[str]:
+        """Stream content for a specific documentation section as it is generated."""
+        async for text in self.ai_service.stream_section_content(
+            section_title=section_title,
+            section_description=section_description,
+            code_context=code_context,
+            document_type=document_type,
+            fresh=fresh,
+        ):
+            yield text
@@ -1,8 +1,21 @@
 import os
 import re
-from typing import Any
+from typing import Any, Optional
 from pathlib import Path
 from collections import defaultdict
+from itertools import islice
+from app.config import settings
+from app.services.archive_fs import ArchiveFS, open_code_file
+from app.services.file_walker import FileWalker, resolve_worker_count
+from app.services.content_hash import blob_hasher
+from app.services.blob_cache import BlobCache
+from app.services.file_classifier import FileClassifier
+from app.services.git_tree import GitTree
+from app.services.line_counter import LineCounter, merge_sloc
+from app.services.content_index import ContentIndex, read_chunk
+from app.services.import_graph import ImportGraph
+from app.services.path_index import PathIndex
+from app.services.symbol_index import SymbolIndex
 
 
 class CodeAnalyzer:
@@ -56,98 +69,415 @@ class CodeAnalyzer:
         'LICENSE', 'LICENSE.md', 'LICENSE.txt',
     }
 
-    def __init__(self):
+    # Map sections to file patterns
+    SECTION_PATTERNS = {
+        'installation': ['README', 'INSTALL', 'setup.py', 'package.json', 'requirements.txt'],
+        'api': ['api', 'routes', 'endpoints', 'controllers', 'handlers'],
+        'configuration': ['config', 'settings', '.env', 'conf'],
+        'architecture': ['main', 'app', 'index', 'core', 'src'],
+        'database': ['models', 'schema', 'migrations', 'database', 'db'],
+        'testing': ['test', 'spec', '__tests__'],
+        'deployment': ['Dockerfile', 'docker-compose', 'kubernetes', 'k8s', 'deploy'],
+    }
+
+    # Used when nothing matches a section's patterns
+    FALLBACK_PATTERNS = ['main', 'app', 'index', 'README']
+
+    # Title words too generic to be useful as path patterns
+    TITLE_STOPWORDS = {
+        'and', 'the', 'for', 'with', 'of', 'overview', 'considerations', 'details',
+        'guide', 'section', 'notes', 'information', 'introduction', 'summary',
+    }
+
+    # Context retrieval: reciprocal rank fusion constant and chunks quoted per file
+    RRF_K = 60
+    MAX_CHUNKS_PER_FILE = 2
+    CENTRALITY_BOOST = 1.0  # Most central file's rank score is at most doubled
+
+    # Most bytes of a single file quoted into a prompt (guards against one-line bundles)
+    MAX_CONTENT_BYTES = 64 * 1024
+
+    # Bump when classification or line counting changes, so cached blob results are recomputed
+    BLOB_CACHE_VERSION = 3
+
+    # Bump when anything else in a tree's analysis result changes (walk filtering,
+    # detection of languages, frameworks and key files), so cached analyses are redone
+    ANALYSIS_VERSION = 1
+
+    # Ignore files honoured in every directory of the walk; later names take precedence.
+    # .dockerignore is not read: its rules apply to the build context root only and are
+    # often allowlists ("*" then "!app"), which would drop everything as gitignore rules.
+    IGNORE_FILES = ('.gitignore', '.docugenignore')
+
+    # Basenames treated as application entry points
+    ENTRY_POINT_FILES = {'main.py', 'app.py', 'index.js', 'index.ts', 'main.go', 'main.rs', 'Main.java'}
+
+    def __init__(self, max_workers: Optional[int] = None, sloc: Optional[bool] = None):
         # Create extension to language mapping
         self.ext_to_language = {}
         for lang, exts in self.LANGUAGE_EXTENSIONS.items():
             for ext in exts:
                 self.ext_to_language[ext] = lang
 
+        # Worker count for the directory walk; 0/None means automatic
+        if max_workers is None:
+            max_workers = settings.analyzer_workers
+        self.walker = FileWalker(
+            self.SKIP_DIRS,
+            resolve_worker_count(max_workers),
+            ignore_files=self.IGNORE_FILES if settings.analyzer_ignore_files else (),
+        )
+
+        # Blank/comment/code breakdown is optional since it costs a per-line pass
+        if sloc is None:
+            sloc = settings.analyzer_sloc
+        self.line_counter = LineCounter(sloc=sloc)
+
+        self.classifier = FileClassifier(settings.analyzer_max_file_bytes)
+
     def analyze(self, path: str) -> dict[str, Any]:
         """Analyze a codebase and return structured information."""
         path = Path(path)
         if not path.exists():
             raise ValueError(f"Path does not exist: {path}")
 
-        result = {
-            "file_tree": [],
-            "languages": defaultdict(int),
-            "config_files": [],
-            "entry_points": [],
-            "structure": {
-                "total_files": 0,
-                "total_dirs": 0,
-                "total_lines": 0,
-            },
-            "key_files": [],
-            "dependencies": {},
+        base = str(path)
+        if path.is_file():
+            records, total_dirs, ignored = self.scan_archive(base)
+            return self.build_result(path, self.read_files(base, records), total_dirs, ignored_paths=ignored)
+
+        # Walk the tree in parallel; per-file work runs on the walker's pool
+        records, total_dirs, ignored = self.walker.walk(
+            base,
+            lambda entry, rel_path: self._read_file(base, self._stat_file(entry, rel_path)),
+        )
+
+        return self.build_result(path, records, total_dirs, ignored_paths=ignored)
+
+    def scan(self, path: str) -> tuple[list[dict], int, int]:
+        """Walk a codebase collecting only stat information (no file reads).
+
+        Returns:
+            tuple: (records, total_dirs, ignored) - per-file path/name/language/size/mtime
+                records, directories visited and paths pruned by ignore files
+        """
+        if os.path.isfile(path):
+            return self.scan_archive(str(path))
+        return self.walker.walk(str(path), self._stat_file)
+
+    def scan_archive(self, path: str) -> tuple[list[dict], int, int]:
+        """List an archive's members from its index instead of walking a tree.
+
+        Sizes and mtimes come from the member headers; skip dirs and ignore files
+        (read from the archive) prune the listing as they would a walk.
+
+        Returns:
+            tuple: (records, total_dirs, ignored), as scan() returns
+        """
+        archive = ArchiveFS.load(path)
+        if archive is None:
+            raise ValueError(f"Cannot read archive: {path}")
+
+        def read_text(file_path: str) -> Optional[str]:
+            if file_path not in archive.files or archive.files[file_path][0] > self.MAX_CONTENT_BYTES:
+                return None
+            return archive.read(file_path).decode('utf-8', errors='ignore')
+
+        paths, total_dirs, ignored = self.walker.walk_paths(list(archive.files), read_text)
+
+        records = []
+        for rel_path in paths:
+            size, mtime = archive.files[rel_path]
+            name = os.path.basename(rel_path)
+            records.append({
+                "path": rel_path,
+                "name": name,
+                "language": self.ext_to_language.get(os.path.splitext(name)[1].lower()),
+                "size": size,
+                "mtime": mtime,
+            })
+        return records, total_dirs, ignored
+
+    def scan_git(self, path: str) -> tuple[list[dict], int, int]:
+        """List a git checkout's HEAD tree from the object database instead of walking it.
+
+        Sizes come from the object headers and the blob SHA becomes the record's
+        content_hash, so nothing in the working tree is stat'ed. Records have no mtime.
+
+        Returns:
+            tuple: (records, total_dirs, ignored), as scan() returns
+        """
+        tree = GitTree(str(path))
+        blobs = {file_path: (sha, size) for file_path, sha, size in tree.list_files()}
+
+        # Fetch every ignore file in one batch before pruning the listing
+        ignore_paths = [p for p in blobs if os.path.basename(p) in self.walker.ignore_files]
+        ignore_texts = {
+            file_path: data.decode('utf-8', errors='ignore')
+            for file_path, (_, data) in zip(ignore_paths, tree.read_blobs(blobs[p][0] for p in ignore_paths))
+            if data is not None
         }
+        paths, total_dirs, ignored = self.walker.walk_paths(list(blobs), ignore_texts.get)
+
+        records = []
+        for rel_path in paths:
+            sha, size = blobs[rel_path]
+            name = os.path.basename(rel_path)
+            records.append({
+                "path": rel_path,
+                "name": name,
+                "language": self.ext_to_language.get(os.path.splitext(name)[1].lower()),
+                "size": size,
+                "mtime": None,
+                "content_hash": sha,
+            })
+        return records, total_dirs, ignored
+
+    def read_git_files(self, path: str, records: list[dict], cache: Optional[BlobCache] = None) -> list[dict]:
+        """Classify and measure scan_git() records, streaming the blobs that need reading.
+
+        With a cache, blobs already measured in any project are not read at all.
+        """
+        results = []
+        to_read = []
+        for record in records:
+            record = dict(record, lines=0)
+            file_class = self.classifier.classify_path(record["path"], record["size"])
+            record["file_class"] = file_class or FileClassifier.NORMAL
+            if file_class is None and (record["language"] or record["name"] in self.CONFIG_FILES):
+                to_read.append(record)
+            results.append(record)
+
+        cached = {}
+        if cache is not None:
+            cached = cache.get_many(BlobCache.ANALYSIS, [self._blob_key(record) for record in to_read])
+            for record in to_read:
+                record.update(cached.get(self._blob_key(record), {}))
+            to_read = [record for record in to_read if self._blob_key(record) not in cached]
+
+        measured = {}
+        blobs = GitTree(str(path)).read_blobs(record["content_hash"] for record in to_read)
+        for record, (_, data) in zip(to_read, blobs):
+            if data is None:
+                continue
+            result = {"file_class": self.classifier.classify_head(record["path"], data[:FileClassifier.SNIFF_BYTES])}
+            if result["file_class"] not in FileClassifier.SKIP_READ and record["language"]:
+                counts = self.line_counter.count_bytes(data, record["language"])
+                result["lines"] = counts["lines"]
+                if self.line_counter.sloc:
+                    result["sloc"] = counts
+            record.update(result)
+            measured[self._blob_key(record)] = result
+
+        if cache is not None:
+            cache.put_many(BlobCache.ANALYSIS, measured)
+
+        return results
+
+    def _blob_key(self, record: dict[str, Any]) -> tuple[str, str]:
+        """(content hash, variant) under which a file's measurements are cached."""
+        mode = "sloc" if self.line_counter.sloc else "lines"
+        return record["content_hash"], f"{record['language'] or ''}:{mode}:{self.BLOB_CACHE_VERSION}"
+
+    def read_files(self, path: str, records: list[dict]) -> list[dict]:
+        """Read and measure the given stat records in parallel."""
+        base = str(path)
+        return self.walker.map(lambda record: self._read_file(base, record), records)
+
+    def _stat_file(self, entry: os.DirEntry, rel_path: str) -> dict[str, Any]:
+        """Collect stat-level facts for a single file (runs on a walker thread)."""
+        name = entry.name
+        ext = os.path.splitext(name)[1].lower()
+
+        try:
+            stat = entry.stat()
+            size, mtime = stat.st_size, stat.st_mtime
+        except OSError:
+            size, mtime = 0, None
+
+        return {
+            "path": rel_path,
+            "name": name,
+            "language": self.ext_to_language.get(ext),
+            "size": size,
+            "mtime": mtime,
+        }
+
+    def _read_file(self, base_path: str, record: dict[str, Any]) -> dict[str, Any]:
+        """Classify a file, then read its contents to count lines and hash it.
+
+        Only code files (for line counts) and config files (for dependency change
+        detection) are read, and only when their class isn't skipped (binary,
+        minified, lockfile, vendored, oversized). Everything else keeps lines=0
+        and no content hash.
+        """
+        record = dict(record, lines=0, content_hash=None)
+        language = record["language"]
+        if not language and record["name"] not in self.CONFIG_FILES:
+            # Not read anyway - classify from the path without sniffing contents
+            record["file_class"] = (
+                self.classifier.classify_path(record["path"], record["size"]) or FileClassifier.NORMAL
+            )
+            return record
+
+        record["file_class"] = self.classifier.classify(base_path, record["path"], record["size"])
+        if record["file_class"] in FileClassifier.SKIP_READ:
+            return record
+
+        try:
+            hasher = blob_hasher(record["size"])
+            with open_code_file(base_path, record["path"]) as f:
+                counts = self.line_counter.count_stream(f, language, record["size"], hasher=hasher)
+            record["content_hash"] = hasher.hexdigest()
+            if language:
+                record["lines"] = counts["lines"]
+                if self.line_counter.sloc:
+                    record["sloc"] = counts
+        except Exception:
+            pass
 
-        # Walk through the directory
-        for root, dirs, files in os.walk(path):
-            # Skip unwanted directories
-            dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
-
-            rel_root = os.path.relpath(root, path)
-            if rel_root == '.':
-                rel_root = ''
-
-            result["structure"]["total_dirs"] += 1
-
-            for file in files:
-                file_path = os.path.join(root, file)
-                rel_path = os.path.join(rel_root, file) if rel_root else file
-
-                result["file_tree"].append(rel_path)
-                result["structure"]["total_files"] += 1
-
-                # Get file extension
-                ext = os.path.splitext(file)[1].lower()
-
-                # Count by language
-                if ext in self.ext_to_language:
-                    lang = self.ext_to_language[ext]
-                    result["languages"][lang] += 1
-
-                    # Count lines for code files
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = len(f.readlines())
-                            result["structure"]["total_lines"] += lines
-                    except Exception:
-                        pass
-
-                # Check for config files
-                if file in self.CONFIG_FILES:
-                    result["config_files"].append(rel_path)
-                    result["key_files"].append({
-                        "path": rel_path,
-                        "type": "config",
-                        "name": file,
-                    })
-
-                # Check for entry points
-                if file in ['main.py', 'app.py', 'index.js', 'index.ts', 'main.go', 'main.rs', 'Main.java']:
-                    result["entry_points"].append(rel_path)
-                    result["key_files"].append({
-                        "path": rel_path,
-                        "type": "entry_point",
-                        "name": file,
-                    })
-
-        # Parse dependency files
-        result["dependencies"] = self._extract_dependencies(path, result["config_files"])
+        return record
+
+    def build_result(
+        self,
+        path: Path,
+        records: list[dict],
+        total_dirs: int,
+        with_file_tree: bool = True,
+        ignored_paths: int = 0,
+    ) -> dict[str, Any]:
+        """Aggregate per-file records into the analysis_data structure."""
+        return self.apply_changes(path, None, [], records, total_dirs, with_file_tree, ignored_paths)
+
+    def apply_changes(
+        self,
+        path: Path,
+        previous: Optional[dict[str, Any]],
+        removed: list[dict],
+        added: list[dict],
+        total_dirs: int,
+        with_file_tree: bool = True,
+        ignored_paths: int = 0,
+    ) -> dict[str, Any]:
+        """Update an analysis result by removing and adding per-file records.
+
+        A modified file is passed once in removed (its old record) and once in
+        added (its new record). With previous=None this builds a result from scratch.
+        with_file_tree=False leaves the full path list out of the result, for callers
+        that keep file entries elsewhere.
+        """
+        previous = previous or {}
+        prev_structure = previous.get("structure", {})
+
+        languages = defaultdict(int, previous.get("languages", {}))
+        structure = {
+            "total_files": prev_structure.get("total_files", 0),
+            "total_dirs": total_dirs,
+            "ignored_paths": ignored_paths,
+            "total_lines": prev_structure.get("total_lines", 0),
+            "skipped_files": dict(prev_structure.get("skipped_files", {})),
+            "skipped_bytes": prev_structure.get("skipped_bytes", 0),
+        }
+        skipped = structure["skipped_files"]
+        sloc = None
+        if self.line_counter.sloc:
+            sloc = defaultdict(dict, {lang: dict(c) for lang, c in prev_structure.get("sloc", {}).items()})
+
+        file_tree = previous.get("file_tree", [])
+        config_files = previous.get("config_files", [])
+        entry_points = previous.get("entry_points", [])
+        key_files = previous.get("key_files", [])
+
+        # Subtract removed records
+        if removed:
+            removed_paths = {record["path"] for record in removed}
+            for record in removed:
+                structure["total_files"] -= 1
+                if record.get("file_class") in FileClassifier.SKIP_READ:
+                    skipped[record["file_class"]] -= 1
+                    structure["skipped_bytes"] -= record.get("size") or 0
+                elif record["language"]:
+                    languages[record["language"]] -= 1
+                    structure["total_lines"] -= record["lines"]
+                    if sloc is not None and record.get("sloc"):
+                        merge_sloc(sloc[record["language"]], record["sloc"], sign=-1)
+
+            file_tree = [p for p in file_tree if p not in removed_paths]
+            config_files = [p for p in config_files if p not in removed_paths]
+            entry_points = [p for p in entry_points if p not in removed_paths]
+            key_files = [k for k in key_files if k["path"] not in removed_paths]
+        else:
+            file_tree, config_files = list(file_tree), list(config_files)
+            entry_points, key_files = list(entry_points), list(key_files)
+
+        # Add new records in path order so output is deterministic regardless of worker count
+        for record in sorted(added, key=lambda r: r["path"]):
+            rel_path = record["path"]
+            name = record["name"]
+
+            if with_file_tree:
+                file_tree.append(rel_path)
+            structure["total_files"] += 1
+
+            # Count by language; skipped files only count towards the skipped totals
+            if record.get("file_class") in FileClassifier.SKIP_READ:
+                skipped[record["file_class"]] = skipped.get(record["file_class"], 0) + 1
+                structure["skipped_bytes"] += record.get("size") or 0
+            elif record["language"]:
+                languages[record["language"]] += 1
+                structure["total_lines"] += record["lines"]
+                if sloc is not None and record.get("sloc"):
+                    merge_sloc(sloc[record["language"]], record["sloc"])
+
+            # Check for config files
+            if name in self.CONFIG_FILES:
+                config_files.append(rel_path)
+                key_files.append({
+                    "path": rel_path,
+                    "type": "config",
+                    "name": name,
+                })
+
+            # Check for entry points
+            if name in self.ENTRY_POINT_FILES:
+                entry_points.append(rel_path)
+                key_files.append({
+                    "path": rel_path,
+                    "type": "entry_point",
+                    "name": name,
+                })
+
+        # Sort files (nearly sorted already when applying deltas)
+        file_tree.sort()
+        config_files.sort()
+        entry_points.sort()
+        key_files.sort(key=lambda k: k["path"])
 
         # Convert defaultdict to regular dict for JSON serialization
-        result["languages"] = dict(result["languages"])
+        languages = {lang: count for lang, count in languages.items() if count > 0}
+        structure["skipped_files"] = {cls: count for cls, count in sorted(skipped.items()) if count > 0}
+        if sloc is not None:
+            structure["sloc"] = {lang: c for lang, c in sloc.items() if lang in languages}
 
-        # Sort files
-        result["file_tree"].sort()
-        result["config_files"].sort()
+        result = {
+            "languages": languages,
+            "config_files": config_files,
+            "entry_points": entry_points,
+            "structure": structure,
+            "key_files": key_files,
+            "dependencies": previous.get("dependencies", {}),
+        }
+        if with_file_tree:
+            result = {"file_tree": file_tree, **result}
+
+        # Parse dependency files, only re-reading them when a config file changed
+        changed_names = {record["name"] for record in removed + added}
+        if not previous or changed_names & self.CONFIG_FILES:
+            result["dependencies"] = self._extract_dependencies(path, config_files)
 
         # Detect primary language
-        if result["languages"]:
-            result["primary_language"] = max(result["languages"], key=result["languages"].get)
+        if languages:
+            result["primary_language"] = max(languages, key=languages.get)
         else:
             result["primary_language"] = "unknown"
 
@@ -158,12 +488,9 @@ class CodeAnalyzer:
         deps = {}
 
         for config_file in config_files:
-            file_path = base_path / config_file
-            if not file_path.exists():
-                continue
-
             try:
-                content = file_path.read_text(encoding='utf-8', errors='ignore')
+                with open_code_file(str(base_path), config_file) as f:
+                    content = f.read().decode('utf-8', errors='ignore')
 
                 if config_file == 'package.json':
                     import json
@@ -218,62 +545,174 @@ class CodeAnalyzer:
         return deps
 
     def get_file_content(self, base_path: str, file_path: str, max_lines: int = 500) -> str:
-        """Get content of a specific file."""
-        full_path = os.path.join(base_path, file_path)
+        """Get content of a specific file, capped at max_lines and MAX_CONTENT_BYTES."""
         try:
-            with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()[:max_lines]
-                return ''.join(lines)
+            with open_code_file(base_path, file_path) as f:
+                head = f.read(self.MAX_CONTENT_BYTES)
         except Exception:
             return ""
+        if self.classifier.classify_head(file_path, head[:FileClassifier.SNIFF_BYTES]) == FileClassifier.BINARY:
+            return ""
+        # The byte cap bounds the decode; max_lines bounds what is returned
+        lines = head.decode('utf-8', errors='ignore').splitlines(keepends=True)
+        return ''.join(lines[:max_lines])
 
-    def get_relevant_files_for_section(
-        self,
-        base_path: str,
-        section_name: str,
-        analysis_data: dict,
-        max_files: int = 10,
-    ) -> list[dict]:
-        """Get files relevant to a specific documentation section."""
-        relevant = []
-
-        # Map sections to file patterns
-        section_patterns = {
-            'installation': ['README', 'INSTALL', 'setup.py', 'package.json', 'requirements.txt'],
-            'api': ['api', 'routes', 'endpoints', 'controllers', 'handlers'],
-            'configuration': ['config', 'settings', '.env', 'conf'],
-            'architecture': ['main', 'app', 'index', 'core', 'src'],
-            'database': ['models', 'schema', 'migrations', 'database', 'db'],
-            'testing': ['test', 'spec', '__tests__'],
-            'deployment': ['Dockerfile', 'docker-compose', 'kubernetes', 'k8s', 'deploy'],
-        }
+    def get_section_patterns(self, section_name: str, rules: Optional[dict] = None) -> list[str]:
+        """Path patterns for a section: stored rules, built-in keywords, then title words."""
+        patterns = list(rules.get('patterns') or []) if rules else []
 
         section_lower = section_name.lower()
-        patterns = []
-
-        # Find matching patterns
-        for key, pats in section_patterns.items():
+        for key, pats in self.SECTION_PATTERNS.items():
             if key in section_lower:
                 patterns.extend(pats)
 
-        # If no specific patterns, use entry points and config files
         if not patterns:
-            patterns = ['main', 'app', 'index', 'README']
+            # Custom sections: match on the title's own words
+            patterns = [
+                word for word in re.findall(r'[a-z0-9]+', section_lower)
+                if len(word) >= 3 and word not in self.TITLE_STOPWORDS
+            ]
 
-        # Search through file tree
-        for file_path in analysis_data.get('file_tree', []):
-            file_lower = file_path.lower()
-            for pattern in patterns:
-                if pattern.lower() in file_lower:
-                    content = self.get_file_content(base_path, file_path, max_lines=200)
-                    if content:
-                        relevant.append({
-                            'path': file_path,
-                            'content': content,
-                        })
-                    break
+        return patterns
+
+    def get_relevant_files_for_section(
+        self,
+        base_path: str,
+        section_name: str,
+        analysis_data: dict,
+        max_files: int = 10,
+        file_paths: Optional[list[str]] = None,
+        path_index: Optional[PathIndex] = None,
+        rules: Optional[dict] = None,
+        content_index: Optional[ContentIndex] = None,
+        query: Optional[str] = None,
+        symbol_index: Optional[SymbolIndex] = None,
+        import_graph: Optional[ImportGraph] = None,
+    ) -> list[dict]:
+        """Get files relevant to a specific documentation section.
+
+        With a path_index, candidates are ranked by how strongly their path tokens
+        match the section's patterns. Without one (projects not re-analyzed since
+        indexing was added), paths are scanned in order and the first matches win.
+        file_paths is the project's sorted file listing; analyses from before the
+        listing moved out of analysis_data still carry it as "file_tree".
+
+        With a content_index and a free-text query (section title and description),
+        BM25 chunk hits are fused with the path ranking, and files found by content
+        contribute their best-matching chunks instead of their first lines.
+
+        With a symbol_index, files defining symbols (or routes) that match the query
+        join the ranking too, and their matching definitions are quoted in full.
+
+        With an import_graph, the final order is boosted by each file's PageRank
+        centrality so the modules the rest of the code depends on come first.
+        """
+        rules = rules or {}
+        patterns = self.get_section_patterns(section_name, rules)
+
+        if path_index is not None:
+            candidates = path_index.search(
+                patterns,
+                limit=max_files * 3,
+                extensions=rules.get('extensions'),
+                exclude=rules.get('exclude'),
+            )
+        else:
+            if file_paths is None:
+                file_paths = analysis_data.get('file_tree', [])
+            candidates = list(islice(
+                self._scan_paths(file_paths, patterns or self.FALLBACK_PATTERNS),
+                max_files * 3,
+            ))
+
+        symbol_query = ' '.join([query or section_name] + patterns)
+        chunks_by_path: dict[str, list[dict]] = {}
+        rankings = [candidates]
+        if content_index is not None and query:
+            for hit in content_index.search(query, limit=max_files * 4):
+                if self._allowed_by_rules(hit['path'], rules):
+                    chunks_by_path.setdefault(hit['path'], []).append(hit)
+            rankings.append(list(chunks_by_path))
+        if symbol_index is not None:
+            rankings.append([
+                p for p in symbol_index.search(symbol_query, limit=max_files * 3)
+                if self._allowed_by_rules(p, rules)
+            ])
+        if len(rankings) > 1:
+            candidates = self._fuse_rankings(*rankings)
+
+        if import_graph is not None:
+            if candidates:
+                candidates = self._boost_central(candidates, import_graph)
+            else:
+                # Nothing matched by path or content - use the most central modules
+                candidates = [p for p, _ in import_graph.top(max_files * 3)]
+
+        if not candidates and path_index is not None:
+            # Nothing matched by path or content - fall back to likely entry points
+            candidates = path_index.search(self.FALLBACK_PATTERNS, limit=max_files * 3)
 
+        relevant = []
+        for file_path in candidates:
+            # Prefer whole matching definitions, then matching chunks, then the file's head
+            excerpt = symbol_index.excerpt(base_path, file_path, symbol_query) if symbol_index else None
+            chunks = sorted(chunks_by_path.get(file_path, [])[:self.MAX_CHUNKS_PER_FILE],
+                            key=lambda c: c['start_line'])
+            lines = None
+            if excerpt:
+                content, lines = excerpt
+            elif chunks:
+                content = "\n...\n".join(
+                    read_chunk(base_path, file_path, c['start_line'], c['end_line']) for c in chunks
+                )
+                lines = [[c['start_line'], c['end_line']] for c in chunks]
+            else:
+                content = self.get_file_content(base_path, file_path, max_lines=200)
+            if content:
+                entry = {
+                    'path': file_path,
+                    'content': content,
+                }
+                if lines:
+                    entry['lines'] = lines
+                relevant.append(entry)
             if len(relevant) >= max_files:
                 break
 
         return relevant
+
+    def _allowed_by_rules(self, file_path: str, rules: dict) -> bool:
+        """Apply a section's extension allow-list and exclude substrings to a path."""
+        lowered = file_path.lower()
+        extensions = rules.get('extensions')
+        if extensions and os.path.splitext(lowered)[1].lstrip('.') not in {e.lower().lstrip('.') for e in extensions}:
+            return False
+        return not any(e.lower() in lowered for e in rules.get('exclude') or [])
+
+    def _boost_central(self, ranking: list[str], import_graph: ImportGraph) -> list[str]:
+        """Re-rank paths, scaling each rank score by up to (1 + CENTRALITY_BOOST) for central files."""
+        scores = import_graph.score_map()
+        top = max(scores.values(), default=0.0)
+        if top <= 0:
+            return ranking
+        boosted = {
+            file_path: (1.0 / (self.RRF_K + rank)) * (1.0 + self.CENTRALITY_BOOST * scores.get(file_path, 0.0) / top)
+            for rank, file_path in enumerate(ranking)
+        }
+        return sorted(ranking, key=lambda p: -boosted[p])
+
+    def _fuse_rankings(self, *rankings: list[str]) -> list[str]:
+        """Merge ranked path lists with reciprocal rank fusion."""
+        scores: dict[str, float] = {}
+        for ranking in rankings:
+            for rank, file_path in enumerate(ranking):
+                scores[file_path] = scores.get(file_path, 0.0) + 1.0 / (self.RRF_K + rank)
+        return sorted(scores, key=lambda p: -scores[p])
+
+    def _scan_paths(self, file_paths: list[str], patterns: list[str]):
+        """Yield paths containing any pattern, in listing order."""
+        lowered = [p.lower() for p in patterns]
+        for file_path in file_paths:
+            file_lower = file_path.lower()
+            if any(pattern in file_lower for pattern in lowered):
+                yield file_path
@@ -0,0 +1,17 @@
+import hashlib
+
+
+def blob_hasher(size: int):
+    """Return a SHA-1 hasher primed with a git blob header.
+
+    Feeding the file's bytes into it yields the same digest as `git hash-object`,
+    so hashes computed from the filesystem line up with git blob SHAs.
+    """
+    return hashlib.sha1(b"blob %d\0" % size)
+
+
+def hash_bytes(data: bytes) -> str:
+    """Git blob SHA-1 of an in-memory buffer."""
+    hasher = blob_hasher(len(data))
+    hasher.update(data)
+    return hasher.hexdigest()
@@ -0,0 +1,208 @@
+import io
+import re
+import math
+from collections import Counter
+from itertools import islice
+from typing import Any, Callable, Optional
+from app.services.archive_fs import open_code_file
+from app.services.path_index import IndexFileCache, read_index_file, write_index_file
+
+
+class ContentIndex:
+    """BM25 inverted index over fixed-size line chunks of a project's files.
+
+    Chunk term frequencies are stored per content hash, so a rebuild only reads
+    files whose hash isn't already indexed and identical files share their
+    chunks. Postings are assembled once when the index is loaded and kept in
+    memory, so a query only touches the posting lists of its own terms.
+    """
+
+    VERSION = 2
+
+    CHUNK_LINES = 50  # Lines per indexed chunk
+    MAX_FILE_BYTES = 1024 * 1024  # Larger files are left out of the content index
+
+    # BM25 parameters
+    K1 = 1.2
+    B = 0.75
+
+    STOPWORDS = {
+        'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have',
+        'in', 'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was',
+        'will', 'with', 'how', 'what', 'which', 'into', 'use', 'used', 'using',
+        # Ubiquitous code tokens that say nothing about a section
+        'self', 'def', 'return', 'import', 'const', 'let', 'var', 'function', 'if',
+        'else', 'elif', 'not', 'none', 'null', 'true', 'false', 'new', 'int', 'str',
+    }
+
+    _WORD_RE = re.compile(r'[A-Za-z][A-Za-z0-9_]*')
+    _CAMEL_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+    def __init__(self, files: dict[str, str], segments: dict[str, list[list]]):
+        self.files = files  # path -> content hash
+        self.segments = segments  # content hash -> [[start_line, end_line, length, {term: tf}], ...]
+        self._build_postings()
+
+    @classmethod
+    def tokenize(cls, text: str) -> list[str]:
+        """Lowercased terms: whole identifiers plus their snake_case/camelCase parts."""
+        terms = []
+        for word in cls._WORD_RE.findall(text):
+            lowered = word.lower()
+            parts = [p.lower() for piece in word.split('_') for p in cls._CAMEL_RE.findall(piece)]
+            if len(parts) > 1 and 2 <= len(lowered) <= 40 and lowered not in cls.STOPWORDS:
+                terms.append(cls._normalize(lowered))
+            for part in parts:
+                if 2 <= len(part) <= 40 and part not in cls.STOPWORDS and not part.isdigit():
+                    terms.append(cls._normalize(part))
+        return terms
+
+    @staticmethod
+    def _normalize(term: str) -> str:
+        """Fold simple plurals so "tokens" in a description matches "token" in code."""
+        if len(term) > 4 and term.endswith('s') and not term.endswith('ss'):
+            return term[:-1]
+        return term
+
+    @classmethod
+    def chunk_text(cls, text: str) -> list[list]:
+        """Split file text into chunk records of CHUNK_LINES lines each."""
+        lines = split_lines(text)
+        chunks = []
+        for start in range(0, len(lines), cls.CHUNK_LINES):
+            terms = cls.tokenize('\n'.join(lines[start:start + cls.CHUNK_LINES]))
+            if terms:
+                end = min(start + cls.CHUNK_LINES, len(lines))
+                chunks.append([start + 1, end, len(terms), dict(Counter(terms))])
+        return chunks
+
+    @classmethod
+    def build(
+        cls,
+        files: dict[str, str],
+        read_file: Callable[[str], Optional[str]],
+        previous: Optional["ContentIndex"] = None,
+    ) -> tuple["ContentIndex", int]:
+        """Build an index, reusing chunks of a previous index for unchanged hashes.
+
+        Args:
+            files: path -> content hash for every file to index
+            read_file: Returns a file's text, or None to leave it out
+
+        Returns:
+            tuple: (index, number of files read)
+        """
+        reusable = previous.segments if previous else {}
+        segments: dict[str, list[list]] = {}
+        indexed: dict[str, str] = {}
+        read = 0
+
+        for path, content_hash in files.items():
+            if content_hash not in segments:
+                if content_hash in reusable:
+                    segments[content_hash] = reusable[content_hash]
+                else:
+                    text = read_file(path)
+                    read += 1
+                    if text is None:
+                        continue
+                    segments[content_hash] = cls.chunk_text(text)
+            indexed[path] = content_hash
+
+        return cls(indexed, segments), read
+
+    def _build_postings(self) -> None:
+        """Assemble term -> [(chunk id, tf)] postings over every file's chunks."""
+        self.chunks: list[tuple[str, int, int]] = []  # (path, start_line, end_line)
+        lengths = []
+        postings: dict[str, list[tuple[int, int]]] = {}
+
+        for path in sorted(self.files):
+            for start, end, length, tfs in self.segments.get(self.files[path], []):
+                chunk_id = len(self.chunks)
+                self.chunks.append((path, start, end))
+                lengths.append(length)
+                for term, tf in tfs.items():
+                    postings.setdefault(term, []).append((chunk_id, tf))
+
+        self.postings = postings
+        self.lengths = lengths
+        self.avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+    def search(self, query: str, limit: int = 10) -> list[dict[str, Any]]:
+        """Top chunks for a free-text query, best first.
+
+        Returns:
+            list: {"path", "start_line", "end_line", "score"} per chunk
+        """
+        terms = set(self.tokenize(query))
+        if not terms or not self.chunks:
+            return []
+
+        total = len(self.chunks)
+        scores: dict[int, float] = {}
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, tf in postings:
+                norm = self.K1 * (1 - self.B + self.B * self.lengths[chunk_id] / self.avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+
+        best = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [
+            {
+                "path": self.chunks[chunk_id][0],
+                "start_line": self.chunks[chunk_id][1],
+                "end_line": self.chunks[chunk_id][2],
+                "score": round(score, 4),
+            }
+            for chunk_id, score in best
+        ]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"version": self.VERSION, "files": self.files, "segments": self.segments}
+
+    def save(self, file_path: str) -> None:
+        """Write the index atomically."""
+        write_index_file(file_path, self.to_dict())
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional["ContentIndex"]:
+        """Load an index, reusing the in-process copy while the file is unchanged."""
+        return _index_cache.get(file_path, cls._read)
+
+    @classmethod
+    def _read(cls, file_path: str) -> Optional["ContentIndex"]:
+        data = read_index_file(file_path, cls.VERSION)
+        if data is None:
+            return None
+        return cls(files=data["files"], segments=data["segments"])
+
+
+def split_lines(text: str) -> list[str]:
+    """Split text into lines the way universal-newline file reading does.
+
+    Only LF, CRLF and CR end a line (unlike str.splitlines, which also breaks on
+    form feeds and Unicode separators), so chunk line numbers agree with
+    read_chunk and with the line numbers parsers report.
+    """
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    return lines
+
+
+def read_chunk(base_path: str, file_path: str, start_line: int, end_line: int) -> str:
+    """Read lines start_line..end_line (1-based, inclusive) of a file."""
+    # Universal-newline iteration splits lines exactly like split_lines
+    try:
+        with io.TextIOWrapper(open_code_file(base_path, file_path), encoding='utf-8', errors='ignore') as f:
+            return ''.join(islice(f, start_line - 1, end_line))
+    except OSError:
+        return ""
+
+
+# Content indexes are larger than path indexes, so keep fewer of them loaded
+_index_cache = IndexFileCache(max_entries=4)
@@ -1,9 +1,43 @@
-import os
-from typing import Any
+import asyncio
+import weakref
+from datetime import datetime
+from typing import Any, Callable, Optional
 from sqlalchemy.orm import Session
-from app.models import Document, DocumentSection, GeneratedContent, Project
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import SessionLocal
+from app.models import (
+    Document,
+    DocumentSection,
+    GeneratedContent,
+    GenerationJob,
+    GenerationJobSection,
+    Project,
+    ProjectFile,
+)
+from app.services.archive_fs import upload_code_path
 from app.services.claude_service import ClaudeService
 from app.services.code_analyzer import CodeAnalyzer
+from app.services.content_index import ContentIndex
+from app.services.import_graph import ImportGraph
+from app.services.path_index import PathIndex
+from app.services.project_indexer import ProjectIndexer
+from app.services.symbol_index import SymbolIndex
+
+# Process-wide cap on concurrent LLM calls, shared by every document being generated
+_llm_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _llm_slot() -> asyncio.Semaphore:
+    """The running event loop's LLM call semaphore (asyncio primitives are loop-bound)."""
+    loop = asyncio.get_running_loop()
+    if loop not in _llm_slots:
+        _llm_slots[loop] = asyncio.Semaphore(max(1, settings.generation_max_concurrency))
+    return _llm_slots[loop]
+
+
+def _ignore_event(event: str, data: dict) -> None:
+    pass
 
 
 class DocumentGenerator:
@@ -14,71 +48,121 @@ class DocumentGenerator:
         self.claude_service = ClaudeService()
         self.code_analyzer = CodeAnalyzer()
 
-    def generate_document(self, document_id: str) -> list[dict]:
-        """Generate content for all sections in a document."""
-        document = self.db.query(Document).filter(Document.id == document_id).first()
-        if not document:
-            raise ValueError("Document not found")
+    async def run_job(self, job: GenerationJob, publish: Optional[Callable[[str, dict], None]] = None) -> None:
+        """Generate a job's unfinished sections, persisting each section's state as it changes.
+
+        Sections are generated concurrently (up to settings.generation_concurrency
+        per document), each in its own database session, and their content is
+        saved in display order. A section that fails is marked failed without
+        stopping the others; placeholder content is saved when the AI is
+        unavailable. Cancelling the awaiting task stops the job where it is.
+
+        With publish, responses are streamed from the AI provider and progress is
+        reported as it happens: publish(event, data) is called with
+        "section_started", "delta" (a piece of a section's text),
+        "section_completed" (with the saved content) and finally "job".
+        """
+        publish = publish or _ignore_event
 
-        # Update status
+        document = job.document
+        job.status = "running"
+        job.started_at = job.started_at or datetime.utcnow()
         document.status = "generating"
+        # Sections interrupted by a restart start over
+        pending = [s for s in job.sections if s.status not in GenerationJobSection.FINISHED_STATUSES]
+        for job_section in pending:
+            job_section.status = "queued"
         self.db.commit()
 
-        results = []
-
         try:
-            # Get project and analysis data
-            project = document.project
-            code_path = self._get_code_path(project)
-            analysis_data = project.analysis_data or {}
-
-            # Get document type name
-            doc_type_name = document.document_type.name if document.document_type else "Technical Documentation"
-
-            # Generate content for each included section
-            for section in document.sections:
-                if not section.is_included:
-                    continue
-
+            # Index loads and file listing are blocking, keep them off the event loop
+            context = await run_in_threadpool(self._load_context, document)
+            document_slots = asyncio.Semaphore(max(1, settings.generation_concurrency))
+            fresh = bool(job.fresh)
+            # Set once each section's outcome is saved; a section saves after the one before it
+            saved = [asyncio.Event() for _ in pending]
+
+            async def generate(index: int, job_section_id) -> None:
+                db = SessionLocal()
                 try:
-                    content, used_placeholder = self._generate_section_content(
-                        section=section,
-                        code_path=code_path,
-                        analysis_data=analysis_data,
-                        doc_type_name=doc_type_name,
-                    )
-
-                    # Save generated content
-                    generated = self._save_content(section.id, content)
-                    results.append({
-                        'section_id': str(section.id),
-                        'title': section.title,
-                        'success': True,
-                        'content_id': str(generated.id),
-                        'used_placeholder': used_placeholder,
-                    })
-
-                except Exception as e:
-                    results.append({
-                        'section_id': str(section.id),
-                        'title': section.title,
-                        'success': False,
-                        'error': str(e),
+                    job_section = db.get(GenerationJobSection, job_section_id)
+                    if job_section is None:
+                        return
+                    content = None
+                    used_placeholder = False
+                    error = None
+                    async with document_slots:
+                        section = db.get(DocumentSection, job_section.document_section_id)
+                        job_section.status = "running"
+                        job_section.started_at = datetime.utcnow()
+                        db.commit()
+                        section_ref = {'document_section_id': str(job_section.document_section_id)}
+                        publish("section_started", section_ref)
+                        try:
+                            if section is None:
+                                raise ValueError("Section was removed from the document")
+                            content, used_placeholder = await self._generate_section_content(
+                                section=section,
+                                on_delta=lambda text: publish("delta", {**section_ref, 'text': text}),
+                                fresh=fresh,
+                                **context,
+                            )
+                        except Exception as e:
+                            error = str(e)
+
+                    if index:
+                        await saved[index - 1].wait()
+                    if error is None:
+                        try:
+                            generated = self._save_content(section.id, content, db)
+                            job_section.status = "placeholder" if used_placeholder else "done"
+                            job_section.content_id = generated.id
+                        except Exception as e:
+                            db.rollback()
+                            error = str(e)
+                    if error is not None:
+                        content = None
+                        job_section.status = "failed"
+                        job_section.error = error
+                    job_section.finished_at = datetime.utcnow()
+                    db.commit()
+                    publish("section_completed", {
+                        **section_ref,
+                        'status': job_section.status,
+                        'content_id': str(job_section.content_id) if job_section.content_id else None,
+                        'content': content,
+                        'error': job_section.error,
                     })
+                finally:
+                    saved[index].set()
+                    db.close()
 
-            # Update document status
-            document.status = "completed"
-            self.db.commit()
+            await asyncio.gather(*(
+                generate(index, job_section.id) for index, job_section in enumerate(pending)
+            ))
+            outcome, error, document_status = "completed", None, "completed"
 
         except Exception as e:
-            document.status = "draft"
-            self.db.commit()
-            raise e
-
-        return results
+            self.db.rollback()
+            outcome, error, document_status = "failed", str(e), "draft"
+
+        # Only a job still running is finished here: one cancelled meanwhile stays cancelled
+        finished = (
+            self.db.query(GenerationJob)
+            .filter(GenerationJob.id == job.id, GenerationJob.status == "running")
+            .update(
+                {"status": outcome, "error": error, "finished_at": datetime.utcnow()},
+                synchronize_session=False,
+            )
+        )
+        if finished:
+            document.status = document_status
+        self.db.commit()
+        self.db.refresh(job)
+        publish("job", {'status': job.status, 'error': job.error})
 
-    def regenerate_section(self, document_id: str, section_id: str) -> dict:
-        """Regenerate content for a specific section."""
+    async def regenerate_section(self, document_id: str, section_id: str, fresh: bool = False) -> dict:
+        """Regenerate content for a specific section (fresh bypasses the LLM response cache)."""
         section = (
             self.db.query(DocumentSection)
             .filter(
@@ -91,17 +175,11 @@ class DocumentGenerator:
         if not section:
             raise ValueError("Section not found")
 
-        document = section.document
-        project = document.project
-        code_path = self._get_code_path(project)
-        analysis_data = project.analysis_data or {}
-        doc_type_name = document.document_type.name if document.document_type else "Technical Documentation"
-
-        content, used_placeholder = self._generate_section_content(
+        context = await run_in_threadpool(self._load_context, section.document)
+        content, used_placeholder = await self._generate_section_content(
             section=section,
-            code_path=code_path,
-            analysis_data=analysis_data,
-            doc_type_name=doc_type_name,
+            fresh=fresh,
+            **context,
         )
 
         generated = self._save_content(section_id, content)
@@ -114,48 +192,115 @@ class DocumentGenerator:
             'used_placeholder': used_placeholder,
         }
 
+    def _load_context(self, document: Document) -> dict[str, Any]:
+        """Project code location, analysis and indexes shared by every section of a document."""
+        project = document.project
+        indexer = ProjectIndexer(self.db)
+        path_index = indexer.load_path_index(project)
+        return {
+            'code_path': self._get_code_path(project),
+            'analysis_data': project.analysis_data or {},
+            'doc_type_name': document.document_type.name if document.document_type else "Technical Documentation",
+            'file_paths': None if path_index else self._get_file_paths(project),
+            'path_index': path_index,
+            'content_index': indexer.load_content_index(project),
+            'symbol_index': indexer.load_symbol_index(project),
+            'import_graph': indexer.load_import_graph(project),
+        }
+
     def _get_code_path(self, project: Project) -> str:
         """Get the path to the code files."""
         if project.source_type == "upload":
-            return os.path.join(project.storage_path, "code")
+            return upload_code_path(project.storage_path)
         return project.storage_path
 
-    def _generate_section_content(
+    def _get_file_paths(self, project: Project) -> Optional[list[str]]:
+        """Get the project's sorted file listing from its manifest.
+
+        Returns None when the project has no manifest yet, so callers fall back to
+        a legacy file_tree in analysis_data.
+        """
+        paths = [
+            path for (path,) in
+            self.db.query(ProjectFile.path)
+            .filter(ProjectFile.project_id == project.id)
+            .order_by(ProjectFile.path)
+        ]
+        return paths or None
+
+    async def _generate_section_content(
         self,
         section: DocumentSection,
         code_path: str,
         analysis_data: dict[str, Any],
         doc_type_name: str,
+        file_paths: Optional[list[str]] = None,
+        path_index: Optional[PathIndex] = None,
+        content_index: Optional[ContentIndex] = None,
+        symbol_index: Optional[SymbolIndex] = None,
+        import_graph: Optional[ImportGraph] = None,
+        on_delta: Optional[Callable[[str], None]] = None,
+        fresh: bool = False,
     ) -> tuple[str, bool]:
         """Generate content for a single section.
 
+        With on_delta, the response is streamed and on_delta receives each piece
+        of text as it arrives; the full text is still returned. If the AI fails
+        part-way, the placeholder returned replaces what was streamed.
+
         Returns:
             tuple: (content, used_placeholder) - content string and whether placeholder was used
         """
-        # Get relevant files for this section
-        relevant_files = self.code_analyzer.get_relevant_files_for_section(
+        # Get relevant files for this section (index lookups and file reads, off the event loop)
+        relevant_files = await run_in_threadpool(
+            self.code_analyzer.get_relevant_files_for_section,
             code_path,
             section.title,
             analysis_data,
             max_files=5,
+            file_paths=file_paths,
+            path_index=path_index,
+            rules=section.section.retrieval_rules if section.section else None,
+            content_index=content_index,
+            query=f"{section.title} {section.description or ''}",
+            symbol_index=symbol_index,
+            import_graph=import_graph,
         )
 
         # Build code context
         code_context = ""
         for file_info in relevant_files:
-            code_context += f"\n\n--- {file_info['path']} ---\n{file_info['content']}"
+            header = file_info['path']
+            if file_info.get('lines'):
+                header += " (lines " + ", ".join(f"{start}-{end}" for start, end in file_info['lines']) + ")"
+            code_context += f"\n\n--- {header} ---\n{file_info['content']}"
 
         if not code_context:
             code_context = "No specific code files found for this section. Generate based on general project structure."
 
         try:
             # Generate content using Claude
-            content = self.claude_service.generate_section_content(
-                section_title=section.title,
-                section_description=section.description,
-                code_context=code_context,
-                document_type=doc_type_name,
-            )
+            async with _llm_slot():
+                if on_delta is None:
+                    content = await self.claude_service.generate_section_content(
+                        section_title=section.title,
+                        section_description=section.description,
+                        code_context=code_context,
+                        document_type=doc_type_name,
+                        fresh=fresh,
+                    )
+                else:
+                    parts = []
+                    async for text in self.claude_service.stream_section_content(
+                        section_title=section.title,
+                        section_description=section.description,
+                        code_context=code_context,
+                        document_type=doc_type_name,
+                        fresh=fresh,
+                    ):
+                        parts.append(text)
+                        on_delta(text)
+                    content = "".join(parts)
             return content, False
         except Exception as e:
             # Fallback: generate placeholder content when AI fails
@@ -230,11 +375,12 @@ class DocumentGenerator:
 
         return content
 
-    def _save_content(self, section_id: str, content: str) -> GeneratedContent:
-        """Save generated content with version tracking."""
+    def _save_content(self, section_id: str, content: str, db: Optional[Session] = None) -> GeneratedContent:
+        """Save generated content with version tracking (in db, default self.db)."""
+        db = db or self.db
         # Get current max version
         current_max = (
-            self.db.query(GeneratedContent)
+            db.query(GeneratedContent)
             .filter(GeneratedContent.document_section_id == section_id)
             .order_by(GeneratedContent.version.desc())
             .first()
@@ -249,8 +395,8 @@ class DocumentGenerator:
             is_ai_generated=True,
         )
 
-        self.db.add(generated)
-        self.db.commit()
-        self.db.refresh(generated)
+        db.add(generated)
+        db.commit()
+        db.refresh(generated)
 
         return generated
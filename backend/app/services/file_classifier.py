@@ -0,0 +1,117 @@
+import os
+import re
+from typing import Optional
+from app.services.archive_fs import open_code_file
+
+
+class FileClassifier:
+    """Classifies files so the analyzer can skip or cap work on non-source content.
+
+    Path-only checks (lockfile names, vendored directories, size, binary
+    extensions) run first and need no I/O. Files that pass are sniffed from their
+    first bytes for binary content, generated-file markers and minified lines.
+    """
+
+    NORMAL = "normal"
+    BINARY = "binary"
+    MINIFIED = "minified"
+    GENERATED = "generated"
+    LOCKFILE = "lockfile"
+    VENDORED = "vendored"
+    OVERSIZED = "oversized"
+
+    # Classes whose contents are never read (no line counts, hashes or context)
+    SKIP_READ = {BINARY, MINIFIED, LOCKFILE, VENDORED, OVERSIZED}
+
+    SNIFF_BYTES = 8192
+
+    LOCKFILES = {
+        'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml', 'bun.lockb',
+        'poetry.lock', 'Pipfile.lock', 'pdm.lock', 'uv.lock', 'Cargo.lock', 'composer.lock',
+        'Gemfile.lock', 'go.sum', 'mix.lock', 'pubspec.lock', 'packages.lock.json',
+    }
+
+    VENDORED_DIRS = {'vendor', 'vendors', 'third_party', 'third-party', 'thirdparty', 'bower_components'}
+
+    BINARY_EXTENSIONS = {
+        '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.tiff', '.psd',
+        '.pdf', '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.tar', '.jar', '.war',
+        '.exe', '.dll', '.so', '.dylib', '.o', '.a', '.lib', '.class', '.pyc', '.pyo', '.wasm',
+        '.woff', '.woff2', '.ttf', '.otf', '.eot', '.mp3', '.mp4', '.wav', '.ogg', '.mov', '.avi',
+        '.sqlite', '.db', '.bin', '.dat', '.npy', '.pkl', '.parquet',
+    }
+
+    MAGIC_NUMBERS = (
+        b'\x89PNG', b'GIF8', b'\xff\xd8\xff', b'%PDF', b'PK\x03\x04', b'\x7fELF',
+        b'\x1f\x8b', b'\xca\xfe\xba\xbe', b'\x00asm', b'SQLite format 3',
+    )
+
+    # DOS/PE header; two ASCII letters any text file may start with, so only
+    # trusted on extensionless files (.exe and .dll are caught by extension)
+    EXECUTABLE_MAGIC = b'MZ'
+
+    GENERATED_NAME_RE = re.compile(
+        r'(_pb2(_grpc)?\.py|\.pb\.go|\.pb\.(cc|h)|\.generated\.\w+|\.g\.dart|\.designer\.cs|_generated\.\w+)$'
+    )
+    # Markers must sit in a leading comment so prose mentioning "generated" doesn't match
+    GENERATED_MARKER_RE = re.compile(
+        rb'@generated\b|\bDO NOT EDIT\b'
+        rb'|^\s*(?:#|//|/?\*|<!--|--)\s*(?:this (?:file|code) (?:is|was|has been) )?(?:auto-?)?generated\b',
+        re.IGNORECASE | re.MULTILINE,
+    )
+    MINIFIED_NAME_RE = re.compile(r'\.min\.(js|css|mjs)$|-min\.js$|\.bundle\.js$')
+
+    # A sniffed head counts as minified when its lines are this long on average
+    MINIFIED_AVG_LINE = 300
+    MINIFIED_EXTENSIONS = {'.js', '.mjs', '.cjs', '.css', '.json', '.svg', '.map'}
+
+    def __init__(self, max_file_bytes: int):
+        self.max_file_bytes = max_file_bytes
+
+    def classify_path(self, rel_path: str, size: int) -> Optional[str]:
+        """Class decided from the path and size alone, or None if contents must be sniffed."""
+        name = os.path.basename(rel_path)
+        if name in self.LOCKFILES:
+            return self.LOCKFILE
+        if any(part in self.VENDORED_DIRS for part in rel_path.split('/')[:-1]):
+            return self.VENDORED
+        ext = os.path.splitext(name)[1].lower()
+        if ext in self.BINARY_EXTENSIONS:
+            return self.BINARY
+        if self.MINIFIED_NAME_RE.search(name):
+            return self.MINIFIED
+        if size > self.max_file_bytes:
+            return self.OVERSIZED
+        if self.GENERATED_NAME_RE.search(name):
+            return self.GENERATED
+        return None
+
+    def classify_head(self, rel_path: str, head: bytes) -> str:
+        """Class from a file's first SNIFF_BYTES bytes."""
+        ext = os.path.splitext(rel_path)[1].lower()
+        if b'\x00' in head or head.startswith(self.MAGIC_NUMBERS):
+            return self.BINARY
+        if not ext and head.startswith(self.EXECUTABLE_MAGIC):
+            return self.BINARY
+
+        if self.GENERATED_MARKER_RE.search(head[:1024]):
+            return self.GENERATED
+
+        if ext in self.MINIFIED_EXTENSIONS and len(head) >= 1024:
+            lines = head.count(b'\n') + 1
+            if len(head) / lines > self.MINIFIED_AVG_LINE:
+                return self.MINIFIED
+
+        return self.NORMAL
+
+    def classify(self, code_path: str, rel_path: str, size: int) -> str:
+        """Classify a file of a directory or archive, reading at most SNIFF_BYTES of it."""
+        file_class = self.classify_path(rel_path, size)
+        if file_class is not None:
+            return file_class
+        try:
+            with open_code_file(code_path, rel_path) as f:
+                head = f.read(self.SNIFF_BYTES)
+        except OSError:
+            return self.NORMAL
+        return self.classify_head(rel_path, head)
@@ -0,0 +1,201 @@
+import os
+import posixpath
+from typing import Any, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from app.services.ignore_rules import IgnoreFile, IgnoreRules
+
+
+class FileWalker:
+    """Parallel directory walker built on os.scandir.
+
+    Each directory is scanned as one task on a bounded thread pool. Subdirectories
+    discovered by a task are submitted back to the pool by the coordinating thread,
+    so traversal fans out without workers ever blocking on each other. Per-file work
+    runs inside the task that discovered the file.
+
+    Ignore files named in ignore_files (gitignore syntax) are honoured in every
+    directory: ignored files are never passed to on_file and ignored directories
+    are pruned without being scanned.
+    """
+
+    def __init__(self, skip_dirs: set[str], max_workers: int = 1, ignore_files: tuple[str, ...] = ()):
+        self.skip_dirs = skip_dirs
+        self.max_workers = max(1, max_workers)
+        self.ignore_files = ignore_files
+
+    def walk(
+        self,
+        root: str,
+        on_file: Callable[[os.DirEntry, str], Any],
+    ) -> tuple[list[Any], int, int]:
+        """Walk a directory tree and apply on_file to every file.
+
+        Args:
+            root: Directory to walk
+            on_file: Called as on_file(entry, rel_path) for each file; may return None
+
+        Returns:
+            tuple: (results, total_dirs, ignored) - non-None on_file results, directories
+                visited and paths pruned by ignore files (a pruned directory counts once)
+        """
+        results = []
+        total_dirs = 0
+        ignored = 0
+        rules = IgnoreRules()
+
+        if self.max_workers == 1:
+            # Serial walk - avoids pool overhead for small trees and benchmarks
+            stack = [(root, '', rules)]
+            while stack:
+                subdirs, file_results, pruned = self._scan_dir(*stack.pop(), on_file)
+                total_dirs += 1
+                ignored += pruned
+                results.extend(file_results)
+                stack.extend(subdirs)
+            return results, total_dirs, ignored
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(self._scan_dir, root, '', rules, on_file)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, file_results, pruned = future.result()
+                    total_dirs += 1
+                    ignored += pruned
+                    results.extend(file_results)
+                    for subdir in subdirs:
+                        pending.add(pool.submit(self._scan_dir, *subdir, on_file))
+
+        return results, total_dirs, ignored
+
+    def walk_paths(
+        self,
+        paths: list[str],
+        read_text: Callable[[str], Optional[str]],
+    ) -> tuple[list[str], int, int]:
+        """Apply the walk's skip_dirs and ignore files to a flat path listing.
+
+        For trees that are listed rather than walked (e.g. from git). Directories
+        are reconstructed from the paths and pruned exactly as walk() would.
+
+        Args:
+            paths: "/"-separated file paths relative to the tree root
+            read_text: Returns an ignore file's text by path, or None
+
+        Returns:
+            tuple: (kept paths, total_dirs, ignored)
+        """
+        children: dict[str, tuple[list[str], list[str]]] = {'': ([], [])}
+        for path in paths:
+            parent = posixpath.dirname(path)
+            # Register missing ancestors, stopping at the first known one
+            missing = []
+            while parent not in children:
+                missing.append(parent)
+                parent = posixpath.dirname(parent)
+            for rel_dir in reversed(missing):
+                children[rel_dir] = ([], [])
+                children[posixpath.dirname(rel_dir)][0].append(rel_dir)
+            children[posixpath.dirname(path)][1].append(path)
+
+        kept = []
+        total_dirs = 0
+        ignored = 0
+        stack = [('', IgnoreRules())]
+        while stack:
+            rel_dir, rules = stack.pop()
+            subdirs, files = children[rel_dir]
+            total_dirs += 1
+
+            if self.ignore_files:
+                names = {posixpath.basename(path) for path in files}
+                present = [name for name in self.ignore_files if name in names]
+                if present:
+                    rules = rules.extend_with(rel_dir, [
+                        IgnoreFile.parse(read_text(posixpath.join(rel_dir, name)) or '') for name in present
+                    ])
+
+            for subdir in subdirs:
+                if posixpath.basename(subdir) in self.skip_dirs:
+                    continue
+                if rules.levels and rules.ignored(subdir, True):
+                    ignored += 1
+                    continue
+                stack.append((subdir, rules))
+
+            for path in files:
+                if rules.levels and rules.ignored(path, False):
+                    ignored += 1
+                    continue
+                kept.append(path)
+
+        return kept, total_dirs, ignored
+
+    def map(self, func: Callable[..., Any], items: list[Any]) -> list[Any]:
+        """Apply func to every item on the walker's pool, preserving order."""
+        if self.max_workers == 1 or len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(func, items))
+
+    def _scan_dir(
+        self,
+        dir_path: str,
+        rel_dir: str,
+        rules: IgnoreRules,
+        on_file: Callable[[os.DirEntry, str], Any],
+    ) -> tuple[list[tuple[str, str, IgnoreRules]], list[Any], int]:
+        """Scan a single directory, returning its subdirectories, file results and pruned count."""
+        subdirs = []
+        file_results = []
+        pruned = 0
+
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            # Match os.walk, which silently skips unreadable directories
+            return subdirs, file_results, pruned
+
+        if self.ignore_files:
+            names = {entry.name for entry in entries}
+            present = [name for name in self.ignore_files if name in names]
+            if present:
+                rules = rules.extend(dir_path, rel_dir, present)
+
+        for entry in entries:
+            rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir and entry.name in self.skip_dirs:
+                continue
+            if rules.levels and rules.ignored(rel_path, is_dir):
+                pruned += 1
+                continue
+
+            if is_dir:
+                # Like os.walk(followlinks=False): symlinked dirs are neither files nor walked
+                if not entry.is_symlink():
+                    subdirs.append((entry.path, rel_path, rules))
+                continue
+
+            result = on_file(entry, rel_path)
+            if result is not None:
+                file_results.append(result)
+
+        return subdirs, file_results, pruned
+
+
+def default_worker_count() -> int:
+    """Default pool size for I/O-bound analysis work."""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def resolve_worker_count(configured: Optional[int]) -> int:
+    """Resolve a configured worker count, where 0 or None means automatic."""
+    if not configured:
+        return default_worker_count()
+    return max(1, configured)
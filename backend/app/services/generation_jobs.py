@@ -0,0 +1,319 @@
+import os
+import uuid
+import asyncio
+import socket
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Document, GenerationJob, GenerationJobSection
+from app.services.document_generator import DocumentGenerator
+
+
+class GenerationEvents:
+    """In-process fan-out of running jobs' progress events to their subscribers.
+
+    The text streamed so far for each running section is kept, so a subscriber
+    that connects mid-section can catch up.
+    """
+
+    QUEUE_SIZE = 1000
+
+    def __init__(self):
+        self._subscribers: dict[uuid.UUID, set[asyncio.Queue]] = {}
+        self._partial: dict[uuid.UUID, dict[str, list[str]]] = {}
+
+    def subscribe(self, job_id: uuid.UUID) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: uuid.UUID, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    def partial(self, job_id: uuid.UUID) -> dict[str, str]:
+        """Text streamed so far for each running section (document section id -> text)."""
+        return {section_id: "".join(parts) for section_id, parts in self._partial.get(job_id, {}).items()}
+
+    def publish(self, job_id: uuid.UUID, event: str, data: dict[str, Any]) -> None:
+        partial = self._partial.setdefault(job_id, {})
+        if event == "delta":
+            partial.setdefault(data["document_section_id"], []).append(data["text"])
+        elif event == "section_completed":
+            partial.pop(data["document_section_id"], None)
+        elif event == "job":
+            self._partial.pop(job_id, None)
+
+        for queue in self._subscribers.get(job_id, ()):
+            try:
+                queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                # A stalled client misses events; section_completed carries the full text
+                pass
+
+
+class GenerationJobManager:
+    """Runs document generation jobs as background tasks of the API process.
+
+    Jobs and per-section state live in the database, so progress can be read
+    from any process and work survives a restart. A process claims a job by
+    writing its worker id and keeps a heartbeat while running it; jobs that are
+    unclaimed (queued, or released on shutdown) or whose heartbeat is older
+    than settings.generation_job_lease_seconds are picked up by the periodic
+    sweep, and resume from their unfinished sections.
+
+    Progress events of the jobs running here (including streamed text) are
+    published on self.events.
+    """
+
+    # Idle time after which an event stream sends a keep-alive and rechecks the job
+    EVENT_KEEPALIVE_SECONDS = 15
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.events = GenerationEvents()
+        self._tasks: dict[uuid.UUID, asyncio.Task] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self) -> None:
+        """Begin sweeping for queued and abandoned jobs (called at application startup)."""
+        self._stopping = False
+        self._sweeper = asyncio.create_task(self._sweep())
+
+    async def shutdown(self) -> None:
+        """Stop running jobs and release them so the next process resumes them at once."""
+        self._stopping = True
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def create_job(self, db: Session, document: Document, user_id: uuid.UUID, fresh: bool = False) -> GenerationJob:
+        """Queue a generation job for a document's included sections (fresh bypasses the LLM response cache).
+
+        Returns the document's active job instead if one is already queued or running.
+        """
+        active = (
+            db.query(GenerationJob)
+            .filter(
+                GenerationJob.document_id == document.id,
+                GenerationJob.status.in_(GenerationJob.ACTIVE_STATUSES),
+            )
+            .first()
+        )
+        if active:
+            return active
+
+        job = GenerationJob(document_id=document.id, user_id=user_id, status="queued", fresh=fresh)
+        job.sections = [
+            GenerationJobSection(
+                document_section_id=section.id,
+                title=section.title,
+                display_order=section.display_order,
+                status="queued",
+            )
+            for section in document.sections if section.is_included
+        ]
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+
+    def submit(self, job_id: uuid.UUID) -> bool:
+        """Start a job in this process if it can be claimed.
+
+        Returns:
+            bool: True if this process is now running the job
+        """
+        if job_id in self._tasks or self._stopping:
+            return False
+        if not self._claim(job_id):
+            return False
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+        return True
+
+    def cancel(self, db: Session, job: GenerationJob) -> GenerationJob:
+        """Cancel an active job; sections not yet finished are marked cancelled."""
+        now = datetime.utcnow()
+        job.status = "cancelled"
+        job.finished_at = now
+        for job_section in job.sections:
+            if job_section.status not in GenerationJobSection.FINISHED_STATUSES:
+                job_section.status = "cancelled"
+                job_section.finished_at = now
+        job.document.status = "draft"
+        db.commit()
+        self.events.publish(job.id, "job", {"status": job.status, "error": job.error})
+
+        # A job running in another process stops at that process's next heartbeat
+        task = self._tasks.get(job.id)
+        if task is not None:
+            task.cancel()
+        db.refresh(job)
+        return job
+
+    async def stream_events(self, job_id: uuid.UUID, queue: asyncio.Queue) -> AsyncIterator[Optional[tuple[str, Any]]]:
+        """Yield a subscribed job's events until it finishes; None is a keep-alive.
+
+        Subscribe before reading the job's state, so nothing is missed between the two.
+        A job running in another process publishes nothing here: the stream then only
+        reports the job's end, found when it rechecks the job after a quiet spell.
+        """
+        try:
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=self.EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    job_status, error = self._status(job_id)
+                    if job_status not in GenerationJob.ACTIVE_STATUSES:
+                        yield "job", {"status": job_status, "error": error}
+                        return
+                    yield None
+                    continue
+                yield event, data
+                if event == "job":
+                    return
+        finally:
+            self.events.unsubscribe(job_id, queue)
+
+    def resume(self) -> int:
+        """Claim and start every queued or abandoned job.
+
+        Returns:
+            int: Number of jobs started
+        """
+        db = SessionLocal()
+        try:
+            job_ids = [
+                job_id for (job_id,) in
+                db.query(GenerationJob.id)
+                .filter(GenerationJob.status.in_(GenerationJob.ACTIVE_STATUSES))
+                .order_by(GenerationJob.created_at)
+            ]
+        finally:
+            db.close()
+        return sum(1 for job_id in job_ids if self.submit(job_id))
+
+    def _status(self, job_id: uuid.UUID) -> tuple[Optional[str], Optional[str]]:
+        db = SessionLocal()
+        try:
+            row = db.query(GenerationJob.status, GenerationJob.error).filter(GenerationJob.id == job_id).first()
+            return (row.status, row.error) if row else (None, None)
+        finally:
+            db.close()
+
+    def _claim(self, job_id: uuid.UUID) -> bool:
+        stale = datetime.utcnow() - timedelta(seconds=settings.generation_job_lease_seconds)
+        db = SessionLocal()
+        try:
+            claimed = (
+                db.query(GenerationJob)
+                .filter(
+                    GenerationJob.id == job_id,
+                    GenerationJob.status.in_(GenerationJob.ACTIVE_STATUSES),
+                    or_(
+                        GenerationJob.worker_id.is_(None),
+                        GenerationJob.worker_id == self.worker_id,
+                        GenerationJob.heartbeat_at < stale,
+                    ),
+                )
+                .update(
+                    {"worker_id": self.worker_id, "heartbeat_at": datetime.utcnow()},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return claimed == 1
+        finally:
+            db.close()
+
+    async def _run(self, job_id: uuid.UUID) -> None:
+        db = SessionLocal()
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, asyncio.current_task()))
+        try:
+            job = db.get(GenerationJob, job_id)
+            if job is not None:
+                await DocumentGenerator(db).run_job(
+                    job, publish=lambda event, data: self.events.publish(job_id, event, data)
+                )
+        except asyncio.CancelledError:
+            db.rollback()
+            if self._stopping:
+                self._release(job_id)
+        except Exception as e:
+            print(f"Generation job {job_id} failed: {e}")
+        finally:
+            heartbeat.cancel()
+            db.close()
+
+    async def _heartbeat(self, job_id: uuid.UUID, runner: asyncio.Task) -> None:
+        """Keep the claim alive; stop the runner if the job was cancelled or claimed elsewhere."""
+        interval = max(1, settings.generation_job_lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            db = SessionLocal()
+            try:
+                kept = (
+                    db.query(GenerationJob)
+                    .filter(
+                        GenerationJob.id == job_id,
+                        GenerationJob.status.in_(GenerationJob.ACTIVE_STATUSES),
+                        GenerationJob.worker_id == self.worker_id,
+                    )
+                    .update({"heartbeat_at": datetime.utcnow()}, synchronize_session=False)
+                )
+                db.commit()
+            finally:
+                db.close()
+            if not kept:
+                runner.cancel()
+                return
+
+    def _release(self, job_id: uuid.UUID) -> None:
+        db = SessionLocal()
+        try:
+            db.query(GenerationJob).filter(
+                GenerationJob.id == job_id,
+                GenerationJob.worker_id == self.worker_id,
+            ).update({"worker_id": None, "heartbeat_at": None}, synchronize_session=False)
+            db.query(GenerationJobSection).filter(
+                GenerationJobSection.job_id == job_id,
+                GenerationJobSection.status == "running",
+            ).update({"status": "queued", "started_at": None}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    async def _sweep(self) -> None:
+        interval = max(1, settings.generation_job_lease_seconds / 2)
+        while True:
+            try:
+                started = self.resume()
+                if started:
+                    print(f"Generation jobs: resumed {started} job(s)")
+            except Exception as e:
+                print(f"Generation job sweep failed: {e}")
+            await asyncio.sleep(interval)
+
+
+# Singleton instance
+_manager: Optional[GenerationJobManager] = None
+
+
+def get_generation_jobs() -> GenerationJobManager:
+    """Get or create the generation job manager singleton."""
+    global _manager
+    if _manager is None:
+        _manager = GenerationJobManager()
+    return _manager
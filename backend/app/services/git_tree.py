@@ -0,0 +1,112 @@
+import os
+import subprocess
+import threading
+from typing import Iterable, Iterator, Optional
+
+
+class GitTree:
+    """Reads a repository's file listing and blob contents from its object database.
+
+    The listing comes from a single `git ls-tree -r -l` (path, blob SHA and size
+    from the object headers), and contents are streamed from one long-lived
+    `git cat-file --batch` process, so no working-tree file is ever stat'ed or
+    opened. This also works on bare, blobless or sparse clones.
+    """
+
+    # Regular and executable files; symlinks (120000) and submodules are left out
+    FILE_MODES = {'100644', '100755'}
+
+    def __init__(self, repo_path: str, rev: str = "HEAD"):
+        self.repo_path = repo_path
+        self.rev = rev
+
+    @staticmethod
+    def is_repository(path: str) -> bool:
+        """Whether path is a git checkout (or bare repository) with a resolvable HEAD."""
+        if not os.path.exists(os.path.join(path, '.git')) and not os.path.exists(os.path.join(path, 'HEAD')):
+            return False
+        result = subprocess.run(
+            ['git', '-C', path, 'rev-parse', '--verify', '--quiet', 'HEAD^{tree}'],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        return result.returncode == 0
+
+    def list_files(self) -> list[tuple[str, str, int]]:
+        """Every file in the tree.
+
+        Returns:
+            list: (path, blob SHA, size) per file
+        """
+        result = subprocess.run(
+            ['git', '-C', self.repo_path, 'ls-tree', '-r', '-l', '-z', '--full-tree', self.rev],
+            capture_output=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git ls-tree failed: {result.stderr.decode(errors='ignore').strip()}")
+
+        files = []
+        for entry in result.stdout.split(b'\0'):
+            if not entry:
+                continue
+            meta, path = entry.split(b'\t', 1)
+            mode, obj_type, sha, size = meta.split()
+            if obj_type != b'blob' or mode.decode() not in self.FILE_MODES:
+                continue
+            files.append((path.decode('utf-8', errors='surrogateescape'), sha.decode(), int(size)))
+        return files
+
+    def changed_paths(self, old_rev: str, new_rev: str) -> set[str]:
+        """Paths added, modified or deleted between two commits (renames as delete + add)."""
+        result = subprocess.run(
+            ['git', '-C', self.repo_path, 'diff', '--name-only', '--no-renames', '-z', old_rev, new_rev],
+            capture_output=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git diff failed: {result.stderr.decode(errors='ignore').strip()}")
+        return {
+            path.decode('utf-8', errors='surrogateescape')
+            for path in result.stdout.split(b'\0') if path
+        }
+
+    def read_blobs(self, shas: Iterable[str]) -> Iterator[tuple[str, Optional[bytes]]]:
+        """Stream blob contents in request order; missing objects yield None."""
+        proc = subprocess.Popen(
+            ['git', '-C', self.repo_path, 'cat-file', '--batch'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+        shas = list(shas)
+
+        def feed() -> None:
+            # Written from a thread so a full stdout pipe can't deadlock the request stream
+            try:
+                for sha in shas:
+                    proc.stdin.write(f"{sha}\n".encode())
+                proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        try:
+            for _ in shas:
+                header = proc.stdout.readline().split()
+                if len(header) != 3:
+                    # "<sha> missing" (or a dead process)
+                    yield (header[0].decode() if header else ''), None
+                    continue
+                size = int(header[2])
+                data = proc.stdout.read(size)
+                proc.stdout.read(1)  # Trailing newline
+                yield header[0].decode(), data
+        finally:
+            proc.stdout.close()
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            writer.join()
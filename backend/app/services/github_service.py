@@ -1,12 +1,24 @@
 import os
 import re
-from typing import Any
-from git import Repo
+import time
+import fcntl
+import hashlib
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+from git import Git, Repo
 from app.config import settings
+from app.services.analysis_cache import AnalysisCache
 
 
 class GitHubService:
-    """Service for interacting with GitHub repositories."""
+    """Service for interacting with GitHub repositories.
+
+    With settings.git_mirror_dir set, every repository URL gets one local bare
+    mirror that is brought up to date with `git fetch`. Project checkouts are
+    detached worktrees of it, so a repeated import copies no objects and only
+    touches the network when the mirror is older than
+    settings.git_mirror_ttl_seconds.
+    """
 
     def __init__(self):
         self.token = settings.github_token
@@ -29,6 +41,101 @@ class GitHubService:
 
         raise ValueError(f"Invalid GitHub URL: {url}")
 
+    def _authenticated_url(self, url: str) -> str:
+        """Clone URL with the token inserted, if one is configured."""
+        if self.token and 'https://' in url:
+            return url.replace('https://', f'https://{self.token}@')
+        return url
+
+    def mirror_path(self, url: str) -> str:
+        """Local bare mirror directory for a repository URL."""
+        normalized = AnalysisCache.normalize_url(url)
+        name = re.sub(r'[^A-Za-z0-9._-]+', '_', normalized.split('/', 1)[-1])
+        digest = hashlib.sha256(normalized.encode()).hexdigest()[:12]
+        return os.path.join(settings.git_mirror_dir, f"{name}-{digest}.git")
+
+    @contextmanager
+    def _mirror_lock(self, mirror_path: str) -> Iterator[None]:
+        """Exclusive lock on one mirror, across threads and worker processes."""
+        os.makedirs(os.path.dirname(mirror_path), exist_ok=True)
+        with open(f"{mirror_path}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def update_mirror(self, url: str, max_age: Optional[int] = None) -> tuple[str, str]:
+        """Create or fetch the bare mirror for a repository.
+
+        Only the default branch is fetched (at settings.git_clone_depth, 0 for
+        full history). The token is passed per fetch and never written to the
+        mirror's config.
+
+        Args:
+            max_age: Skip the fetch if the mirror was fetched this many seconds ago
+                (default settings.git_mirror_ttl_seconds; 0 always fetches)
+
+        Returns:
+            tuple: (mirror path, default branch)
+        """
+        mirror_path = self.mirror_path(url)
+        fetch_url = self._authenticated_url(url)
+        if max_age is None:
+            max_age = settings.git_mirror_ttl_seconds
+
+        with self._mirror_lock(mirror_path):
+            if os.path.isdir(mirror_path):
+                mirror = Repo(mirror_path)
+            else:
+                mirror = Repo.init(mirror_path, bare=True)
+                mirror.git.config('remote.origin.url', url)
+                # Worktrees keep their objects here, so the mirror must never prune them
+                mirror.git.config('gc.auto', '0')
+
+            fetched_at = os.path.join(mirror_path, 'FETCH_HEAD')
+            is_fresh = (
+                os.path.exists(fetched_at)
+                and time.time() - os.path.getmtime(fetched_at) < max_age
+            )
+            if is_fresh:
+                branch = mirror.git.symbolic_ref('--short', 'HEAD')
+                return mirror_path, branch
+
+            branch = self._default_branch(fetch_url)
+            fetch_args = ['--prune', '--no-tags']
+            if settings.git_clone_depth:
+                fetch_args.append(f'--depth={settings.git_clone_depth}')
+            mirror.git.fetch(*fetch_args, fetch_url, f'+refs/heads/{branch}:refs/heads/{branch}')
+            mirror.git.symbolic_ref('HEAD', f'refs/heads/{branch}')
+
+        return mirror_path, branch
+
+    def add_worktree(self, url: str, destination: str) -> tuple[Repo, str]:
+        """Check out the mirror's current default-branch commit as a worktree at destination.
+
+        The worktree is detached (so any number of projects can share a commit)
+        and keeps all objects in the mirror.
+
+        Returns:
+            tuple: (checkout repo, default branch)
+        """
+        mirror_path, branch = self.update_mirror(url)
+        with self._mirror_lock(mirror_path):
+            mirror = Repo(mirror_path)
+            # Forget worktrees whose project directories were deleted
+            mirror.git.worktree('prune')
+            mirror.git.worktree('add', '--detach', destination, f'refs/heads/{branch}')
+        return Repo(destination), branch
+
+    def _default_branch(self, url: str) -> str:
+        """The remote's default branch, from its HEAD symref."""
+        output = Git().ls_remote('--symref', url, 'HEAD')
+        match = re.search(r'^ref: refs/heads/(\S+)\s+HEAD', output, re.MULTILINE)
+        if not match:
+            raise RuntimeError("Could not determine the repository's default branch")
+        return match.group(1)
+
     def clone_repository(self, url: str, destination: str) -> dict[str, Any]:
         """Clone a GitHub repository to the specified destination."""
         parsed = self.parse_github_url(url)
@@ -36,33 +143,58 @@ class GitHubService:
         # Create destination directory
         os.makedirs(destination, exist_ok=True)
 
-        # Prepare clone URL with token if available
-        clone_url = url
-        if self.token and 'https://' in url:
-            # Insert token for authentication
-            clone_url = url.replace('https://', f'https://{self.token}@')
-
         try:
-            # Clone with depth=1 for faster cloning (shallow clone)
-            repo = Repo.clone_from(
-                clone_url,
-                destination,
-                depth=1,
-                single_branch=True,
-            )
+            if settings.git_mirror_dir:
+                repo, branch = self.add_worktree(url, destination)
+            else:
+                # Clone with depth=1 for faster cloning (shallow clone)
+                repo = Repo.clone_from(
+                    self._authenticated_url(url),
+                    destination,
+                    depth=1,
+                    single_branch=True,
+                )
 
             # Get repository info
             return {
                 'name': parsed['repo'],
                 'owner': parsed['owner'],
                 'description': '',  # Would need GitHub API for this
-                'default_branch': repo.active_branch.name,
+                'default_branch': branch if settings.git_mirror_dir else repo.active_branch.name,
+                'commit_sha': repo.head.commit.hexsha,
                 'clone_path': destination,
             }
 
         except Exception as e:
             raise RuntimeError(f"Failed to clone repository: {str(e)}")
 
+    def update_checkout(self, url: str, destination: str) -> dict[str, Any]:
+        """Move an existing project checkout to the remote's latest default-branch commit.
+
+        Worktrees of a mirror fetch into the mirror; direct clones fetch in place.
+
+        Returns:
+            dict: {"commit_sha", "default_branch"}
+        """
+        repo = Repo(destination)
+        try:
+            if settings.git_mirror_dir and os.path.isfile(os.path.join(destination, '.git')):
+                _, branch = self.update_mirror(url, max_age=0)
+                target = f'refs/heads/{branch}'
+            else:
+                fetch_url = self._authenticated_url(url)
+                branch = self._default_branch(fetch_url)
+                fetch_args = ['--no-tags']
+                if settings.git_clone_depth:
+                    fetch_args.append(f'--depth={settings.git_clone_depth}')
+                repo.git.fetch(*fetch_args, fetch_url, branch)
+                target = 'FETCH_HEAD'
+            repo.git.checkout('--force', '--detach', target)
+        except Exception as e:
+            raise RuntimeError(f"Failed to update repository: {str(e)}")
+
+        return {'commit_sha': repo.head.commit.hexsha, 'default_branch': branch}
+
     def get_repository_info(self, url: str) -> dict[str, Any]:
         """Get repository information from GitHub API."""
         # This would use PyGithub for more detailed info
@@ -0,0 +1,140 @@
+import os
+import re
+from typing import Optional
+
+
+class IgnoreFile:
+    """Compiled patterns from one ignore file, in gitignore syntax.
+
+    Every pattern becomes a regex over paths relative to the file's directory.
+    A combined alternation of all patterns is tried first, so most paths are
+    rejected with a single regex search; only hits are resolved pattern by
+    pattern (last match wins, "!" re-includes).
+    """
+
+    def __init__(self, patterns: list[tuple[re.Pattern, bool, bool]]):
+        self.patterns = patterns  # (regex, negated, dir_only), in file order
+        self.any = re.compile('|'.join(f'(?:{regex.pattern})' for regex, _, _ in patterns))
+
+    @classmethod
+    def parse(cls, text: str) -> Optional["IgnoreFile"]:
+        """Compile an ignore file's text, or None if it has no patterns."""
+        patterns = []
+        for line in text.splitlines():
+            compiled = cls._compile_line(line)
+            if compiled is not None:
+                patterns.append(compiled)
+        return cls(patterns) if patterns else None
+
+    @classmethod
+    def read(cls, file_path: str) -> Optional["IgnoreFile"]:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                return cls.parse(f.read())
+        except OSError:
+            return None
+
+    @classmethod
+    def _compile_line(cls, line: str) -> Optional[tuple[re.Pattern, bool, bool]]:
+        if not line.endswith('\\ '):
+            line = line.rstrip()
+        if not line or line.startswith('#'):
+            return None
+
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        elif line.startswith('\\'):
+            line = line[1:]  # Escaped leading "#" or "!"
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        # A leading or middle slash anchors the pattern to the ignore file's directory
+        anchored = '/' in line
+        line = line.lstrip('/')
+        if not line:
+            return None
+
+        body = cls._translate(line)
+        regex = f'^{body}$' if anchored else f'^(?:.*/)?{body}$'
+        return re.compile(regex), negated, dir_only
+
+    @staticmethod
+    def _translate(glob: str) -> str:
+        """gitignore glob -> regex body ("**" spans directories, "*" and "?" don't)."""
+        out = []
+        i, n = 0, len(glob)
+        while i < n:
+            if glob.startswith('**/', i):
+                out.append('(?:.*/)?')
+                i += 3
+            elif glob.startswith('/**', i) and i + 3 == n:
+                out.append('/.*')
+                i += 3
+            elif glob.startswith('**', i):
+                out.append('.*')
+                i += 2
+            elif glob[i] == '*':
+                out.append('[^/]*')
+                i += 1
+            elif glob[i] == '?':
+                out.append('[^/]')
+                i += 1
+            elif glob[i] == '[':
+                end = glob.find(']', i + 2)
+                if end == -1:
+                    out.append(re.escape('['))
+                    i += 1
+                    continue
+                chars = glob[i + 1:end]
+                if chars[0] in '!^':
+                    chars = '^' + chars[1:]
+                out.append('[' + chars.replace('\\', '\\\\') + ']')
+                i = end + 1
+            elif glob[i] == '\\' and i + 1 < n:
+                out.append(re.escape(glob[i + 1]))
+                i += 2
+            else:
+                out.append(re.escape(glob[i]))
+                i += 1
+        return ''.join(out)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included, None if no pattern applies."""
+        if not self.any.search(rel_path):
+            return None
+        for regex, negated, dir_only in reversed(self.patterns):
+            if dir_only and not is_dir:
+                continue
+            if regex.search(rel_path):
+                return not negated
+        return None
+
+
+class IgnoreRules:
+    """The ignore files in effect for one directory of a walk.
+
+    Rules are immutable and shared by every directory below the one that added
+    them, so walker threads can hand them down without copying. Deeper ignore
+    files take precedence over shallower ones, as in git.
+    """
+
+    def __init__(self, levels: tuple[tuple[str, IgnoreFile], ...] = ()):
+        self.levels = levels  # (directory relative to the walk root, rules), shallowest first
+
+    def extend(self, dir_path: str, rel_dir: str, file_names: list[str]) -> "IgnoreRules":
+        """Rules for dir_path: these plus any of its ignore files."""
+        return self.extend_with(rel_dir, [IgnoreFile.read(os.path.join(dir_path, name)) for name in file_names])
+
+    def extend_with(self, rel_dir: str, ignore_files: list[Optional[IgnoreFile]]) -> "IgnoreRules":
+        """Rules for rel_dir given its already-parsed ignore files (None entries are skipped)."""
+        added = tuple((rel_dir, ignore_file) for ignore_file in ignore_files if ignore_file is not None)
+        return IgnoreRules(self.levels + added) if added else self
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        for rel_dir, ignore_file in reversed(self.levels):
+            path = rel_path[len(rel_dir) + 1:] if rel_dir else rel_path
+            result = ignore_file.match(path, is_dir)
+            if result is not None:
+                return result
+        return False
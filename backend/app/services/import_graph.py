@@ -0,0 +1,190 @@
+import posixpath
+from typing import Any, Optional
+import numpy as np
+from app.services.path_index import IndexFileCache, read_index_file, write_index_file
+
+
+class ImportGraph:
+    """Intra-repository import graph with PageRank centrality per file.
+
+    Nodes are source files and an edge A -> B means A imports B, so rank flows
+    towards the modules everything else depends on. Python specifiers are
+    resolved against every dotted suffix of the repo's module paths (so both
+    "app.models" and "backend.app.models" work); JS/TS specifiers are resolved
+    relative to the importing file, plus the common "@/" alias for src/.
+    """
+
+    VERSION = 1
+
+    DAMPING = 0.85
+    TOLERANCE = 1e-8
+    MAX_ITERATIONS = 100
+
+    PYTHON_EXTENSIONS = ('.py',)
+    JS_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs')
+
+    def __init__(self, paths: list[str], edges: list[list[int]], scores: list[float]):
+        self.paths = paths
+        self.edges = edges  # [source id, target id]
+        self.scores = scores
+        self._score_map: Optional[dict[str, float]] = None
+
+    @classmethod
+    def build(cls, imports: dict[str, list[str]], paths: list[str]) -> "ImportGraph":
+        """Resolve raw import specifiers against the repo's files and rank them.
+
+        Args:
+            imports: path -> unresolved import specifiers (from the symbol index)
+            paths: All source paths that can be import targets
+        """
+        paths = sorted(set(paths) | set(imports))
+        ids = {path: i for i, path in enumerate(paths)}
+        modules = cls._python_modules(paths)
+
+        edges = set()
+        for path, specifiers in imports.items():
+            source = ids[path]
+            resolve = cls._resolve_python if path.endswith(cls.PYTHON_EXTENSIONS) else cls._resolve_js
+            for specifier in specifiers:
+                target = resolve(specifier, path, ids, modules)
+                if target is not None and target != source:
+                    edges.add((source, target))
+
+        edge_list = [list(edge) for edge in sorted(edges)]
+        return cls(paths, edge_list, cls.pagerank(len(paths), edge_list))
+
+    @classmethod
+    def pagerank(cls, n: int, edges: list[list[int]]) -> list[float]:
+        """PageRank by power iteration over edge arrays (O(edges) per step).
+
+        Rank from files with no outgoing imports is spread uniformly, so scores
+        always sum to 1.
+        """
+        if n == 0:
+            return []
+        if not edges:
+            return [1.0 / n] * n
+
+        src, dst = np.asarray(edges, dtype=np.int64).T
+        out_degree = np.bincount(src, minlength=n).astype(np.float64)
+        edge_weight = 1.0 / out_degree[src]
+        dangling = out_degree == 0
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(cls.MAX_ITERATIONS):
+            flow = np.bincount(dst, weights=rank[src] * edge_weight, minlength=n)
+            new_rank = (1.0 - cls.DAMPING) / n + cls.DAMPING * (flow + rank[dangling].sum() / n)
+            converged = np.abs(new_rank - rank).sum() < cls.TOLERANCE
+            rank = new_rank
+            if converged:
+                break
+
+        return rank.tolist()
+
+    @classmethod
+    def _python_modules(cls, paths: list[str]) -> dict[str, list[str]]:
+        """Every dotted suffix of each Python file's module name -> candidate paths."""
+        modules: dict[str, list[str]] = {}
+        for path in paths:
+            if not path.endswith(cls.PYTHON_EXTENSIONS):
+                continue
+            parts = path[:-3].split('/')
+            if parts[-1] == '__init__':
+                parts = parts[:-1]
+            for i in range(len(parts)):
+                modules.setdefault('.'.join(parts[i:]), []).append(path)
+        return modules
+
+    @classmethod
+    def _resolve_python(
+        cls,
+        specifier: str,
+        importer: str,
+        ids: dict[str, int],
+        modules: dict[str, list[str]],
+    ) -> Optional[int]:
+        level = len(specifier) - len(specifier.lstrip('.'))
+        name = specifier[level:]
+
+        if level:
+            # Relative import: walk up from the importer's package
+            package = importer.split('/')[:-1]
+            if level > 1:
+                package = package[:-(level - 1)] if level - 1 <= len(package) else []
+            base = '/'.join(package + (name.split('.') if name else []))
+            for candidate in (f"{base}.py", f"{base}/__init__.py"):
+                if candidate in ids:
+                    return ids[candidate]
+            return None
+
+        candidates = modules.get(name)
+        if not candidates:
+            return None
+        if len(candidates) > 1:
+            # Prefer the candidate sharing the longest directory prefix with the importer
+            candidates = sorted(candidates, key=lambda c: -len(posixpath.commonpath([c, importer]) or ''))
+        return ids[candidates[0]]
+
+    @classmethod
+    def _resolve_js(
+        cls,
+        specifier: str,
+        importer: str,
+        ids: dict[str, int],
+        modules: dict[str, list[str]],
+    ) -> Optional[int]:
+        if specifier.startswith('.'):
+            base = posixpath.normpath(posixpath.join(posixpath.dirname(importer), specifier))
+        elif specifier.startswith('@/'):
+            parts = importer.split('/')
+            if 'src' not in parts[:-1]:
+                return None
+            root = '/'.join(parts[:len(parts) - 1 - parts[:-1][::-1].index('src')])
+            base = posixpath.join(root, specifier[2:])
+        else:
+            return None  # Package import
+
+        if base in ids:
+            return ids[base]
+        for ext in cls.JS_EXTENSIONS:
+            for candidate in (f"{base}{ext}", f"{base}/index{ext}"):
+                if candidate in ids:
+                    return ids[candidate]
+        return None
+
+    def score_map(self) -> dict[str, float]:
+        """path -> centrality score."""
+        if self._score_map is None:
+            self._score_map = dict(zip(self.paths, self.scores))
+        return self._score_map
+
+    def top(self, limit: int = 10) -> list[tuple[str, float]]:
+        """Most central files, best first."""
+        order = sorted(range(len(self.paths)), key=lambda i: (-self.scores[i], self.paths[i]))
+        return [(self.paths[i], self.scores[i]) for i in order[:limit]]
+
+    def summary(self) -> dict[str, Any]:
+        """Graph size for analysis_data."""
+        return {"nodes": len(self.paths), "edges": len(self.edges)}
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"version": self.VERSION, "paths": self.paths, "edges": self.edges, "scores": self.scores}
+
+    def save(self, file_path: str) -> None:
+        """Write the graph atomically."""
+        write_index_file(file_path, self.to_dict())
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional["ImportGraph"]:
+        """Load a graph, reusing the in-process copy while the file is unchanged."""
+        return _graph_cache.get(file_path, cls._read)
+
+    @classmethod
+    def _read(cls, file_path: str) -> Optional["ImportGraph"]:
+        data = read_index_file(file_path, cls.VERSION)
+        if data is None:
+            return None
+        return cls(paths=data["paths"], edges=data["edges"], scores=data["scores"])
+
+
+_graph_cache = IndexFileCache(max_entries=8)
@@ -0,0 +1,258 @@
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Project, ProjectFile
+from app.services.blob_cache import BlobCache
+from app.services.code_analyzer import CodeAnalyzer
+from app.services.git_tree import GitTree
+
+
+class IncrementalAnalyzer:
+    """Re-analyzes a project using its persisted file manifest.
+
+    The manifest (one ProjectFile row per file) records size, mtime and content
+    hash, and doubles as the project's file listing - analysis_data itself only
+    keeps summary stats. On refresh the tree is re-scanned for stat information
+    only, and just the files whose size or mtime moved are re-read. Their old and
+    new records are then applied to the previous analysis as deltas.
+
+    GitHub clones are listed from git instead (see CodeAnalyzer.scan_git): blob
+    SHAs stand in for mtimes, and only files whose SHA changed and whose
+    measurements aren't already in the cross-project BlobCache are read.
+    """
+
+    # Maximum number of paths listed per change type in the response
+    MAX_CHANGE_PATHS = 100
+
+    # Manifest rows are written in batches to keep statements bounded
+    BATCH_SIZE = 1000
+
+    def __init__(self, db: Session, analyzer: Optional[CodeAnalyzer] = None):
+        self.db = db
+        self.analyzer = analyzer or CodeAnalyzer()
+
+    def analyze_project(
+        self,
+        project: Project,
+        code_path: str,
+        changed_paths: Optional[set[str]] = None,
+    ) -> dict[str, Any]:
+        """Analyze a project, incrementally when a manifest exists.
+
+        Args:
+            changed_paths: Paths known to differ since the last analysis (e.g. from a
+                git diff). When given, only these and paths missing from the manifest
+                are re-read, instead of every file whose size or mtime/SHA moved.
+
+        Returns:
+            dict: analysis_data including a "changes" summary since the last analysis
+        """
+        path = Path(code_path)
+        if not path.exists():
+            raise ValueError(f"Path does not exist: {path}")
+
+        manifest = {
+            row.path: row
+            for row in self.db.query(ProjectFile).filter(ProjectFile.project_id == project.id)
+        }
+        previous = project.analysis_data if manifest else None
+        if previous and ("sloc" in previous.get("structure", {})) != self.analyzer.line_counter.sloc:
+            # SLOC setting changed since the last run - totals can't be patched
+            previous = None
+        if previous and "skipped_bytes" not in previous.get("structure", {}):
+            # Analyzed before files were classified - reclassify everything once
+            previous = None
+
+        git_native = (
+            settings.analyzer_git_native
+            and project.source_type == "github"
+            and GitTree.is_repository(code_path)
+        )
+
+        # Stat-only pass over the tree (or its git listing)
+        if git_native:
+            scanned, total_dirs, ignored = self.analyzer.scan_git(code_path)
+        else:
+            scanned, total_dirs, ignored = self.analyzer.scan(code_path)
+        current = {record["path"]: record for record in scanned}
+
+        if previous is None:
+            # No usable baseline - read everything
+            to_read = scanned
+            removed_paths = list(manifest)
+        elif changed_paths is not None:
+            to_read = [record for p, record in current.items() if p not in manifest or p in changed_paths]
+            removed_paths = [p for p in manifest if p not in current]
+        else:
+            to_read = [
+                record for p, record in current.items()
+                if p not in manifest
+                or manifest[p].size != record["size"]
+                or (
+                    manifest[p].content_hash != record["content_hash"] if git_native
+                    else manifest[p].mtime != record["mtime"]
+                )
+            ]
+            removed_paths = [p for p in manifest if p not in current]
+
+        if git_native:
+            new_records = self.analyzer.read_git_files(code_path, to_read, cache=BlobCache())
+        else:
+            new_records = self.analyzer.read_files(code_path, to_read)
+
+        added, modified, touched = [], [], []
+        for record in new_records:
+            row = manifest.get(record["path"])
+            if row is None or previous is None:
+                added.append(record)
+            elif record["content_hash"] and record["content_hash"] == row.content_hash:
+                # Only the mtime moved; contents are identical
+                touched.append(record)
+            elif row.mtime is None and not record["content_hash"] and record["size"] == row.size:
+                # Seeded from the shared cache without an mtime; unread file, same size
+                touched.append(record)
+            else:
+                modified.append(record)
+
+        if previous is None:
+            analysis_data = self.analyzer.build_result(
+                path, list(added), total_dirs, with_file_tree=False, ignored_paths=ignored
+            )
+        else:
+            old_records = [self._row_to_record(manifest[r["path"]]) for r in modified]
+            old_records += [self._row_to_record(manifest[p]) for p in removed_paths]
+            analysis_data = self.analyzer.apply_changes(
+                path,
+                previous,
+                old_records,
+                added + modified,
+                total_dirs,
+                with_file_tree=False,
+                ignored_paths=ignored,
+            )
+
+        self._update_manifest(project, manifest, added, modified + touched, removed_paths)
+
+        analysis_data["analyzed_at"] = datetime.utcnow().isoformat()
+        analysis_data["changes"] = self._summarize_changes(
+            full=previous is None,
+            previous_at=(previous or {}).get("analyzed_at"),
+            added=[r["path"] for r in added],
+            modified=[r["path"] for r in modified],
+            removed=removed_paths if previous is not None else [],
+            unchanged=len(current) - len(added) - len(modified),
+        )
+
+        return analysis_data
+
+    def export_manifest(self, project: Project) -> list[dict[str, Any]]:
+        """Portable copy of a project's manifest, e.g. for the shared analysis cache."""
+        rows = (
+            self.db.query(ProjectFile)
+            .filter(ProjectFile.project_id == project.id)
+            .order_by(ProjectFile.path)
+        )
+        return [
+            {
+                "path": row.path,
+                "size": row.size,
+                "content_hash": row.content_hash,
+                "language": row.language,
+                "file_class": row.file_class,
+                "line_count": row.line_count,
+                "details": row.details,
+            }
+            for row in rows
+        ]
+
+    def seed_manifest(self, project: Project, files: list[dict[str, Any]]) -> None:
+        """Replace a project's manifest with exported entries (without committing).
+
+        mtimes are left empty, so the next refresh re-reads each file once and
+        recognizes unchanged contents by hash.
+        """
+        self.db.query(ProjectFile).filter(ProjectFile.project_id == project.id).delete(
+            synchronize_session=False
+        )
+        rows = [dict(entry, project_id=project.id, mtime=None) for entry in files]
+        for i in range(0, len(rows), self.BATCH_SIZE):
+            self.db.bulk_insert_mappings(ProjectFile, rows[i:i + self.BATCH_SIZE])
+
+    def _row_to_record(self, row: ProjectFile) -> dict[str, Any]:
+        """Rebuild an analyzer record from a manifest row."""
+        record = {
+            "path": row.path,
+            "name": os.path.basename(row.path),
+            "language": row.language,
+            "lines": row.line_count or 0,
+            "size": row.size,
+            "file_class": row.file_class,
+        }
+        if row.details and row.details.get("sloc"):
+            record["sloc"] = row.details["sloc"]
+        return record
+
+    def _record_to_row(self, project: Project, record: dict[str, Any]) -> dict[str, Any]:
+        """Column values for a manifest row."""
+        return {
+            "project_id": project.id,
+            "path": record["path"],
+            "size": record["size"],
+            "mtime": record["mtime"],
+            "content_hash": record["content_hash"],
+            "language": record["language"],
+            "file_class": record.get("file_class"),
+            "line_count": record["lines"],
+            "details": {"sloc": record["sloc"]} if record.get("sloc") else None,
+        }
+
+    def _update_manifest(
+        self,
+        project: Project,
+        manifest: dict[str, ProjectFile],
+        added: list[dict],
+        updated: list[dict],
+        removed_paths: list[str],
+    ) -> None:
+        """Persist manifest changes (without committing)."""
+        for i in range(0, len(removed_paths), self.BATCH_SIZE):
+            batch = removed_paths[i:i + self.BATCH_SIZE]
+            self.db.query(ProjectFile).filter(
+                ProjectFile.project_id == project.id,
+                ProjectFile.path.in_(batch),
+            ).delete(synchronize_session=False)
+
+        for record in updated:
+            row = manifest[record["path"]]
+            for key, value in self._record_to_row(project, record).items():
+                setattr(row, key, value)
+
+        new_rows = [self._record_to_row(project, record) for record in added]
+        for i in range(0, len(new_rows), self.BATCH_SIZE):
+            self.db.bulk_insert_mappings(ProjectFile, new_rows[i:i + self.BATCH_SIZE])
+
+    def _summarize_changes(
+        self,
+        full: bool,
+        previous_at: Optional[str],
+        added: list[str],
+        modified: list[str],
+        removed: list[str],
+        unchanged: int,
+    ) -> dict[str, Any]:
+        """Describe what changed since the previous analysis."""
+        limit = self.MAX_CHANGE_PATHS
+        return {
+            "full_analysis": full,
+            "since": previous_at,
+            "added": len(added),
+            "modified": len(modified),
+            "removed": len(removed),
+            "unchanged": unchanged,
+            "added_files": sorted(added)[:limit],
+            "modified_files": sorted(modified)[:limit],
+            "removed_files": sorted(removed)[:limit],
+        }
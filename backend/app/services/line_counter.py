@@ -0,0 +1,196 @@
+import mmap
+import re
+from typing import Any, BinaryIO, Iterable, Optional
+
+
+class LineCounter:
+    """Counts lines in source files without decoding them.
+
+    Files are read in fixed-size binary chunks (or memory-mapped when large) and
+    line endings (LF, CRLF or a lone CR) are counted directly. An optional SLOC
+    mode classifies each line as blank, comment or code using per-language
+    comment syntax.
+    """
+
+    CHUNK_SIZE = 1024 * 1024  # 1MB
+    MMAP_THRESHOLD = 16 * 1024 * 1024  # Memory-map files larger than 16MB
+
+    # Line endings, as in content_index.split_lines()
+    LINE_BREAK_RE = re.compile(rb'\r\n|\r|\n')
+
+    # Comment syntax per language: (line comment prefixes, block comment delimiters)
+    C_STYLE = (('//',), (('/*', '*/'),))
+    COMMENT_SYNTAX = {
+        'python': (('#',), (('"""', '"""'), ("'''", "'''"))),
+        'javascript': C_STYLE,
+        'typescript': C_STYLE,
+        'java': C_STYLE,
+        'go': C_STYLE,
+        'rust': C_STYLE,
+        'c': C_STYLE,
+        'cpp': C_STYLE,
+        'csharp': C_STYLE,
+        'swift': C_STYLE,
+        'kotlin': C_STYLE,
+        'scala': C_STYLE,
+        'php': (('//', '#'), (('/*', '*/'),)),
+        'ruby': (('#',), (('=begin', '=end'),)),
+        'shell': (('#',), ()),
+        'yaml': (('#',), ()),
+        'sql': (('--',), (('/*', '*/'),)),
+        'css': (('//',), (('/*', '*/'),)),
+        'html': ((), (('<!--', '-->'),)),
+        'xml': ((), (('<!--', '-->'),)),
+        'markdown': ((), (('<!--', '-->'),)),
+        'json': ((), ()),
+    }
+
+    def __init__(self, sloc: bool = False):
+        self.sloc = sloc
+        # Pre-encode comment syntax so classification works on raw bytes
+        self._syntax = {
+            lang: (
+                tuple(p.encode() for p in prefixes),
+                tuple((start.encode(), end.encode()) for start, end in blocks),
+            )
+            for lang, (prefixes, blocks) in self.COMMENT_SYNTAX.items()
+        }
+
+    def count_file(
+        self,
+        path: str,
+        language: Optional[str] = None,
+        size: Optional[int] = None,
+        hasher: Any = None,
+    ) -> dict[str, int]:
+        """Count lines in a file.
+
+        Args:
+            hasher: Optional hashlib object updated with every chunk read, so the
+                content hash comes from the same pass as the line count
+
+        Returns:
+            dict: {"lines": n} plus "blank", "comment" and "code" when SLOC mode is on
+        """
+        with open(path, 'rb') as f:
+            return self.count_stream(f, language, size, hasher)
+
+    def count_stream(
+        self,
+        f: BinaryIO,
+        language: Optional[str] = None,
+        size: Optional[int] = None,
+        hasher: Any = None,
+    ) -> dict[str, int]:
+        """Count lines in an open binary file (or archive member), as count_file() does."""
+        chunks = self._iter_chunks(f, size)
+        if hasher is not None:
+            chunks = self._hashed(chunks, hasher)
+        if self.sloc and language:
+            return self._count_sloc(chunks, language)
+        return {"lines": self._count_newlines(chunks)}
+
+    def count_bytes(self, data: bytes, language: Optional[str] = None) -> dict[str, int]:
+        """Count lines in an in-memory buffer."""
+        if self.sloc and language:
+            return self._count_sloc([data], language)
+        return {"lines": self._count_newlines([data])}
+
+    def _iter_chunks(self, f, size: Optional[int] = None) -> Iterable[bytes]:
+        """Yield a file's contents in fixed-size chunks."""
+        if size is not None and size >= self.MMAP_THRESHOLD:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for offset in range(0, len(mm), self.CHUNK_SIZE):
+                        yield mm[offset:offset + self.CHUNK_SIZE]
+                return
+            except (ValueError, OSError):
+                # Empty or unmappable file - fall back to buffered reads
+                f.seek(0)
+
+        while True:
+            chunk = f.read(self.CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    def _hashed(self, chunks: Iterable[bytes], hasher: Any) -> Iterable[bytes]:
+        """Pass chunks through while feeding them to a hasher."""
+        for chunk in chunks:
+            hasher.update(chunk)
+            yield chunk
+
+    def _count_newlines(self, chunks: Iterable[bytes]) -> int:
+        """Count lines as split_lines() does (LF, CRLF or lone CR); a trailing partial line counts."""
+        lines = 0
+        last = b''
+        for chunk in chunks:
+            if not chunk:
+                continue
+            lines += chunk.count(b'\n') + chunk.count(b'\r') - chunk.count(b'\r\n')
+            if last == b'\r' and chunk[:1] == b'\n':
+                # CRLF split across two chunks
+                lines -= 1
+            last = chunk[-1:]
+        if last and last not in (b'\n', b'\r'):
+            lines += 1
+        return lines
+
+    def _count_sloc(self, chunks: Iterable[bytes], language: str) -> dict[str, int]:
+        """Classify every line as blank, comment or code."""
+        prefixes, blocks = self._syntax.get(language, ((), ()))
+        counts = {"lines": 0, "blank": 0, "comment": 0, "code": 0}
+        block_end = None
+        remainder = b''
+
+        def classify(line: bytes) -> None:
+            nonlocal block_end
+            stripped = line.strip()
+            counts["lines"] += 1
+
+            if block_end is not None:
+                counts["comment"] += 1
+                if block_end in stripped:
+                    block_end = None
+                return
+
+            if not stripped:
+                counts["blank"] += 1
+                return
+
+            if prefixes and stripped.startswith(prefixes):
+                counts["comment"] += 1
+                return
+
+            for start, end in blocks:
+                if stripped.startswith(start):
+                    counts["comment"] += 1
+                    if end not in stripped[len(start):]:
+                        block_end = end
+                    return
+
+            counts["code"] += 1
+
+        for chunk in chunks:
+            data = remainder + chunk
+            if b'\r' not in data:
+                lines = data.split(b'\n')
+                remainder = lines.pop()
+            else:
+                # Hold back a trailing CR in case the next chunk starts with its LF
+                held = b'\r' if data.endswith(b'\r') else b''
+                lines = self.LINE_BREAK_RE.split(data[:len(data) - len(held)])
+                remainder = lines.pop() + held
+            for line in lines:
+                classify(line)
+
+        if remainder:
+            classify(remainder)
+
+        return counts
+
+
+def merge_sloc(total: dict[str, Any], counts: dict[str, int], sign: int = 1) -> None:
+    """Add (or with sign=-1, remove) one file's blank/comment/code counts in a running total."""
+    for key in ("blank", "comment", "code"):
+        total[key] = total.get(key, 0) + sign * counts.get(key, 0)
@@ -0,0 +1,299 @@
+import os
+import re
+import json
+import tempfile
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Callable, Iterable, Optional
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton that finds every pattern occurring in a text in one pass."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(dict.fromkeys(p for p in patterns if p))
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[set[int]] = [set()]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                state = nxt
+            self._out[state].add(index)
+
+        # Breadth-first pass to wire failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set[int]:
+        """Indices of all patterns that occur in text."""
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            if self._out[state]:
+                found |= self._out[state]
+        return found
+
+
+class PathIndex:
+    """Inverted index from path tokens to files, used to rank files for a section.
+
+    Each path contributes tokens of four kinds: its basename, its basename stem
+    (plus the stem's _/-/camelCase parts), its extension, and each directory
+    component. Patterns are matched as substrings against the token vocabulary
+    (not against every path) with a single automaton, and files are ranked by
+    the kinds of tokens their matches hit rather than by sort order.
+    """
+
+    VERSION = 1
+
+    # Token kinds and their score weights (basename hits are the strongest signal)
+    KIND_NAME, KIND_STEM, KIND_PART, KIND_EXT, KIND_DIR = range(5)
+    KIND_WEIGHTS = {
+        KIND_NAME: 3.0,
+        KIND_STEM: 3.0,
+        KIND_PART: 2.0,
+        KIND_EXT: 1.0,
+        KIND_DIR: 1.5,
+    }
+    EXACT_BONUS = 1.5  # Multiplier when a pattern equals the whole token
+
+    _CAMEL_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+    def __init__(self, paths: list[str], postings: dict[str, list[list[int]]]):
+        self.paths = paths
+        self.postings = postings
+
+    @classmethod
+    def build(cls, paths: list[str]) -> "PathIndex":
+        """Build an index over a list of relative paths."""
+        postings: dict[str, dict[int, int]] = {}
+
+        for file_id, path in enumerate(paths):
+            for token, kind in cls.tokenize(path):
+                kinds = postings.setdefault(token, {})
+                # Keep the strongest kind when a token appears twice in one path
+                if file_id not in kinds or cls.KIND_WEIGHTS[kind] > cls.KIND_WEIGHTS[kinds[file_id]]:
+                    kinds[file_id] = kind
+
+        return cls(
+            paths=list(paths),
+            postings={token: [[fid, kind] for fid, kind in files.items()] for token, files in postings.items()},
+        )
+
+    @classmethod
+    def tokenize(cls, path: str) -> list[tuple[str, int]]:
+        """Split a relative path into (token, kind) pairs."""
+        parts = path.replace('\\', '/').split('/')
+        name = parts[-1]
+        stem, ext = os.path.splitext(name)
+        if not stem:
+            # Dotfiles like ".env" have no extension
+            stem, ext = name, ''
+
+        tokens = [(name.lower(), cls.KIND_NAME), (stem.lower(), cls.KIND_STEM)]
+        if ext:
+            tokens.append((ext[1:].lower(), cls.KIND_EXT))
+        for piece in re.split(r'[_\-.\s]+', stem):
+            for part in cls._CAMEL_RE.findall(piece):
+                if part.lower() != stem.lower():
+                    tokens.append((part.lower(), cls.KIND_PART))
+        for directory in parts[:-1]:
+            if directory:
+                tokens.append((directory.lower(), cls.KIND_DIR))
+
+        return tokens
+
+    def search(
+        self,
+        patterns: list[str],
+        limit: int = 10,
+        extensions: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> list[str]:
+        """Rank files whose path tokens contain any of the patterns.
+
+        Args:
+            patterns: Substrings to look for (case-insensitive)
+            limit: Maximum number of paths to return
+            extensions: Optional allow-list of extensions (without dot)
+            exclude: Optional substrings; files whose tokens contain any are dropped
+        """
+        matcher = PatternMatcher(p.lower() for p in patterns)
+        if not matcher.patterns:
+            return []
+
+        # file_id -> {pattern index: best contribution}
+        hits: dict[int, dict[int, float]] = {}
+        for token, files in self.postings.items():
+            matched = matcher.find(token)
+            if not matched:
+                continue
+            for pattern_index in matched:
+                exact = matcher.patterns[pattern_index] == token
+                for file_id, kind in files:
+                    score = self.KIND_WEIGHTS[kind] * (self.EXACT_BONUS if exact else 1.0)
+                    per_pattern = hits.setdefault(file_id, {})
+                    if score > per_pattern.get(pattern_index, 0.0):
+                        per_pattern[pattern_index] = score
+
+        excluded = self._files_matching(exclude) if exclude else set()
+        allowed_exts = {e.lower().lstrip('.') for e in extensions} if extensions else None
+
+        ranked = []
+        for file_id, per_pattern in hits.items():
+            if file_id in excluded:
+                continue
+            path = self.paths[file_id]
+            if allowed_exts is not None and os.path.splitext(path)[1].lower().lstrip('.') not in allowed_exts:
+                continue
+            depth = path.count('/')
+            score = sum(per_pattern.values()) / (1.0 + 0.15 * depth)
+            ranked.append((-score, len(path), path))
+
+        ranked.sort()
+        return [path for _, _, path in ranked[:limit]]
+
+    def _files_matching(self, patterns: list[str]) -> set[int]:
+        """File ids with any token containing one of the patterns."""
+        matcher = PatternMatcher(p.lower() for p in patterns)
+        files = set()
+        if not matcher.patterns:
+            return files
+        for token, postings in self.postings.items():
+            if matcher.find(token):
+                files.update(file_id for file_id, _ in postings)
+        return files
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"version": self.VERSION, "paths": self.paths, "postings": self.postings}
+
+    def save(self, file_path: str) -> None:
+        """Write the index atomically."""
+        write_index_file(file_path, self.to_dict())
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional["PathIndex"]:
+        """Load an index, reusing the in-process copy while the file is unchanged."""
+        return _index_cache.get(file_path, cls._read)
+
+    @classmethod
+    def _read(cls, file_path: str) -> Optional["PathIndex"]:
+        data = read_index_file(file_path, cls.VERSION)
+        if data is None:
+            return None
+        return cls(paths=data["paths"], postings=data["postings"])
+
+
+class IndexFileCache:
+    """Small LRU of loaded index files, invalidated by file mtime.
+
+    on_evict, if given, is called with each value dropped from the cache (evicted,
+    replaced by a newer load or discarded) so values holding resources can free them.
+    """
+
+    def __init__(self, max_entries: int = 16, on_evict: Optional[Callable[[Any], None]] = None):
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str, loader) -> Any:
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._entries.get(file_path)
+            if cached and cached[0] == mtime:
+                self._entries.move_to_end(file_path)
+                return cached[1]
+
+        try:
+            value = loader(file_path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+        dropped = []
+        with self._lock:
+            previous = self._entries.pop(file_path, None)
+            if previous is not None:
+                dropped.append(previous[1])
+            self._entries[file_path] = (mtime, value)
+            while len(self._entries) > self.max_entries:
+                dropped.append(self._entries.popitem(last=False)[1][1])
+        self._release(dropped)
+        return value
+
+    def discard(self, file_path: str) -> None:
+        """Drop a file's entry, e.g. once the file is deleted."""
+        with self._lock:
+            cached = self._entries.pop(file_path, None)
+        if cached is not None:
+            self._release([cached[1]])
+
+    def _release(self, values: list[Any]) -> None:
+        if self.on_evict is None:
+            return
+        for value in values:
+            if value is not None:
+                self.on_evict(value)
+
+
+def write_index_file(file_path: str, data: dict[str, Any]) -> None:
+    """Write an index as compact JSON, replacing file_path atomically.
+
+    The data goes to a uniquely named temporary file in the same directory
+    first, so concurrent writers of one index never interleave their output.
+    """
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+    f = tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=directory,
+        prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", delete=False,
+    )
+    try:
+        with f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(f.name, file_path)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+        raise
+
+
+def read_index_file(file_path: str, version: int) -> Optional[dict[str, Any]]:
+    """Read an index written by write_index_file; None if it has another format version.
+
+    Raises:
+        OSError: The file can't be read
+        ValueError: The file isn't valid JSON
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data if data.get("version") == version else None
+
+
+_index_cache = IndexFileCache()
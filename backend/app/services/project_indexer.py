@@ -0,0 +1,184 @@
+import os
+import shutil
+from typing import Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Project, ProjectFile
+from app.services.archive_fs import open_code_file
+from app.services.blob_cache import BlobCache
+from app.services.content_index import ContentIndex
+from app.services.file_classifier import FileClassifier
+from app.services.file_walker import resolve_worker_count
+from app.services.import_graph import ImportGraph
+from app.services.path_index import PathIndex
+from app.services.symbol_index import SymbolExtractor, SymbolIndex
+
+
+def _is_source():
+    """Manifest filter for files worth indexing (not generated, vendored, binary, ...)."""
+    return or_(ProjectFile.file_class.is_(None), ProjectFile.file_class == FileClassifier.NORMAL)
+
+
+def project_index_dir(project_id) -> str:
+    """Directory holding a project's derived search indexes."""
+    return os.path.join(settings.index_dir, str(project_id))
+
+
+def build_content_index_task(project_id, code_path: str) -> None:
+    """Background task: refresh a project's content index in its own session."""
+    db = SessionLocal()
+    try:
+        project = db.get(Project, project_id)
+        if project is not None:
+            read = ProjectIndexer(db).build_content_index(project, code_path)
+            print(f"Content index for project {project_id} updated ({read} files read)")
+    except Exception as e:
+        print(f"Content indexing failed for project {project_id}: {e}")
+    finally:
+        db.close()
+
+
+class ProjectIndexer:
+    """Builds and loads the per-project indexes used for section context selection."""
+
+    PATH_INDEX_FILE = "paths.json"
+    CONTENT_INDEX_FILE = "content.json"
+    SYMBOL_INDEX_FILE = "symbols.json"
+    IMPORT_GRAPH_FILE = "imports.json"
+
+    # Most central modules reported as key files
+    CENTRAL_KEY_FILES = 10
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def index_project(self, project: Project) -> None:
+        """Rebuild a project's indexes from its file manifest after analysis."""
+        paths = [
+            path for (path,) in
+            self.db.query(ProjectFile.path)
+            .filter(ProjectFile.project_id == project.id)
+            .order_by(ProjectFile.path)
+        ]
+        PathIndex.build(paths).save(self._path_index_file(project.id))
+
+    def build_content_index(self, project: Project, code_path: str) -> int:
+        """Bring a project's BM25 content index up to date with its manifest.
+
+        Only files whose content hash isn't in the existing index are read.
+
+        Returns:
+            int: Number of files read
+        """
+        files = {
+            path: content_hash for path, content_hash in
+            self.db.query(ProjectFile.path, ProjectFile.content_hash)
+            .filter(
+                ProjectFile.project_id == project.id,
+                ProjectFile.content_hash.isnot(None),
+                ProjectFile.size <= ContentIndex.MAX_FILE_BYTES,
+                _is_source(),
+            )
+        }
+        index_file = self._content_index_file(project.id)
+
+        def read_file(path: str) -> Optional[str]:
+            try:
+                with open_code_file(code_path, path) as f:
+                    return f.read().decode('utf-8', errors='ignore')
+            except OSError:
+                return None
+
+        index, read = ContentIndex.build(files, read_file, previous=ContentIndex.load(index_file))
+        index.save(index_file)
+        return read
+
+    def build_symbol_index(self, project: Project, code_path: str) -> SymbolIndex:
+        """Bring a project's symbol index up to date, parsing only files with new hashes.
+
+        Hashes already parsed for any other project are taken from the BlobCache.
+        """
+        files = {
+            path: (content_hash, language) for path, content_hash, language in
+            self.db.query(ProjectFile.path, ProjectFile.content_hash, ProjectFile.language)
+            .filter(
+                ProjectFile.project_id == project.id,
+                ProjectFile.content_hash.isnot(None),
+                ProjectFile.language.in_(SymbolExtractor.LANGUAGES),
+                ProjectFile.size <= SymbolIndex.MAX_FILE_BYTES,
+                _is_source(),
+            )
+        }
+        index_file = self._symbol_index_file(project.id)
+
+        index, _ = SymbolIndex.build(
+            code_path,
+            files,
+            previous=SymbolIndex.load(index_file),
+            max_workers=min(resolve_worker_count(settings.analyzer_workers), os.cpu_count() or 1),
+            cache=BlobCache(),
+        )
+        index.save(index_file)
+        return index
+
+    def build_import_graph(self, project: Project, symbols: SymbolIndex) -> ImportGraph:
+        """Resolve the symbol index's import lists into a ranked import graph."""
+        paths = [
+            path for (path,) in
+            self.db.query(ProjectFile.path)
+            .filter(
+                ProjectFile.project_id == project.id,
+                ProjectFile.language.in_(("python", "javascript", "typescript")),
+                _is_source(),
+            )
+        ]
+        graph = ImportGraph.build(symbols.imports_by_path(), paths)
+        graph.save(self._import_graph_file(project.id))
+        return graph
+
+    def central_key_files(self, graph: ImportGraph) -> list[dict]:
+        """key_files entries for the most imported-upon modules.
+
+        Only files ranked above the uniform baseline qualify, so a repo without
+        internal imports reports none.
+        """
+        baseline = 1.0 / len(graph.paths) if graph.paths else 0.0
+        return [
+            {"path": path, "type": "central", "name": os.path.basename(path), "score": round(score, 6)}
+            for path, score in graph.top(self.CENTRAL_KEY_FILES)
+            if score > baseline
+        ]
+
+    def load_path_index(self, project: Project) -> Optional[PathIndex]:
+        """Load a project's path index, or None if it hasn't been built."""
+        return PathIndex.load(self._path_index_file(project.id))
+
+    def load_symbol_index(self, project: Project) -> Optional[SymbolIndex]:
+        """Load a project's symbol index, or None if it hasn't been built."""
+        return SymbolIndex.load(self._symbol_index_file(project.id))
+
+    def load_import_graph(self, project: Project) -> Optional[ImportGraph]:
+        """Load a project's import graph, or None if it hasn't been built."""
+        return ImportGraph.load(self._import_graph_file(project.id))
+
+    def load_content_index(self, project: Project) -> Optional[ContentIndex]:
+        """Load a project's content index, or None if it hasn't been built yet."""
+        return ContentIndex.load(self._content_index_file(project.id))
+
+    def delete_indexes(self, project_id) -> None:
+        """Remove all indexes for a deleted project."""
+        shutil.rmtree(project_index_dir(project_id), ignore_errors=True)
+
+    def _path_index_file(self, project_id) -> str:
+        return os.path.join(project_index_dir(project_id), self.PATH_INDEX_FILE)
+
+    def _content_index_file(self, project_id) -> str:
+        return os.path.join(project_index_dir(project_id), self.CONTENT_INDEX_FILE)
+
+    def _symbol_index_file(self, project_id) -> str:
+        return os.path.join(project_index_dir(project_id), self.SYMBOL_INDEX_FILE)
+
+    def _import_graph_file(self, project_id) -> str:
+        return os.path.join(project_index_dir(project_id), self.IMPORT_GRAPH_FILE)
@@ -0,0 +1,185 @@
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import LLMResponseCacheEntry
+
+# Process-wide counters (per-entry hit counts are persisted on the rows)
+_stats_lock = threading.Lock()
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "bypasses": 0, "stores": 0, "evictions": 0}
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+class ResponseCache:
+    """LLM responses keyed by a fingerprint of provider, model, system prompt and prompt.
+
+    Generating the same section against an unchanged project sends a
+    byte-identical prompt, so its response can be reused instead of paying the
+    model's latency and cost again. Lookups go through a per-process LRU of
+    settings.llm_cache_memory_entries responses, then the llm_response_cache
+    table shared by all API nodes. Entries older than settings.llm_cache_ttl_seconds
+    are not reused, and the table is evicted least-recently-used once it exceeds
+    settings.llm_cache_max_bytes (0 disables the cache).
+
+    Methods are blocking; async callers run them in the threadpool.
+    """
+
+    def __init__(self):
+        self.max_bytes = settings.llm_cache_max_bytes
+        self.ttl = timedelta(seconds=settings.llm_cache_ttl_seconds)
+        self.memory_entries = settings.llm_cache_memory_entries
+        self._memory: OrderedDict[str, tuple[datetime, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(provider: str, model: str, system_prompt: str, prompt: str) -> str:
+        """Fingerprint of everything that determines a response."""
+        raw = json.dumps([provider, model, system_prompt, prompt], separators=(",", ":"))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, keys: Iterable[str]) -> Optional[str]:
+        """The cached response for the first of keys (in priority order) that has one."""
+        if not self.enabled:
+            return None
+        keys = list(keys)
+        cutoff = datetime.utcnow() - self.ttl
+
+        with self._lock:
+            for key in keys:
+                cached = self._memory.get(key)
+                if cached and cached[0] >= cutoff:
+                    self._memory.move_to_end(key)
+                    _count("memory_hits")
+                    return cached[1]
+
+        db = SessionLocal()
+        try:
+            found = {
+                entry.cache_key: entry for entry in
+                db.query(LLMResponseCacheEntry).filter(
+                    LLMResponseCacheEntry.cache_key.in_(keys),
+                    LLMResponseCacheEntry.created_at >= cutoff,
+                )
+            }
+            entry = next((found[key] for key in keys if key in found), None)
+            if entry is None:
+                _count("misses")
+                return None
+
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_accessed_at = datetime.utcnow()
+            db.commit()
+            _count("db_hits")
+            self._remember(entry.cache_key, entry.created_at, entry.response)
+            return entry.response
+        finally:
+            db.close()
+
+    def put(self, key: str, provider: str, model: str, response: str) -> None:
+        """Store a response (replacing any older one), then evict down to the budget."""
+        if not self.enabled or not response:
+            return
+        now = datetime.utcnow()
+        self._remember(key, now, response)
+
+        db = SessionLocal()
+        try:
+            entry = db.get(LLMResponseCacheEntry, key)
+            if entry is None:
+                entry = LLMResponseCacheEntry(cache_key=key, hit_count=0)
+                db.add(entry)
+            entry.provider = provider
+            entry.model = model
+            entry.response = response
+            entry.size_bytes = len(response.encode('utf-8'))
+            entry.created_at = now
+            entry.last_accessed_at = now
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another node stored the same prompt's response first
+                db.rollback()
+                return
+            _count("stores")
+            self._evict(db)
+        finally:
+            db.close()
+
+    def record_bypass(self) -> None:
+        _count("bypasses")
+
+    def _remember(self, key: str, stored_at: datetime, response: str) -> None:
+        with self._lock:
+            self._memory[key] = (stored_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _evict(self, db: Session) -> None:
+        """Drop expired entries, then least-recently-used ones until the table fits its budget."""
+        evicted = db.query(LLMResponseCacheEntry).filter(
+            LLMResponseCacheEntry.created_at < datetime.utcnow() - self.ttl
+        ).delete(synchronize_session=False)
+
+        total = db.query(func.coalesce(func.sum(LLMResponseCacheEntry.size_bytes), 0)).scalar()
+        if total > self.max_bytes:
+            stale = []
+            for key, size in (
+                db.query(LLMResponseCacheEntry.cache_key, LLMResponseCacheEntry.size_bytes)
+                .order_by(LLMResponseCacheEntry.last_accessed_at)
+            ):
+                if total <= self.max_bytes:
+                    break
+                stale.append(key)
+                total -= size
+            if stale:
+                evicted += db.query(LLMResponseCacheEntry).filter(
+                    LLMResponseCacheEntry.cache_key.in_(stale)
+                ).delete(synchronize_session=False)
+
+        if evicted:
+            db.commit()
+            _count("evictions", evicted)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters for this process plus the cache's current footprint."""
+        db = SessionLocal()
+        try:
+            entries, size = db.query(
+                func.count(LLMResponseCacheEntry.cache_key),
+                func.coalesce(func.sum(LLMResponseCacheEntry.size_bytes), 0),
+            ).one()
+        finally:
+            db.close()
+
+        with _stats_lock:
+            counters = dict(_stats)
+        hits = counters["memory_hits"] + counters["db_hits"]
+        lookups = hits + counters["misses"]
+        with self._lock:
+            memory_entries = len(self._memory)
+
+        return {
+            **counters,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "memory_entries": memory_entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+        }
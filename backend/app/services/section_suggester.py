@@ -64,7 +64,7 @@ class SectionSuggester:
             for s in sections
         ]
 
-    def suggest_sections(
+    async def suggest_sections(
         self,
         document_type_id: str,
         code_analysis: dict[str, Any],
@@ -85,7 +85,7 @@ class SectionSuggester:
         all_sections = self.get_all_sections()
 
         # Use Claude to analyze relevance
-        suggestions = self.claude_service.suggest_sections(
+        suggestions = await self.claude_service.suggest_sections(
             document_type=doc_type.name,
             code_analysis=code_analysis,
             available_sections=all_sections,
@@ -0,0 +1,581 @@
+import re
+import ast
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+from app.services.archive_fs import open_code_file
+from app.services.blob_cache import BlobCache
+from app.services.content_index import ContentIndex, read_chunk, split_lines
+from app.services.path_index import IndexFileCache, read_index_file, write_index_file
+
+# HTTP verbs recognised in route decorators and router calls
+HTTP_METHODS = {'get', 'post', 'put', 'delete', 'patch', 'head', 'options'}
+
+
+class SymbolExtractor:
+    """Extracts functions, classes, methods and HTTP routes with their line spans.
+
+    Python is parsed with ast. JavaScript/TypeScript, Go and Java use
+    line-oriented patterns, with each symbol's end found by brace matching.
+    Every symbol is a dict with kind, name, start and end (1-based, inclusive),
+    plus decorators when present. Routes also carry method and path.
+    """
+
+    LANGUAGES = {'python', 'javascript', 'typescript', 'go', 'java'}
+
+    JS_PATTERNS = [
+        ('function', re.compile(r'^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)')),
+        ('class', re.compile(r'^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?(?:class|interface)\s+([A-Za-z_$][\w$]*)')),
+        ('function', re.compile(
+            r'^\s*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=]+)?=\s*(?:async\s+)?'
+            r'(?:function\b|\([^)]*\)\s*(?::[^=]+)?=>|[A-Za-z_$][\w$]*\s*=>)'
+        )),
+    ]
+    JS_METHOD_RE = re.compile(
+        r'^\s+(?:(?:public|private|protected|static|async|readonly|override|get|set)\s+)*'
+        r'([A-Za-z_$][\w$]*)\s*(?:<[^>]*>)?\([^)]*\)\s*(?::[^{]+)?\{'
+    )
+    JS_ROUTE_RE = re.compile(
+        r'\b(?:app|router|server|api|routes)\.(get|post|put|delete|patch|all)\(\s*[\'"`]([^\'"`]+)'
+    )
+    JS_IMPORT_RE = re.compile(
+        r'(?:import|export)\s[^\'";]*?from\s*[\'"]([^\'"]+)[\'"]'
+        r'|import\s*\(?\s*[\'"]([^\'"]+)[\'"]'
+        r'|require\(\s*[\'"]([^\'"]+)[\'"]\s*\)'
+    )
+    JS_DECORATOR_ROUTE_RE = re.compile(r'^\s*@(Get|Post|Put|Delete|Patch)\(\s*(?:[\'"`]([^\'"`]*))?')
+
+    GO_FUNC_RE = re.compile(r'^func\s+(?:\(\s*\w+\s+\*?(\w+)(?:\[[^\]]*\])?\s*\)\s*)?(\w+)\s*[\[(]')
+    GO_TYPE_RE = re.compile(r'^type\s+(\w+)\s+(?:struct|interface)\b')
+    GO_ROUTE_RE = re.compile(
+        r'\.(GET|POST|PUT|DELETE|PATCH|Get|Post|Put|Delete|Patch|Handle|HandleFunc)\(\s*"([^"]+)"'
+    )
+
+    JAVA_CLASS_RE = re.compile(
+        r'^\s*(?:(?:public|private|protected|abstract|final|static|sealed)\s+)*(?:class|interface|enum|record)\s+(\w+)'
+    )
+    JAVA_METHOD_RE = re.compile(
+        r'^\s*(?:(?:public|private|protected|static|final|abstract|synchronized|native|default)\s+)+'
+        r'(?:<[^>]+>\s+)?[\w<>\[\],.?\s]+?\s+(\w+)\s*\('
+    )
+    JAVA_ANNOTATION_RE = re.compile(r'^\s*@(\w+)(?:\((.*)\))?')
+    JAVA_ROUTE_ANNOTATIONS = {
+        'GetMapping': 'GET', 'PostMapping': 'POST', 'PutMapping': 'PUT',
+        'DeleteMapping': 'DELETE', 'PatchMapping': 'PATCH', 'RequestMapping': 'ANY',
+    }
+
+    CONTROL_KEYWORDS = {'if', 'for', 'while', 'switch', 'catch', 'function', 'return', 'with', 'constructor'}
+
+    def extract(self, text: str, language: str) -> list[dict[str, Any]]:
+        """Symbols defined in a file's text, in source order."""
+        return self.extract_all(text, language)[0]
+
+    def extract_all(self, text: str, language: str) -> tuple[list[dict[str, Any]], list[str]]:
+        """Symbols and raw import specifiers for a file's text.
+
+        Import specifiers are left unresolved (dotted modules with leading dots for
+        relative Python imports, module strings for JS/TS) since resolving them
+        depends on the rest of the tree, not just this file's contents.
+        """
+        imports: list[str] = []
+        if language == 'python':
+            try:
+                tree = ast.parse(text)
+            except (SyntaxError, ValueError):
+                return [], []
+            symbols = self._extract_python(tree)
+            imports = self._python_imports(tree)
+        elif language in ('javascript', 'typescript'):
+            symbols = self._extract_js(split_lines(text))
+            imports = list(dict.fromkeys(
+                next(g for g in match.groups() if g) for match in self.JS_IMPORT_RE.finditer(text)
+            ))
+        elif language == 'go':
+            symbols = self._extract_go(split_lines(text))
+        elif language == 'java':
+            symbols = self._extract_java(split_lines(text))
+        else:
+            return [], []
+        symbols.sort(key=lambda s: (s['start'], s['kind'] != 'class'))
+        return symbols, imports
+
+    # Python
+
+    def _extract_python(self, tree: ast.Module) -> list[dict[str, Any]]:
+        symbols = []
+
+        def visit(body: list[ast.stmt], in_class: bool) -> None:
+            for node in body:
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                    start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+                    symbol = {
+                        'kind': 'class' if isinstance(node, ast.ClassDef) else ('method' if in_class else 'function'),
+                        'name': node.name,
+                        'start': start,
+                        'end': node.end_lineno or node.lineno,
+                    }
+                    decorators = [self._unparse(d) for d in node.decorator_list]
+                    if decorators:
+                        symbol['decorators'] = decorators
+                    symbols.append(symbol)
+
+                    if isinstance(node, ast.ClassDef):
+                        visit(node.body, in_class=True)
+                    else:
+                        for decorator in node.decorator_list:
+                            route = self._python_route(decorator)
+                            if route:
+                                symbols.append(dict(route, kind='route', handler=node.name,
+                                                    start=start, end=symbol['end']))
+
+        visit(tree.body, in_class=False)
+        return symbols
+
+    def _python_imports(self, tree: ast.Module) -> list[str]:
+        """Module specifiers imported anywhere in a module.
+
+        "from pkg import name" yields both "pkg" and "pkg.name", since name may be
+        a submodule; unresolvable candidates are dropped when building the graph.
+        """
+        imports = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imports.extend(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                module = '.' * node.level + (node.module or '')
+                imports.append(module)
+                separator = '' if module.endswith('.') else '.'
+                imports.extend(f"{module}{separator}{alias.name}" for alias in node.names if alias.name != '*')
+        return list(dict.fromkeys(imports))
+
+    def _python_route(self, decorator: ast.expr) -> Optional[dict[str, str]]:
+        """Route for decorators like @router.get("/x") or @app.route("/x", methods=[...])."""
+        if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)):
+            return None
+        verb = decorator.func.attr.lower()
+        if verb not in HTTP_METHODS | {'route', 'api_route', 'websocket'}:
+            return None
+        if not decorator.args or not isinstance(decorator.args[0], ast.Constant) \
+                or not isinstance(decorator.args[0].value, str):
+            return None
+
+        path = decorator.args[0].value
+        if verb in HTTP_METHODS:
+            method = verb.upper()
+        elif verb == 'websocket':
+            method = 'WS'
+        else:
+            method = 'GET'
+            for keyword in decorator.keywords:
+                if keyword.arg == 'methods' and isinstance(keyword.value, (ast.List, ast.Tuple)):
+                    verbs = [e.value.upper() for e in keyword.value.elts
+                             if isinstance(e, ast.Constant) and isinstance(e.value, str)]
+                    method = ','.join(verbs) or method
+        return {'name': f"{method} {path}".rstrip(), 'method': method, 'path': path}
+
+    def _unparse(self, node: ast.expr) -> str:
+        try:
+            return ('@' + ast.unparse(node))[:120]
+        except Exception:
+            return ''
+
+    # Brace languages
+
+    def _extract_js(self, lines: list[str]) -> list[dict[str, Any]]:
+        symbols = []
+        class_spans = []
+        pending_decorators: list[str] = []
+
+        for i, line in enumerate(lines):
+            stripped = line.strip()
+            if stripped.startswith('@'):
+                pending_decorators.append(stripped[:120])
+                match = self.JS_DECORATOR_ROUTE_RE.match(line)
+                if match:
+                    method, path = match.group(1).upper(), match.group(2) or ''
+                    end = self._block_end(lines, i)
+                    symbols.append({'kind': 'route', 'name': f"{method} {path}".rstrip(),
+                                    'method': method, 'path': path, 'start': i + 1, 'end': end})
+                continue
+
+            for kind, pattern in self.JS_PATTERNS:
+                match = pattern.match(line)
+                if match:
+                    symbols.append(self._symbol(kind, match.group(1), lines, i, pending_decorators))
+                    if kind == 'class':
+                        class_spans.append((i + 1, symbols[-1]['end']))
+                    break
+            else:
+                match = self.JS_METHOD_RE.match(line)
+                if match and match.group(1) not in self.CONTROL_KEYWORDS \
+                        and any(start < i + 1 <= end for start, end in class_spans):
+                    symbols.append(self._symbol('method', match.group(1), lines, i, pending_decorators))
+
+            for match in self.JS_ROUTE_RE.finditer(line):
+                method, path = match.group(1).upper(), match.group(2)
+                symbols.append({'kind': 'route', 'name': f"{method} {path}", 'method': method,
+                                'path': path, 'start': i + 1, 'end': self._block_end(lines, i, '(', ')')})
+            pending_decorators = []
+
+        return symbols
+
+    def _extract_go(self, lines: list[str]) -> list[dict[str, Any]]:
+        symbols = []
+        for i, line in enumerate(lines):
+            match = self.GO_FUNC_RE.match(line)
+            if match:
+                receiver, name = match.groups()
+                kind = 'method' if receiver else 'function'
+                symbols.append(self._symbol(kind, f"{receiver}.{name}" if receiver else name, lines, i))
+                continue
+
+            match = self.GO_TYPE_RE.match(line)
+            if match:
+                symbols.append(self._symbol('class', match.group(1), lines, i))
+                continue
+
+            for match in self.GO_ROUTE_RE.finditer(line):
+                verb, path = match.groups()
+                method = 'ANY' if verb.startswith('Handle') else verb.upper()
+                symbols.append({'kind': 'route', 'name': f"{method} {path}", 'method': method,
+                                'path': path, 'start': i + 1, 'end': i + 1})
+        return symbols
+
+    def _extract_java(self, lines: list[str]) -> list[dict[str, Any]]:
+        symbols = []
+        pending_decorators: list[str] = []
+        pending_routes: list[tuple[str, str]] = []
+
+        for i, line in enumerate(lines):
+            match = self.JAVA_ANNOTATION_RE.match(line)
+            if match and not self.JAVA_CLASS_RE.match(line):
+                name, args = match.group(1), match.group(2) or ''
+                pending_decorators.append(line.strip()[:120])
+                if name in self.JAVA_ROUTE_ANNOTATIONS:
+                    path = re.search(r'"([^"]*)"', args)
+                    pending_routes.append((self.JAVA_ROUTE_ANNOTATIONS[name], path.group(1) if path else ''))
+                continue
+
+            match = self.JAVA_CLASS_RE.match(line)
+            kind = 'class'
+            if not match:
+                match = self.JAVA_METHOD_RE.match(line)
+                kind = 'method'
+            if match and match.group(1) not in self.CONTROL_KEYWORDS:
+                symbol = self._symbol(kind, match.group(1), lines, i, pending_decorators)
+                symbols.append(symbol)
+                if kind == 'method':
+                    for method, path in pending_routes:
+                        symbols.append({'kind': 'route', 'name': f"{method} {path}".rstrip(), 'method': method,
+                                        'path': path, 'handler': symbol['name'],
+                                        'start': symbol['start'], 'end': symbol['end']})
+            if line.strip():
+                pending_decorators, pending_routes = [], []
+
+        return symbols
+
+    def _symbol(
+        self,
+        kind: str,
+        name: str,
+        lines: list[str],
+        index: int,
+        decorators: Optional[list[str]] = None,
+    ) -> dict[str, Any]:
+        symbol = {'kind': kind, 'name': name, 'start': index + 1 - len(decorators or []),
+                  'end': self._block_end(lines, index)}
+        if decorators:
+            symbol['decorators'] = list(decorators)
+        return symbol
+
+    def _block_end(self, lines: list[str], index: int, open_ch: str = '{', close_ch: str = '}') -> int:
+        """Line (1-based) where the block opened on or just after lines[index] closes.
+
+        String literals and // comments are skipped; a declaration with no block
+        within a few lines (e.g. a prototype or a one-line arrow function) ends on
+        its own line.
+        """
+        depth = 0
+        opened = False
+        for i in range(index, len(lines)):
+            line = lines[i]
+            quote = None
+            j = 0
+            while j < len(line):
+                ch = line[j]
+                if quote:
+                    if ch == '\\':
+                        j += 1
+                    elif ch == quote:
+                        quote = None
+                elif ch in '"\'`':
+                    quote = ch
+                elif ch == '/' and line[j + 1:j + 2] == '/':
+                    break
+                elif ch == open_ch:
+                    depth += 1
+                    opened = True
+                elif ch == close_ch and opened:
+                    depth -= 1
+                    if depth == 0:
+                        return i + 1
+                j += 1
+            if not opened and (i - index >= 3 or line.rstrip().endswith(';')):
+                return index + 1
+        return len(lines) if opened else index + 1
+
+
+_extractor = SymbolExtractor()
+
+# Worker processes shared by every index build, started on first use
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool(max_workers: int) -> ProcessPoolExecutor:
+    """The shared symbol extraction pool (sized by the first caller)."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=max_workers)
+        return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the shared pool's worker processes (called at application shutdown)."""
+    global _parse_pool
+    with _parse_pool_lock:
+        pool, _parse_pool = _parse_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _discard_parse_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next build starts a fresh one."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False)
+
+
+def extract_file_symbols(job: tuple[str, str, str]) -> Optional[tuple[list[dict[str, Any]], list[str]]]:
+    """Process-pool entry point: extract (symbols, imports) from (code path, file path, language)."""
+    base_path, file_path, language = job
+    try:
+        with open_code_file(base_path, file_path) as f:
+            text = f.read().decode('utf-8', errors='ignore')
+    except OSError:
+        return None
+    return _extractor.extract_all(text, language)
+
+
+class SymbolIndex:
+    """Per-project symbol table and raw import lists, cached by file content hash.
+
+    Extraction runs on a process pool shared by all builds (parsing is
+    CPU-bound, so threads would serialize on the GIL); small batches are parsed
+    in-process. Files whose hash already appears in the previous index are not
+    re-parsed.
+    """
+
+    VERSION = 3
+
+    MAX_FILE_BYTES = 1024 * 1024  # Larger files are not parsed
+    PARALLEL_THRESHOLD = 32  # Fewer files than this are parsed in-process
+    MAX_SUMMARY_ROUTES = 100
+
+    # Query terms that make route definitions relevant to a section
+    ROUTE_TERMS = {'api', 'endpoint', 'route', 'http', 'rest', 'request', 'handler'}
+
+    def __init__(
+        self,
+        files: dict[str, str],
+        symbols: dict[str, list[dict[str, Any]]],
+        imports: Optional[dict[str, list[str]]] = None,
+    ):
+        self.files = files  # path -> content hash
+        self.symbols = symbols  # content hash -> symbols
+        self.imports = imports or {}  # content hash -> unresolved import specifiers
+
+    @classmethod
+    def build(
+        cls,
+        base_path: str,
+        files: dict[str, tuple[str, str]],
+        previous: Optional["SymbolIndex"] = None,
+        max_workers: int = 1,
+        cache: Optional[BlobCache] = None,
+    ) -> tuple["SymbolIndex", int]:
+        """Build an index, reusing symbols of a previous index for unchanged hashes.
+
+        Args:
+            files: path -> (content hash, language) for every file to index
+            cache: Cross-project cache consulted for hashes the previous index lacks
+
+        Returns:
+            tuple: (index, number of files parsed)
+        """
+        reusable = previous.symbols if previous else {}
+        reusable_imports = previous.imports if previous else {}
+        symbols: dict[str, list[dict[str, Any]]] = {}
+        imports: dict[str, list[str]] = {}
+        jobs: dict[str, tuple[str, str, str]] = {}
+
+        for path, (content_hash, language) in sorted(files.items()):
+            if content_hash in symbols or content_hash in jobs:
+                continue
+            if content_hash in reusable:
+                symbols[content_hash] = reusable[content_hash]
+                if content_hash in reusable_imports:
+                    imports[content_hash] = reusable_imports[content_hash]
+            else:
+                jobs[content_hash] = (base_path, path, language)
+
+        # Cache variant: extracted symbols depend on the language and the extractor version
+        keys = {h: (h, f"{language}:{cls.VERSION}") for h, (_, _, language) in jobs.items()}
+        if cache is not None and jobs:
+            cached = cache.get_many(BlobCache.SYMBOLS, keys.values())
+            for content_hash, key in keys.items():
+                if key in cached:
+                    symbols[content_hash] = cached[key]["symbols"]
+                    if cached[key]["imports"]:
+                        imports[content_hash] = cached[key]["imports"]
+                    del jobs[content_hash]
+
+        hashes = list(jobs)
+        results = None
+        if len(hashes) >= cls.PARALLEL_THRESHOLD and max_workers > 1:
+            pool = get_parse_pool(max_workers)
+            chunksize = max(1, len(hashes) // (max_workers * 4))
+            try:
+                results = list(pool.map(extract_file_symbols, [jobs[h] for h in hashes], chunksize=chunksize))
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); parse here and replace the pool
+                _discard_parse_pool(pool)
+        if results is None:
+            results = [extract_file_symbols(jobs[h]) for h in hashes]
+
+        extracted = {}
+        for content_hash, result in zip(hashes, results):
+            if result is not None:
+                symbols[content_hash], file_imports = result
+                if file_imports:
+                    imports[content_hash] = file_imports
+                extracted[keys[content_hash]] = {"symbols": result[0], "imports": file_imports}
+
+        if cache is not None:
+            cache.put_many(BlobCache.SYMBOLS, extracted)
+
+        indexed = {path: h for path, (h, _) in files.items() if h in symbols}
+        return cls(indexed, symbols, imports), len(hashes)
+
+    def symbols_for(self, path: str) -> list[dict[str, Any]]:
+        return self.symbols.get(self.files.get(path), [])
+
+    def imports_by_path(self) -> dict[str, list[str]]:
+        """Unresolved import specifiers for every indexed file that has any."""
+        return {path: self.imports[h] for path, h in self.files.items() if h in self.imports}
+
+    def summary(self) -> dict[str, Any]:
+        """Symbol counts and route table for analysis_data."""
+        counts = {'functions': 0, 'classes': 0, 'methods': 0, 'routes': 0}
+        routes = []
+        for path in sorted(self.files):
+            for symbol in self.symbols_for(path):
+                counts[symbol['kind'] + ('es' if symbol['kind'] == 'class' else 's')] += 1
+                if symbol['kind'] == 'route':
+                    routes.append({'method': symbol['method'], 'path': symbol['path'],
+                                   'file': path, 'line': symbol['start']})
+        return {**counts, 'route_list': routes[:self.MAX_SUMMARY_ROUTES]}
+
+    def _matching(self, path: str, terms: set[str]) -> list[tuple[int, dict[str, Any]]]:
+        """(score, symbol) for a file's symbols whose names share terms with the query."""
+        wants_routes = bool(terms & self.ROUTE_TERMS)
+        matches = []
+        for symbol in self.symbols_for(path):
+            if symbol['kind'] == 'route':
+                name_terms = set(ContentIndex.tokenize(symbol['path'] + ' ' + symbol.get('handler', '')))
+            else:
+                name_terms = set(ContentIndex.tokenize(symbol['name']))
+            score = len(name_terms & terms)
+            if symbol['kind'] == 'route' and wants_routes:
+                score += 1
+            if score:
+                matches.append((score, symbol))
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> list[str]:
+        """Files ranked by how many of their symbols match the query."""
+        terms = set(ContentIndex.tokenize(query))
+        if not terms:
+            return []
+        scored = []
+        for path in self.files:
+            score = sum(s for s, _ in self._matching(path, terms))
+            if score:
+                scored.append((-score, path))
+        scored.sort()
+        return [path for _, path in scored[:limit]]
+
+    def excerpt(
+        self,
+        base_path: str,
+        path: str,
+        query: str,
+        max_lines: int = 200,
+    ) -> Optional[tuple[str, list[list[int]]]]:
+        """Source of a file's symbols that match the query, within a line budget.
+
+        Returns:
+            tuple: (content, [[start, end], ...]) or None when no symbol matches
+        """
+        matches = self._matching(path, set(ContentIndex.tokenize(query)))
+        if not matches:
+            return None
+
+        spans: list[list[int]] = []
+        budget = max_lines
+        for _, symbol in sorted(matches, key=lambda m: (-m[0], m[1]['start'])):
+            start, end = symbol['start'], min(symbol['end'], symbol['start'] + budget - 1)
+            if any(s <= start and end <= e for s, e in spans):
+                continue
+            spans.append([start, end])
+            budget -= end - start + 1
+            if budget <= 0:
+                break
+
+        # Merge overlapping spans and read them in file order
+        spans.sort()
+        merged: list[list[int]] = []
+        for start, end in spans:
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        content = "\n...\n".join(read_chunk(base_path, path, start, end) for start, end in merged)
+        return (content, merged) if content else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"version": self.VERSION, "files": self.files, "symbols": self.symbols, "imports": self.imports}
+
+    def save(self, file_path: str) -> None:
+        """Write the index atomically."""
+        write_index_file(file_path, self.to_dict())
+
+    @classmethod
+    def load(cls, file_path: str) -> Optional["SymbolIndex"]:
+        """Load an index, reusing the in-process copy while the file is unchanged."""
+        return _index_cache.get(file_path, cls._read)
+
+    @classmethod
+    def _read(cls, file_path: str) -> Optional["SymbolIndex"]:
+        data = read_index_file(file_path, cls.VERSION)
+        if data is None:
+            return None
+        return cls(files=data["files"], symbols=data["symbols"], imports=data.get("imports"))
+
+
+_index_cache = IndexFileCache(max_entries=4)
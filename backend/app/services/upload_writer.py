@@ -0,0 +1,88 @@
+import os
+import hashlib
+from typing import AsyncIterator
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from app.core.exceptions import PayloadTooLargeException
+
+
+class UploadWriter:
+    """Streams an uploaded file to disk in fixed-size chunks.
+
+    At most one chunk is held in memory per upload. The size limit is enforced
+    as bytes arrive (so an oversized upload is rejected after max_bytes, not
+    after being read in full), and a SHA-256 of the contents is computed in the
+    same pass. Disk writes run on the threadpool to keep the event loop free.
+    """
+
+    CHUNK_SIZE = 1024 * 1024  # 1MB
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+
+    async def save(self, upload: UploadFile, destination: str) -> tuple[int, str]:
+        """Write an upload to destination.
+
+        Returns:
+            tuple: (size in bytes, hex SHA-256 of the contents)
+
+        Raises:
+            PayloadTooLargeException: Once more than max_bytes have been received
+        """
+        hasher = hashlib.sha256()
+        size = 0
+        with open(destination, "wb") as out:
+            while True:
+                chunk = await upload.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise PayloadTooLargeException(
+                        f"File too large. Maximum size: {self.max_bytes // (1024 * 1024)}MB"
+                    )
+                hasher.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+        return size, hasher.hexdigest()
+
+    async def write_chunk(self, stream: AsyncIterator[bytes], destination: str, offset: int) -> tuple[int, str]:
+        """Write a streamed request body into destination at offset (creating the file).
+
+        Bytes are written as they arrive, so a chunk is never held in memory whole;
+        the caller only advances its offset once the returned checksum matches.
+
+        Returns:
+            tuple: (bytes written, hex SHA-256 of them)
+
+        Raises:
+            PayloadTooLargeException: Once more than max_bytes have been received
+        """
+        hasher = hashlib.sha256()
+        size = 0
+        pending = bytearray()
+        fd = os.open(destination, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            async for data in stream:
+                if size + len(pending) + len(data) > self.max_bytes:
+                    raise PayloadTooLargeException(
+                        f"Chunk too large. Maximum size: {self.max_bytes // (1024 * 1024)}MB"
+                    )
+                hasher.update(data)
+                pending += data
+                if len(pending) >= self.CHUNK_SIZE:
+                    size += await run_in_threadpool(os.pwrite, fd, bytes(pending), offset + size)
+                    pending.clear()
+            if pending:
+                size += await run_in_threadpool(os.pwrite, fd, bytes(pending), offset + size)
+        finally:
+            os.close(fd)
+        return size, hasher.hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    """Hex SHA-256 of a file on disk, read in UploadWriter.CHUNK_SIZE pieces."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UploadWriter.CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
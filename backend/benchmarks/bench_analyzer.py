@@ -0,0 +1,89 @@
+"""Benchmark CodeAnalyzer.analyze across worker counts.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_analyzer [PATH] [--files N] [--repeat N]
+
+Without PATH a synthetic tree is generated in a temporary directory. Each worker
+count from 1 up to the CPU count (doubling) is timed, and the best run is reported
+together with its speedup over the single-worker walk.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.code_analyzer import CodeAnalyzer  # noqa: E402
+
+
+def build_synthetic_tree(root: str, total_files: int) -> None:
+    """Create a nested tree of small source files."""
+    body = "def handler(request):\n    return {'ok': True}\n\n" * 20
+    per_dir = 50
+    for i in range(total_files):
+        d = os.path.join(root, f"pkg{i // (per_dir * 20)}", f"mod{(i // per_dir) % 20}")
+        os.makedirs(d, exist_ok=True)
+        ext = (".py", ".ts", ".go", ".md")[i % 4]
+        with open(os.path.join(d, f"file{i}{ext}"), "w") as f:
+            f.write(body)
+
+
+def worker_counts() -> list[int]:
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", help="Codebase to analyze (default: synthetic tree)")
+    parser.add_argument("--files", type=int, default=20000, help="Synthetic tree size")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per worker count")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    path = args.path
+    if not path:
+        tmp_dir = tempfile.mkdtemp(prefix="docugen-bench-")
+        print(f"Generating {args.files} files in {tmp_dir} ...")
+        build_synthetic_tree(tmp_dir, args.files)
+        path = tmp_dir
+
+    try:
+        baseline = None
+        reference = None
+        print(f"{'workers':>8} {'best (s)':>10} {'speedup':>8}")
+        for workers in worker_counts():
+            analyzer = CodeAnalyzer(max_workers=workers)
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                result = analyzer.analyze(path)
+                best = min(best, time.perf_counter() - start)
+
+            # Every worker count must produce the same analysis
+            if reference is None:
+                reference = result
+            elif result != reference:
+                raise SystemExit(f"Result mismatch with {workers} workers")
+
+            baseline = baseline or best
+            print(f"{workers:>8} {best:>10.3f} {baseline / best:>7.2f}x")
+
+        print(f"files={reference['structure']['total_files']} "
+              f"dirs={reference['structure']['total_dirs']} "
+              f"lines={reference['structure']['total_lines']}")
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
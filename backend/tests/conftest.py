@@ -0,0 +1,31 @@
+import os
+import tempfile
+import pytest
+
+# Point the app at scratch storage before anything imports its settings
+_scratch = tempfile.mkdtemp(prefix="docugen-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch}/test.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_scratch, "uploads")
+os.environ["INDEX_DIR"] = os.path.join(_scratch, "indexes")
+os.environ["GIT_MIRROR_DIR"] = os.path.join(_scratch, "mirrors")
+
+
+@pytest.fixture
+def db():
+    from app.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    # No lifespan: the AI warm-up and generation job sweeper aren't needed
+    return TestClient(app)
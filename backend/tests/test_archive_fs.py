@@ -0,0 +1,31 @@
+import zipfile
+from app.services import archive_fs
+from app.services.archive_fs import ArchiveFS
+
+
+def make_zip(path, name="a.py"):
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr(name, "x = 1\n")
+    return str(path)
+
+
+def test_evicted_archives_are_closed(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_fs._archive_cache, "max_entries", 1)
+    first = ArchiveFS.load(make_zip(tmp_path / "first.zip"))
+    ArchiveFS.load(make_zip(tmp_path / "second.zip"))
+    assert first._zip.fp is None
+
+    # An instance still held by a reader reopens its handle
+    assert first.read("a.py") == b"x = 1\n"
+    first.close()
+
+
+def test_forget_closes_and_drops_the_archive(tmp_path):
+    path = make_zip(tmp_path / "archive.zip")
+    archive = ArchiveFS.load(path)
+    with archive.open("a.py") as member:
+        ArchiveFS.forget(path)
+        assert archive._zip.fp is None
+        assert member.read() == b"x = 1\n"
+    assert ArchiveFS.load(path) is not archive
+    ArchiveFS.forget(path)
@@ -0,0 +1,16 @@
+from app.services.content_index import ContentIndex, read_chunk, split_lines
+
+
+def test_split_lines_breaks_only_on_newlines():
+    text = "a\x0cb\r\nc\x85d e\rf\n"
+    assert split_lines(text) == ["a\x0cb", "c\x85d e", "f"]
+
+
+def test_chunk_line_numbers_match_read_chunk(tmp_path):
+    lines = [f"line_{i}\x0c " for i in range(ContentIndex.CHUNK_LINES + 10)]
+    (tmp_path / "a.py").write_bytes("\r\n".join(lines).encode("utf-8"))
+
+    chunks = ContentIndex.chunk_text((tmp_path / "a.py").read_bytes().decode("utf-8"))
+    start, end = chunks[-1][0], chunks[-1][1]
+    assert (start, end) == (ContentIndex.CHUNK_LINES + 1, len(lines))
+    assert read_chunk(str(tmp_path), "a.py", start, start).startswith(f"line_{start - 1}")
@@ -0,0 +1,8 @@
+from app.services.file_classifier import FileClassifier
+
+
+def test_mz_header_only_marks_extensionless_files_binary():
+    classifier = FileClassifier(max_file_bytes=1024 * 1024)
+    assert classifier.classify_head("docs/MZ.md", b"MZ is the DOS header magic\n") == FileClassifier.NORMAL
+    assert classifier.classify_head("mz.py", b"MZ = 0x5A4D\n") == FileClassifier.NORMAL
+    assert classifier.classify_head("bin/tool", b"MZ\x90\x03") == FileClassifier.BINARY
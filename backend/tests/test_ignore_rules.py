@@ -0,0 +1,20 @@
+from app.services.ignore_rules import IgnoreFile
+
+
+def test_leading_slash_anchors_directory_pattern():
+    rules = IgnoreFile.parse("/lib/\n")
+    assert rules.match("lib", is_dir=True) is True
+    assert rules.match("src/lib", is_dir=True) is None
+
+
+def test_trailing_slash_pattern_matches_at_any_depth():
+    rules = IgnoreFile.parse("lib/\n")
+    assert rules.match("lib", is_dir=True) is True
+    assert rules.match("src/lib", is_dir=True) is True
+    assert rules.match("src/lib", is_dir=False) is None
+
+
+def test_middle_slash_anchors_pattern():
+    rules = IgnoreFile.parse("docs/build\n")
+    assert rules.match("docs/build", is_dir=True) is True
+    assert rules.match("src/docs/build", is_dir=True) is None
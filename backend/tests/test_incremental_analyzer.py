@@ -0,0 +1,76 @@
+import os
+import uuid
+from app.models import Project, ProjectFile
+from app.services.incremental_analyzer import IncrementalAnalyzer
+
+
+def make_project(db, tmp_path) -> Project:
+    project = Project(user_id=uuid.uuid4(), name="p", source_type="upload", storage_path=str(tmp_path))
+    db.add(project)
+    db.commit()
+    return project
+
+
+def analyze(db, project) -> dict:
+    data = IncrementalAnalyzer(db).analyze_project(project, project.storage_path)
+    project.analysis_data = data
+    db.commit()
+    return data
+
+
+def bump_mtime(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_first_analysis_is_full(db, tmp_path):
+    (tmp_path / "a.py").write_text("a = 1\n")
+    project = make_project(db, tmp_path)
+
+    changes = analyze(db, project)["changes"]
+    assert changes["full_analysis"] is True
+    assert changes["added_files"] == ["a.py"]
+
+
+def test_manifest_delta(db, tmp_path):
+    for name in ("keep.py", "edit.py", "touch.py", "gone.py"):
+        (tmp_path / name).write_text(f"{name.split('.')[0]} = 1\n")
+    project = make_project(db, tmp_path)
+    analyze(db, project)
+
+    (tmp_path / "new.py").write_text("new = 1\n")
+    (tmp_path / "edit.py").write_text("edit = 1\nedit += 1\n")
+    bump_mtime(tmp_path / "edit.py")
+    bump_mtime(tmp_path / "touch.py")
+    (tmp_path / "gone.py").unlink()
+
+    data = analyze(db, project)
+    changes = data["changes"]
+    assert changes["full_analysis"] is False
+    assert changes["added_files"] == ["new.py"]
+    assert changes["modified_files"] == ["edit.py"]
+    assert changes["removed_files"] == ["gone.py"]
+    # keep.py and touch.py (mtime moved, contents identical)
+    assert changes["unchanged"] == 2
+
+    rows = {row.path: row for row in db.query(ProjectFile).filter(ProjectFile.project_id == project.id)}
+    assert sorted(rows) == ["edit.py", "keep.py", "new.py", "touch.py"]
+    assert rows["touch.py"].mtime == os.stat(tmp_path / "touch.py").st_mtime
+    assert rows["edit.py"].size == os.path.getsize(tmp_path / "edit.py")
+
+
+def test_delta_matches_full_analysis(db, tmp_path):
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text("x = 1\n" * 3)
+    project = make_project(db, tmp_path)
+    analyze(db, project)
+
+    (tmp_path / "a.py").write_text("x = 1\n" * 7)
+    bump_mtime(tmp_path / "a.py")
+    (tmp_path / "c.py").unlink()
+    (tmp_path / "d.py").write_text("y = 2\n")
+    incremental = analyze(db, project)
+
+    fresh = make_project(db, tmp_path)
+    full = analyze(db, fresh)
+    assert incremental["structure"] == full["structure"]
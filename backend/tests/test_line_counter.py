@@ -0,0 +1,23 @@
+from app.services.content_index import split_lines
+from app.services.line_counter import LineCounter
+
+SAMPLES = [b"", b"a", b"a\n", b"a\nb", b"a\r\nb\r\n", b"a\rb\rc", b"a\r\r\nb\n\r", b"\r\n\r\n"]
+
+
+def test_line_count_matches_split_lines():
+    counter = LineCounter()
+    for data in SAMPLES:
+        assert counter.count_bytes(data)["lines"] == len(split_lines(data.decode())), data
+
+
+def test_crlf_split_across_chunks_is_one_line_ending():
+    data = b"x = 1\r\ny = 2\r\n"
+    for cut in range(len(data) + 1):
+        chunks = [data[:cut], b"", data[cut:]]
+        assert LineCounter()._count_newlines(chunks) == 2
+        assert LineCounter(sloc=True)._count_sloc(chunks, "python")["code"] == 2
+
+
+def test_sloc_splits_on_lone_cr():
+    counts = LineCounter(sloc=True).count_bytes(b"# c\rx = 1\r\ry = 2", "python")
+    assert counts == {"lines": 4, "blank": 1, "comment": 1, "code": 2}
@@ -0,0 +1,8 @@
+from app.services.symbol_index import SymbolExtractor
+
+
+def test_js_symbol_lines_ignore_form_feeds_and_unicode_separators():
+    text = "// intro\x0c still line one  and here\nconst x = 1;\r\nfunction handler() {\n  return x;\n}\n"
+    symbols, _ = SymbolExtractor().extract_all(text, "javascript")
+    handler = next(s for s in symbols if s["name"] == "handler")
+    assert (handler["start"], handler["end"]) == (3, 5)
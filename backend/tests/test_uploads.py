@@ -0,0 +1,140 @@
+import io
+import hashlib
+import zipfile
+from datetime import datetime, timedelta
+from app.api import projects
+from app.models import UploadSession
+
+
+def make_zip() -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("app/main.py", "print('hello')\n" * 50)
+    return buf.getvalue()
+
+
+def start_upload(client, data: bytes) -> str:
+    response = client.post("/api/projects/uploads", json={"name": "p", "filename": "p.zip", "size": len(data)})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def put_chunk(client, upload_id: str, offset: int, chunk: bytes, checksum=None):
+    return client.put(
+        f"/api/projects/uploads/{upload_id}/chunks",
+        params={"offset": offset},
+        content=chunk,
+        headers={"X-Chunk-SHA256": checksum or hashlib.sha256(chunk).hexdigest()},
+    )
+
+
+def received(client, upload_id: str) -> int:
+    return client.get(f"/api/projects/uploads/{upload_id}").json()["received_bytes"]
+
+
+def test_chunk_at_wrong_offset_is_rejected(client):
+    data = make_zip()
+    upload_id = start_upload(client, data)
+
+    response = put_chunk(client, upload_id, 10, data[10:20])
+    assert response.status_code == 409
+    assert "Expected offset 0" in response.json()["detail"]
+    assert received(client, upload_id) == 0
+
+
+def test_checksum_mismatch_does_not_advance(client):
+    data = make_zip()
+    upload_id = start_upload(client, data)
+
+    response = put_chunk(client, upload_id, 0, data[:100], checksum="0" * 64)
+    assert response.status_code == 400
+    assert received(client, upload_id) == 0
+
+    assert put_chunk(client, upload_id, 0, data[:100]).status_code == 200
+    assert received(client, upload_id) == 100
+
+
+def test_upload_resumes_from_reported_offset(client):
+    data = make_zip()
+    upload_id = start_upload(client, data)
+    half = len(data) // 2
+
+    assert put_chunk(client, upload_id, 0, data[:half]).status_code == 200
+    # The next chunk is lost in transit; the client asks where to resume
+    put_chunk(client, upload_id, half, data[half:], checksum="0" * 64)
+    offset = received(client, upload_id)
+    assert offset == half
+
+    assert put_chunk(client, upload_id, offset, data[offset:]).status_code == 200
+    response = client.post(f"/api/projects/uploads/{upload_id}/complete")
+    assert response.status_code == 201
+    assert response.json()["source_type"] == "upload"
+
+
+def test_complete_requires_every_byte(client):
+    data = make_zip()
+    upload_id = start_upload(client, data)
+    put_chunk(client, upload_id, 0, data[:100])
+
+    response = client.post(f"/api/projects/uploads/{upload_id}/complete")
+    assert response.status_code == 409
+    assert client.get(f"/api/projects/uploads/{upload_id}").json()["status"] == "uploading"
+
+
+def test_complete_is_idempotent(client):
+    data = make_zip()
+    upload_id = start_upload(client, data)
+    put_chunk(client, upload_id, 0, data)
+
+    first = client.post(f"/api/projects/uploads/{upload_id}/complete")
+    second = client.post(f"/api/projects/uploads/{upload_id}/complete")
+    assert first.status_code == second.status_code == 201
+    assert first.json()["id"] == second.json()["id"]
+
+
+def test_complete_in_progress_is_rejected(client, db):
+    data = make_zip()
+    upload_id = start_upload(client, data)
+    put_chunk(client, upload_id, 0, data)
+    db.query(UploadSession).update({"status": "completing"})
+    db.commit()
+
+    response = client.post(f"/api/projects/uploads/{upload_id}/complete")
+    assert response.status_code == 409
+
+
+def test_failed_completion_can_be_retried(client, monkeypatch):
+    data = make_zip()
+    upload_id = start_upload(client, data)
+    put_chunk(client, upload_id, 0, data)
+
+    apply_cached_analysis = projects._apply_cached_analysis
+
+    def fail_once(db, project):
+        monkeypatch.setattr(projects, "_apply_cached_analysis", apply_cached_analysis)
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(projects, "_apply_cached_analysis", fail_once)
+    response = client.post(f"/api/projects/uploads/{upload_id}/complete")
+    assert response.status_code == 500
+    session = client.get(f"/api/projects/uploads/{upload_id}").json()
+    assert (session["status"], session["received_bytes"]) == ("uploading", len(data))
+
+    response = client.post(f"/api/projects/uploads/{upload_id}/complete")
+    assert response.status_code == 201
+
+
+def test_idle_sessions_of_every_status_expire(client, db):
+    data = make_zip()
+    done_id = start_upload(client, data)
+    put_chunk(client, done_id, 0, data)
+    project_id = client.post(f"/api/projects/uploads/{done_id}/complete").json()["id"]
+    stale_id = start_upload(client, data)
+    db.query(UploadSession).update({"updated_at": datetime.utcnow() - timedelta(days=30)})
+    db.commit()
+
+    start_upload(client, data)
+    assert client.get(f"/api/projects/uploads/{done_id}").status_code == 404
+    assert client.get(f"/api/projects/uploads/{stale_id}").status_code == 404
+    # A completed upload's files belong to its project
+    assert client.get(f"/api/projects/{project_id}").status_code == 200
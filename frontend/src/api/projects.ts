@@ -1,5 +1,23 @@
 import client from './client'
-import type { Project, ProjectWithAnalysis, GitHubProjectRequest } from '@/types'
+import type {
+  Project,
+  ProjectWithAnalysis,
+  GitHubProjectRequest,
+  ProjectFileList,
+  ProjectFileQuery,
+  UploadSession,
+  CreateProjectRequest,
+} from '@/types'
+
+// Consecutive failures of one chunk before a resumable upload gives up
+const MAX_CHUNK_RETRIES = 5
+
+async function sha256Hex(data: ArrayBuffer): Promise<string> {
+  const digest = await crypto.subtle.digest('SHA-256', data)
+  return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('')
+}
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
 
 export const projectsApi = {
   list: async (): Promise<Project[]> => {
@@ -21,6 +39,51 @@ export const projectsApi = {
     return response.data
   },
 
+  // Chunked upload that survives dropped connections: a failed chunk is retried
+  // from the offset the server reports, not from byte zero
+  createResumable: async (
+    { file, name, description }: CreateProjectRequest,
+    onProgress?: (fraction: number) => void
+  ): Promise<Project> => {
+    const session = (
+      await client.post<UploadSession>('/projects/uploads', {
+        name,
+        description,
+        filename: file.name,
+        size: file.size,
+      })
+    ).data
+
+    let offset = session.received_bytes
+    let failures = 0
+    while (offset < file.size) {
+      const chunk = await file.slice(offset, offset + session.max_chunk_size).arrayBuffer()
+      try {
+        const response = await client.put<UploadSession>(
+          `/projects/uploads/${session.id}/chunks`,
+          chunk,
+          {
+            params: { offset },
+            headers: {
+              'Content-Type': 'application/octet-stream',
+              'X-Chunk-SHA256': await sha256Hex(chunk),
+            },
+          }
+        )
+        offset = response.data.received_bytes
+        failures = 0
+      } catch (error) {
+        if (++failures > MAX_CHUNK_RETRIES) throw error
+        await sleep(1000 * 2 ** (failures - 1))
+        offset = (await client.get<UploadSession>(`/projects/uploads/${session.id}`)).data.received_bytes
+      }
+      onProgress?.(offset / file.size)
+    }
+
+    const response = await client.post<Project>(`/projects/uploads/${session.id}/complete`)
+    return response.data
+  },
+
   createFromGitHub: async (data: GitHubProjectRequest): Promise<Project> => {
     const response = await client.post<Project>('/projects/github', data)
     return response.data
@@ -37,4 +100,16 @@ export const projectsApi = {
     )
     return response.data
   },
+
+  pullLatest: async (id: string): Promise<ProjectWithAnalysis> => {
+    const response = await client.post<ProjectWithAnalysis>(`/projects/${id}/refresh`)
+    return response.data
+  },
+
+  listFiles: async (id: string, query: ProjectFileQuery = {}): Promise<ProjectFileList> => {
+    const response = await client.get<ProjectFileList>(`/projects/${id}/files`, {
+      params: query,
+    })
+    return response.data
+  },
 }
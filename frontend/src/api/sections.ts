@@ -1,5 +1,20 @@
 import client from './client'
-import type { Section, DocumentType, DocumentTypeWithSections } from '@/types'
+import type { Section, DocumentType, DocumentTypeWithSections, GenerationJob } from '@/types'
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
+
+const JOB_POLL_INTERVAL_MS = 1500
+
+export const isJobActive = (job: GenerationJob) => job.status === 'queued' || job.status === 'running'
+
+export interface GenerationJobEventHandlers {
+  // Text streamed so far for sections already running when the stream opened
+  onSnapshot?: (job: GenerationJob, partial: Record<string, string>) => void
+  onSectionStarted?: (documentSectionId: string) => void
+  onDelta?: (documentSectionId: string, text: string) => void
+  onSectionCompleted?: (documentSectionId: string, status: string, content: string | null) => void
+  onJobFinished?: (status: string, error: string | null) => void
+}
 
 export const sectionsApi = {
   list: async (docTypeId?: string): Promise<Section[]> => {
@@ -51,24 +66,72 @@ export const templatesApi = {
 }
 
 export const generationApi = {
-  generateDocument: async (documentId: string): Promise<{
-    document_id: string
-    status: string
-    results: Array<{
-      section_id: string
-      title: string
-      success: boolean
-      content_id?: string
-      error?: string
-    }>
-  }> => {
-    const response = await client.post(`/generation/documents/${documentId}/generate`)
+  // Starts a background job (or returns the document's job already in progress);
+  // fresh skips cached AI responses
+  generateDocument: async (documentId: string, fresh = false): Promise<GenerationJob> => {
+    const response = await client.post<GenerationJob>(
+      `/generation/documents/${documentId}/generate`,
+      undefined,
+      { params: fresh ? { fresh } : undefined }
+    )
+    return response.data
+  },
+
+  getJob: async (jobId: string): Promise<GenerationJob> => {
+    const response = await client.get<GenerationJob>(`/generation/jobs/${jobId}`)
+    return response.data
+  },
+
+  getLatestJob: async (documentId: string): Promise<GenerationJob> => {
+    const response = await client.get<GenerationJob>(`/generation/documents/${documentId}/jobs/latest`)
     return response.data
   },
 
+  cancelJob: async (jobId: string): Promise<GenerationJob> => {
+    const response = await client.post<GenerationJob>(`/generation/jobs/${jobId}/cancel`)
+    return response.data
+  },
+
+  // Subscribes to a job's server-sent events; returns a function that closes the stream
+  streamJob: (jobId: string, handlers: GenerationJobEventHandlers): (() => void) => {
+    const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000'
+    const source = new EventSource(`${API_URL}/api/generation/jobs/${jobId}/events`)
+    const on = (event: string, handle: (data: any) => void) =>
+      source.addEventListener(event, (e) => handle(JSON.parse((e as MessageEvent).data)))
+
+    on('snapshot', ({ partial, ...job }) => {
+      handlers.onSnapshot?.(job as GenerationJob, partial ?? {})
+      if (!isJobActive(job as GenerationJob)) source.close()
+    })
+    on('section_started', (d) => handlers.onSectionStarted?.(d.document_section_id))
+    on('delta', (d) => handlers.onDelta?.(d.document_section_id, d.text))
+    on('section_completed', (d) =>
+      handlers.onSectionCompleted?.(d.document_section_id, d.status, d.content)
+    )
+    on('job', (d) => {
+      source.close()
+      handlers.onJobFinished?.(d.status, d.error)
+    })
+    return () => source.close()
+  },
+
+  // Polls a job until it completes, fails or is cancelled
+  waitForJob: async (
+    job: GenerationJob,
+    onProgress?: (job: GenerationJob) => void
+  ): Promise<GenerationJob> => {
+    while (isJobActive(job)) {
+      await sleep(JOB_POLL_INTERVAL_MS)
+      job = await generationApi.getJob(job.id)
+      onProgress?.(job)
+    }
+    return job
+  },
+
   regenerateSection: async (
     documentId: string,
-    sectionId: string
+    sectionId: string,
+    fresh = false
   ): Promise<{
     section_id: string
     title: string
@@ -76,7 +139,9 @@ export const generationApi = {
     content: string
   }> => {
     const response = await client.post(
-      `/generation/documents/${documentId}/sections/${sectionId}/generate`
+      `/generation/documents/${documentId}/sections/${sectionId}/generate`,
+      undefined,
+      { params: fresh ? { fresh } : undefined }
     )
     return response.data
   },
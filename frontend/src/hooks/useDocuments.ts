@@ -151,7 +151,13 @@ export function useGenerateDocument() {
   const queryClient = useQueryClient()
 
   return useMutation({
-    mutationFn: (documentId: string) => generationApi.generateDocument(documentId),
+    mutationFn: async (documentId: string) => {
+      const job = await generationApi.waitForJob(await generationApi.generateDocument(documentId))
+      if (job.status !== 'completed') {
+        throw new Error(job.error || `Generation ${job.status}`)
+      }
+      return job
+    },
     onSuccess: (_, documentId) => {
       queryClient.invalidateQueries({ queryKey: ['documents', documentId] })
       toast.success('Document generated successfully')
@@ -166,8 +172,15 @@ export function useRegenerateSection() {
   const queryClient = useQueryClient()
 
   return useMutation({
-    mutationFn: ({ documentId, sectionId }: { documentId: string; sectionId: string }) =>
-      generationApi.regenerateSection(documentId, sectionId),
+    mutationFn: ({
+      documentId,
+      sectionId,
+      fresh = false,
+    }: {
+      documentId: string
+      sectionId: string
+      fresh?: boolean
+    }) => generationApi.regenerateSection(documentId, sectionId, fresh),
     onSuccess: (_, { documentId }) => {
       queryClient.invalidateQueries({ queryKey: ['documents', documentId] })
       toast.success('Section regenerated')
@@ -1,6 +1,6 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { projectsApi } from '@/api/projects'
-import type { GitHubProjectRequest } from '@/types'
+import type { CreateProjectRequest, GitHubProjectRequest } from '@/types'
 import toast from 'react-hot-toast'
 
 export function useProjects() {
@@ -26,11 +26,23 @@ export function useProjectAnalysis(id: string, enabled = true) {
   })
 }
 
-export function useCreateProject() {
+// Archives larger than this are sent as a resumable chunked upload
+const RESUMABLE_UPLOAD_THRESHOLD = 16 * 1024 * 1024
+
+export function useCreateProject(onProgress?: (fraction: number) => void) {
   const queryClient = useQueryClient()
 
   return useMutation({
-    mutationFn: (data: FormData) => projectsApi.create(data),
+    mutationFn: (data: CreateProjectRequest) => {
+      if (data.file.size > RESUMABLE_UPLOAD_THRESHOLD) {
+        return projectsApi.createResumable(data, onProgress)
+      }
+      const formData = new FormData()
+      formData.append('file', data.file)
+      formData.append('name', data.name)
+      if (data.description) formData.append('description', data.description)
+      return projectsApi.create(formData)
+    },
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['projects'] })
       toast.success('Project created successfully')
@@ -85,3 +97,18 @@ export function useRefreshAnalysis() {
     },
   })
 }
+
+export function usePullLatest() {
+  const queryClient = useQueryClient()
+
+  return useMutation({
+    mutationFn: (id: string) => projectsApi.pullLatest(id),
+    onSuccess: (project, id) => {
+      queryClient.invalidateQueries({ queryKey: ['projects', id] })
+      toast.success(`Up to date at ${project.commit_sha?.slice(0, 7)}`)
+    },
+    onError: () => {
+      toast.error('Failed to pull latest changes')
+    },
+  })
+}
@@ -109,8 +109,8 @@ export default function DocumentEditorPage() {
         toast.loading('Generating documentation content...', { id: 'auto-generate' })
 
         generateDocument.mutate(documentId, {
-          onSuccess: (result) => {
-            const placeholderCount = result.results?.filter((r: any) => r.used_placeholder).length || 0
+          onSuccess: (job) => {
+            const placeholderCount = job.sections.filter(s => s.status === 'placeholder').length
             if (placeholderCount > 0) {
               toast.success(
                 `Content generated! ${placeholderCount} section(s) used placeholder content - AI was unavailable.`,
@@ -160,11 +160,12 @@ export default function DocumentEditorPage() {
     )
   }
 
-  const handleRegenerate = (sectionId: string) => {
+  // fresh skips the server's cached AI response, so regenerating yields a new draft
+  const handleRegenerate = (sectionId: string, fresh = false) => {
     if (!documentId) return
 
     regenerateSection.mutate(
-      { documentId, sectionId },
+      { documentId, sectionId, fresh },
       {
         onSuccess: (result) => {
           if (sectionId === selectedSectionId) {
@@ -489,7 +490,7 @@ export default function DocumentEditorPage() {
                           size="sm"
                           onClick={(e) => {
                             e.stopPropagation()
-                            handleRegenerate(section.id)
+                            handleRegenerate(section.id, true)
                           }}
                           disabled={regenerateSection.isPending}
                           leftIcon={regenerateSection.isPending ? (
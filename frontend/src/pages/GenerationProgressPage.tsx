@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react'
 import { useParams, useNavigate } from 'react-router-dom'
-import { useMutation, useQuery } from '@tanstack/react-query'
+import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query'
 import { toast } from 'react-hot-toast'
 import {
   Loader2,
@@ -10,29 +10,28 @@ import {
   Clock,
   Sparkles,
   ArrowRight,
+  AlertTriangle,
+  Ban,
 } from 'lucide-react'
 import Button from '@/components/common/Button'
 import { documentsApi } from '@/api/documents'
-import { generationApi } from '@/api/sections'
+import { generationApi, isJobActive } from '@/api/sections'
 import { useSession } from '@/context/SessionContext'
 import { cn } from '@/utils/helpers'
+import type { GenerationJobSection } from '@/types'
 
-interface SectionProgress {
-  id: string
-  title: string
-  status: 'pending' | 'generating' | 'completed' | 'error'
-  error?: string
-}
+const JOB_POLL_INTERVAL_MS = 1500
 
 export default function GenerationProgressPage() {
   const { documentId } = useParams<{ documentId: string }>()
   const navigate = useNavigate()
   const { updateDocument, getDocument } = useSession()
 
-  const [sectionProgress, setSectionProgress] = useState<SectionProgress[]>([])
-  const [currentSectionIndex, setCurrentSectionIndex] = useState(0)
-  const [isComplete, setIsComplete] = useState(false)
-  const [hasErrors, setHasErrors] = useState(false)
+  const queryClient = useQueryClient()
+  const [jobId, setJobId] = useState<string | null>(null)
+  const [startError, setStartError] = useState(false)
+  // Text streamed so far for running sections, keyed by document section id
+  const [liveText, setLiveText] = useState<Record<string, string>>({})
 
   // Fetch document with sections
   const { data: document, isLoading: documentLoading } = useQuery({
@@ -41,43 +40,74 @@ export default function GenerationProgressPage() {
     enabled: !!documentId,
   })
 
-  // Initialize section progress from document sections
+  // Start a generation job (the server returns the one in progress, if any)
+  const startMutation = useMutation({
+    mutationFn: () => generationApi.generateDocument(documentId!),
+    onSuccess: (job) => {
+      setStartError(false)
+      setJobId(job.id)
+    },
+    onError: (error: Error) => {
+      setStartError(true)
+      toast.error(error.message || 'Failed to start generation')
+    },
+  })
+
+  // Poll the job's persisted per-section progress until it finishes (the event
+  // stream below refreshes it as sections change; polling covers a dropped stream)
+  const { data: job } = useQuery({
+    queryKey: ['generation-job', jobId],
+    queryFn: () => generationApi.getJob(jobId!),
+    enabled: !!jobId,
+    refetchInterval: (query) =>
+      !query.state.data || isJobActive(query.state.data) ? JOB_POLL_INTERVAL_MS : false,
+  })
+
+  const cancelMutation = useMutation({
+    mutationFn: () => generationApi.cancelJob(jobId!),
+    onSuccess: () => toast('Generation cancelled'),
+    onError: (error: Error) => toast.error(error.message || 'Failed to cancel generation'),
+  })
+
+  // Stream section text as the AI writes it
   useEffect(() => {
-    if (document?.sections) {
-      const includedSections = document.sections.filter(s => s.is_included)
-      setSectionProgress(
-        includedSections.map((s, index) => ({
-          id: s.id,
-          title: s.title,
-          status: index === 0 ? 'generating' : 'pending',
-        }))
-      )
+    if (!jobId) return
+    const refreshJob = () => queryClient.invalidateQueries({ queryKey: ['generation-job', jobId] })
+
+    return generationApi.streamJob(jobId, {
+      onSnapshot: (_, partial) => setLiveText(partial),
+      onSectionStarted: refreshJob,
+      onDelta: (sectionId, text) =>
+        setLiveText(prev => ({ ...prev, [sectionId]: (prev[sectionId] ?? '') + text })),
+      onSectionCompleted: (sectionId) => {
+        setLiveText(prev => {
+          const next = { ...prev }
+          delete next[sectionId]
+          return next
+        })
+        refreshJob()
+      },
+      onJobFinished: refreshJob,
+    })
+  }, [jobId])
+
+  // Start generation when page loads
+  useEffect(() => {
+    if (document && !jobId && !startMutation.isPending && !startError) {
+      startMutation.mutate()
     }
   }, [document])
 
-  // Generate document mutation
-  const generateMutation = useMutation({
-    mutationFn: () => generationApi.generateDocument(documentId!),
-    onSuccess: (result) => {
-      // Update all sections to completed
-      setSectionProgress(prev =>
-        prev.map(s => ({
-          ...s,
-          status: 'completed' as const,
-        }))
-      )
-      setIsComplete(true)
+  // Report the outcome once the job finishes
+  useEffect(() => {
+    if (!job || isJobActive(job)) return
 
-      // Update session
-      if (documentId) {
-        const sessionDoc = getDocument(documentId)
-        if (sessionDoc) {
-          updateDocument(documentId, { status: 'completed' })
-        }
+    if (job.status === 'completed') {
+      if (documentId && getDocument(documentId)) {
+        updateDocument(documentId, { status: 'completed' })
       }
 
-      // Check if any sections used placeholder content
-      const placeholderCount = result.results?.filter((r: any) => r.used_placeholder).length || 0
+      const placeholderCount = job.sections.filter(s => s.status === 'placeholder').length
       if (placeholderCount > 0) {
         toast.success(
           `Documentation generated! ${placeholderCount} section(s) used placeholder content due to AI unavailability.`,
@@ -86,63 +116,20 @@ export default function GenerationProgressPage() {
       } else {
         toast.success('Documentation generated successfully!')
       }
-    },
-    onError: (error: Error) => {
-      setHasErrors(true)
-      toast.error(error.message || 'Failed to generate documentation')
-    },
-  })
-
-  // Start generation when page loads
-  useEffect(() => {
-    if (document && sectionProgress.length > 0 && !generateMutation.isPending && !isComplete && !hasErrors) {
-      generateMutation.mutate()
+    } else if (job.status === 'failed') {
+      toast.error(job.error || 'Failed to generate documentation')
     }
-  }, [document, sectionProgress.length])
-
-  // Simulate progress updates (since we don't have real-time updates yet)
-  useEffect(() => {
-    if (!generateMutation.isPending || sectionProgress.length === 0) return
-
-    const interval = setInterval(() => {
-      setCurrentSectionIndex(prev => {
-        const next = prev + 1
-        if (next >= sectionProgress.length) {
-          clearInterval(interval)
-          return prev
-        }
-
-        // Update section statuses
-        setSectionProgress(sections =>
-          sections.map((s, idx) => ({
-            ...s,
-            status: idx < next ? 'completed' : idx === next ? 'generating' : 'pending',
-          }))
-        )
-
-        return next
-      })
-    }, 2000) // Simulate 2 seconds per section
-
-    return () => clearInterval(interval)
-  }, [generateMutation.isPending, sectionProgress.length])
+  }, [job?.status])
 
   const handleViewDocument = () => {
     navigate(`/documents/${documentId}/edit`)
   }
 
   const handleRetry = () => {
-    setHasErrors(false)
-    setIsComplete(false)
-    setCurrentSectionIndex(0)
-    setSectionProgress(prev =>
-      prev.map((s, idx) => ({
-        ...s,
-        status: idx === 0 ? 'generating' : 'pending',
-        error: undefined,
-      }))
-    )
-    generateMutation.mutate()
+    setStartError(false)
+    setJobId(null)
+    setLiveText({})
+    startMutation.mutate()
   }
 
   if (documentLoading) {
@@ -156,8 +143,12 @@ export default function GenerationProgressPage() {
     )
   }
 
-  const completedCount = sectionProgress.filter(s => s.status === 'completed').length
-  const totalCount = sectionProgress.length
+  const sections: GenerationJobSection[] = job?.sections ?? []
+  const isComplete = job?.status === 'completed'
+  const isCancelled = job?.status === 'cancelled'
+  const hasErrors = startError || job?.status === 'failed'
+  const completedCount = job?.finished_sections ?? 0
+  const totalCount = job?.total_sections ?? document?.sections.filter(s => s.is_included).length ?? 0
   const progressPercent = totalCount > 0 ? Math.round((completedCount / totalCount) * 100) : 0
 
   return (
@@ -170,6 +161,8 @@ export default function GenerationProgressPage() {
               <CheckCircle className="h-12 w-12 text-green-600" />
             ) : hasErrors ? (
               <XCircle className="h-12 w-12 text-red-600" />
+            ) : isCancelled ? (
+              <Ban className="h-12 w-12 text-gray-500" />
             ) : (
               <Sparkles className="h-12 w-12 animate-pulse text-primary-600" />
             )}
@@ -179,14 +172,18 @@ export default function GenerationProgressPage() {
               ? 'Documentation Complete!'
               : hasErrors
                 ? 'Generation Error'
-                : 'Generating Documentation'}
+                : isCancelled
+                  ? 'Generation Cancelled'
+                  : 'Generating Documentation'}
           </h1>
           <p className="mt-2 text-gray-600">
             {isComplete
               ? 'Your documentation is ready to view and edit'
               : hasErrors
                 ? 'There was an error generating your documentation'
-                : 'AI is analyzing your code and generating content...'}
+                : isCancelled
+                  ? 'Sections generated before cancelling have been kept'
+                  : 'AI is analyzing your code and generating content...'}
           </p>
         </div>
 
@@ -200,13 +197,13 @@ export default function GenerationProgressPage() {
             <div
               className={cn(
                 'h-full rounded-full transition-all duration-500',
-                isComplete ? 'bg-green-500' : hasErrors ? 'bg-red-500' : 'bg-primary-500'
+                isComplete ? 'bg-green-500' : hasErrors ? 'bg-red-500' : isCancelled ? 'bg-gray-400' : 'bg-primary-500'
               )}
               style={{ width: `${progressPercent}%` }}
             />
           </div>
           <p className="mt-2 text-center text-sm text-gray-500">
-            {completedCount} of {totalCount} sections generated
+            {completedCount} of {totalCount} sections finished
           </p>
         </div>
 
@@ -217,11 +214,11 @@ export default function GenerationProgressPage() {
             Section Progress
           </h2>
           <div className="space-y-3">
-            {sectionProgress.map((section, index) => (
+            {sections.map((section) => (
               <SectionProgressItem
                 key={section.id}
                 section={section}
-                isActive={index === currentSectionIndex && !isComplete && !hasErrors}
+                liveText={liveText[section.document_section_id]}
               />
             ))}
           </div>
@@ -235,6 +232,25 @@ export default function GenerationProgressPage() {
               <ArrowRight className="ml-2 h-5 w-5" />
             </Button>
           )}
+          {job && isJobActive(job) && (
+            <Button
+              variant="outline"
+              onClick={() => cancelMutation.mutate()}
+              isLoading={cancelMutation.isPending}
+            >
+              Cancel Generation
+            </Button>
+          )}
+          {isCancelled && (
+            <>
+              <Button variant="outline" onClick={handleViewDocument}>
+                View Document
+              </Button>
+              <Button onClick={handleRetry}>
+                Restart Generation
+              </Button>
+            </>
+          )}
           {hasErrors && (
             <>
               <Button variant="outline" onClick={() => navigate(-1)}>
@@ -252,47 +268,60 @@ export default function GenerationProgressPage() {
 }
 
 interface SectionProgressItemProps {
-  section: SectionProgress
-  isActive: boolean
+  section: GenerationJobSection
+  liveText?: string
 }
 
-function SectionProgressItem({ section, isActive }: SectionProgressItemProps) {
-  const statusIcons = {
-    pending: <Clock className="h-5 w-5 text-gray-400" />,
-    generating: <Loader2 className="h-5 w-5 animate-spin text-primary-600" />,
-    completed: <CheckCircle className="h-5 w-5 text-green-600" />,
-    error: <XCircle className="h-5 w-5 text-red-600" />,
+// Characters of streamed text previewed under a running section
+const LIVE_PREVIEW_CHARS = 280
+
+function SectionProgressItem({ section, liveText }: SectionProgressItemProps) {
+  const statusIcons: Record<GenerationJobSection['status'], JSX.Element> = {
+    queued: <Clock className="h-5 w-5 text-gray-400" />,
+    running: <Loader2 className="h-5 w-5 animate-spin text-primary-600" />,
+    done: <CheckCircle className="h-5 w-5 text-green-600" />,
+    placeholder: <AlertTriangle className="h-5 w-5 text-amber-500" />,
+    failed: <XCircle className="h-5 w-5 text-red-600" />,
+    cancelled: <Ban className="h-5 w-5 text-gray-400" />,
   }
+  const isDone = section.status === 'done' || section.status === 'placeholder'
 
   return (
     <div
       className={cn(
         'flex items-center gap-3 rounded-lg px-4 py-3 transition-all',
-        isActive
+        section.status === 'running'
           ? 'bg-primary-50 ring-1 ring-primary-200'
-          : section.status === 'completed'
+          : isDone
             ? 'bg-green-50'
-            : section.status === 'error'
+            : section.status === 'failed'
               ? 'bg-red-50'
               : 'bg-gray-50'
       )}
     >
       {statusIcons[section.status]}
-      <div className="flex-1">
+      <div className="min-w-0 flex-1">
         <p className={cn(
           'font-medium',
-          section.status === 'completed' ? 'text-green-900' : 'text-gray-900'
+          isDone ? 'text-green-900' : 'text-gray-900'
         )}>
           {section.title}
         </p>
-        {section.status === 'generating' && (
+        {section.status === 'running' && (liveText ? (
+          <p className="mt-1 whitespace-pre-wrap break-words font-mono text-xs text-gray-600">
+            {liveText.length > LIVE_PREVIEW_CHARS ? '…' + liveText.slice(-LIVE_PREVIEW_CHARS) : liveText}
+          </p>
+        ) : (
           <p className="text-sm text-primary-600">Generating content...</p>
+        ))}
+        {section.status === 'placeholder' && (
+          <p className="text-sm text-amber-600">AI unavailable - placeholder content added</p>
         )}
         {section.error && (
           <p className="text-sm text-red-600">{section.error}</p>
         )}
       </div>
-      {section.status === 'generating' && (
+      {section.status === 'running' && (
         <span className="inline-flex items-center rounded-full bg-primary-100 px-2 py-1 text-xs font-medium text-primary-700">
           In Progress
         </span>
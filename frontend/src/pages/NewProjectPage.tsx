@@ -42,19 +42,17 @@ export default function NewProjectPage() {
   const [description, setDescription] = useState('')
   const [file, setFile] = useState<File | null>(null)
 
-  const createProject = useCreateProject()
+  const [uploadProgress, setUploadProgress] = useState<number | null>(null)
+
+  const createProject = useCreateProject(setUploadProgress)
   const createGitHubProject = useCreateGitHubProject()
 
   const handleUploadSubmit = async (e: React.FormEvent) => {
     e.preventDefault()
     if (!file || !name) return
 
-    const formData = new FormData()
-    formData.append('file', file)
-    formData.append('name', name)
-    if (description) formData.append('description', description)
-
-    createProject.mutate(formData, {
+    setUploadProgress(null)
+    createProject.mutate({ file, name, description: description || undefined }, {
       onSuccess: (project) => {
         navigate(`/projects/${project.id}`)
       },
@@ -252,6 +250,12 @@ export default function NewProjectPage() {
                     onClear={() => setFile(null)}
                   />
 
+                  {createProject.isPending && uploadProgress !== null && (
+                    <p className="mt-3 text-sm text-slate-500">
+                      Uploading... {Math.round(uploadProgress * 100)}%
+                    </p>
+                  )}
+
                   <Button
                     type="submit"
                     className="mt-8 w-full"
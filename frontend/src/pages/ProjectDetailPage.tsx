@@ -1,16 +1,17 @@
 import { useParams, Link } from 'react-router-dom'
-import { Plus, RefreshCw, FolderTree, Code2, FileCode, Package } from 'lucide-react'
+import { Plus, RefreshCw, FolderTree, Code2, FileCode, Package, GitBranch } from 'lucide-react'
 import Layout from '@/components/common/Layout'
 import Button from '@/components/common/Button'
 import DocumentList from '@/components/documents/DocumentList'
 import { PageLoading } from '@/components/common/Loading'
-import { useProject, useRefreshAnalysis } from '@/hooks/useProjects'
+import { useProject, useRefreshAnalysis, usePullLatest } from '@/hooks/useProjects'
 import { formatDate } from '@/utils/helpers'
 
 export default function ProjectDetailPage() {
   const { projectId } = useParams()
   const { data: project, isLoading } = useProject(projectId || '')
   const refreshAnalysis = useRefreshAnalysis()
+  const pullLatest = usePullLatest()
 
   if (isLoading) {
     return (
@@ -56,14 +57,32 @@ export default function ProjectDetailPage() {
                 </a>
               </>
             )}
+            {project.commit_sha && (
+              <>
+                {' • '}
+                <span className="font-mono">{project.commit_sha.slice(0, 7)}</span>
+              </>
+            )}
           </p>
         </div>
-        <Link to={`/projects/${project.id}/documents/new`}>
-          <Button>
-            <Plus className="mr-2 h-4 w-4" />
-            Create Document
-          </Button>
-        </Link>
+        <div className="flex items-center gap-2">
+          {project.source_type === 'github' && (
+            <Button
+              variant="secondary"
+              onClick={() => pullLatest.mutate(project.id)}
+              isLoading={pullLatest.isPending}
+            >
+              <GitBranch className="mr-2 h-4 w-4" />
+              Pull Latest
+            </Button>
+          )}
+          <Link to={`/projects/${project.id}/documents/new`}>
+            <Button>
+              <Plus className="mr-2 h-4 w-4" />
+              Create Document
+            </Button>
+          </Link>
+        </div>
       </div>
 
       <div className="grid gap-6 lg:grid-cols-3">
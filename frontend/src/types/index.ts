@@ -18,6 +18,8 @@ export interface Project {
   description: string | null
   source_type: 'upload' | 'github'
   github_url: string | null
+  commit_sha?: string | null
+  previous_commit_sha?: string | null
   created_at: string
   updated_at: string
 }
@@ -27,22 +29,96 @@ export interface ProjectWithAnalysis extends Project {
 }
 
 export interface CodeAnalysis {
-  file_tree: string[]
   languages: Record<string, number>
   config_files: string[]
   entry_points: string[]
   structure: {
     total_files: number
     total_dirs: number
+    ignored_paths?: number
     total_lines: number
+    sloc?: Record<string, { blank: number; comment: number; code: number }>
+    skipped_files?: Record<string, number>
+    skipped_bytes?: number
   }
   key_files: Array<{
     path: string
     type: string
     name: string
+    score?: number
   }>
   dependencies: Record<string, string[] | Record<string, string[]>>
   primary_language: string
+  analyzed_at?: string
+  changes?: AnalysisChanges
+  symbols?: SymbolSummary
+  import_graph?: { nodes: number; edges: number }
+}
+
+export interface SymbolSummary {
+  functions: number
+  classes: number
+  methods: number
+  routes: number
+  route_list: Array<{
+    method: string
+    path: string
+    file: string
+    line: number
+  }>
+}
+
+export interface ProjectFile {
+  path: string
+  language: string | null
+  file_class?: string | null
+  size: number | null
+  line_count: number | null
+}
+
+export interface ProjectFileList {
+  items: ProjectFile[]
+  total: number
+  page: number
+  page_size: number
+}
+
+export interface ProjectFileQuery {
+  prefix?: string
+  glob?: string
+  language?: string
+  page?: number
+  page_size?: number
+}
+
+export interface UploadSession {
+  id: string
+  filename: string
+  total_size: number
+  received_bytes: number
+  max_chunk_size: number
+  status: 'uploading' | 'completed'
+  project_id: string | null
+  created_at: string
+  updated_at: string
+}
+
+export interface CreateProjectRequest {
+  file: File
+  name: string
+  description?: string
+}
+
+export interface AnalysisChanges {
+  full_analysis: boolean
+  since: string | null
+  added: number
+  modified: number
+  removed: number
+  unchanged: number
+  added_files: string[]
+  modified_files: string[]
+  removed_files: string[]
 }
 
 // Document type/template types
@@ -104,6 +180,35 @@ export interface DocumentWithSections extends Document {
   sections: DocumentSection[]
 }
 
+// Generation job types
+export type GenerationJobStatus = 'queued' | 'running' | 'completed' | 'failed' | 'cancelled'
+
+export interface GenerationJobSection {
+  id: string
+  document_section_id: string
+  title: string
+  display_order: number
+  status: 'queued' | 'running' | 'done' | 'failed' | 'placeholder' | 'cancelled'
+  content_id: string | null
+  error: string | null
+  started_at: string | null
+  finished_at: string | null
+}
+
+export interface GenerationJob {
+  id: string
+  document_id: string
+  status: GenerationJobStatus
+  error: string | null
+  fresh: boolean
+  total_sections: number
+  finished_sections: number
+  created_at: string
+  started_at: string | null
+  finished_at: string | null
+  sections: GenerationJobSection[]
+}
+
 // API request types
 export interface RegisterRequest {
   email: string